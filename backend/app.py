@@ -4,23 +4,40 @@ from flask_jwt_extended import JWTManager
 from config import config
 from models import db
 from routes import register_blueprints
+from events import broker
+from logging_config import configure_logging
+import instrumentation
+import profiling
+import replica
+import tenancy
+import metrics
 
 def create_app(config_name='development'):
     """Application factory pattern"""
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    configure_logging(app)
     
     # Initialize extensions
     CORS(app)
     db.init_app(app)
     JWTManager(app)
+    broker.init_app(app)
+    instrumentation.init_app(app)
+    profiling.init_app(app)
+    replica.init_app(app)
+    tenancy.init_app(app)
     
     # Register blueprints
     register_blueprints(app)
     
-    # Create tables
+    # Create tables (solo en el primario: la réplica las recibe por replicación)
     with app.app_context():
-        db.create_all()
+        db.create_all(bind_key=None)
+        tenancy.create_shard_tables()
+    
+    # Métricas (necesita las tablas para el conteo inicial)
+    metrics.init_app(app, db, broker)
     
     return app
 
@@ -0,0 +1,112 @@
+"""
+Archivo de asignaciones antiguas.
+
+Las asignaciones cerradas (completadas y validadas, o canceladas) con fecha
+anterior a ARCHIVE_AFTER_MONTHS meses se mueven, junto con su completion, a
+task_assignments_archive / task_completions_archive. Se mueven por lotes con
+INSERT ... SELECT y DELETE de Core: no pasan por la sesión ORM, así los
+resúmenes de estadísticas no cambian, el outbox no registra nada y /api/sync
+no genera borrados (los clientes conservan sus copias).
+
+Las lecturas de historial usan `with_archive()`: consultan la tabla viva y
+solo añaden el archivo si el rango pedido llega a fechas archivadas.
+"""
+from datetime import date
+from sqlalchemy import and_, delete, func, insert, or_, select
+from models import db, ArchivedAssignment, ArchivedCompletion, TaskAssignment, TaskCompletion
+
+ARCHIVED = {
+    TaskAssignment: ArchivedAssignment,
+    TaskCompletion: ArchivedCompletion,
+}
+
+def months_ago(today, months):
+    """Primer día del mes de hace `months` meses"""
+    year, month = divmod(today.year * 12 + today.month - 1 - months, 12)
+    return date(year, month + 1, 1)
+
+def _closed(model, before):
+    return and_(
+        model.assigned_date < before,
+        or_(
+            and_(model.is_completed.is_(True), model.is_validated.is_(True)),
+            and_(model.is_cancelled.is_(True), model.is_completed.is_(False))
+        )
+    )
+
+def _copy(source, target, condition):
+    """INSERT INTO target (columnas de source) SELECT ... FROM source WHERE condition"""
+    names = [column.name for column in source.__table__.columns]
+    # Atributos del modelo para que se aplique el filtro de familia
+    return db.session.execute(
+        insert(target).from_select(names, select(*[getattr(source, name) for name in names]).where(condition))
+    ).rowcount
+
+def archive_assignments(before, batch_size, dry_run=False):
+    """
+    Mueve al archivo las asignaciones cerradas anteriores a `before` (fecha),
+    un commit por lote. Sin familia en el contexto recorre todas las del shard.
+    Retorna {'assignments': n, 'completions': n}.
+    """
+    moved = {'assignments': 0, 'completions': 0}
+    if dry_run:
+        moved['assignments'] = db.session.execute(
+            select(func.count(TaskAssignment.id)).where(_closed(TaskAssignment, before))
+        ).scalar()
+        return moved
+
+    while True:
+        ids = db.session.execute(
+            select(TaskAssignment.id).where(_closed(TaskAssignment, before))
+            .order_by(TaskAssignment.id).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            return moved
+
+        moved['assignments'] += _copy(TaskAssignment, ArchivedAssignment, TaskAssignment.id.in_(ids))
+        moved['completions'] += _copy(TaskCompletion, ArchivedCompletion, TaskCompletion.assignment_id.in_(ids))
+        db.session.execute(
+            delete(TaskCompletion).where(TaskCompletion.assignment_id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(
+            delete(TaskAssignment).where(TaskAssignment.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+def horizon(model, column):
+    """Valor más reciente de `column` en el archivo de `model` (None si está vacío)"""
+    archived = ARCHIVED[model]
+    return db.session.execute(select(func.max(getattr(archived, column)))).scalar()
+
+def _sort_key(value):
+    # Los valores nulos al final en orden descendente
+    return (True, value) if value is not None else (False,)
+
+def with_archive(model, filters, order_by, since=None, descending=False, limit=None):
+    """
+    Filas de `model` (TaskAssignment o TaskCompletion) que cumplen filters(modelo),
+    ordenadas por la columna `order_by`, añadiendo las archivadas solo si hace falta:
+    - since: inicio del rango en la misma columna (None = sin límite); si es
+      posterior a lo más reciente del archivo, no se consulta.
+    - con limit y orden descendente, si la tabla viva ya llena el límite con
+      valores posteriores a los del archivo, tampoco.
+    Las filas archivadas tienen el mismo to_dict() (con archived=True).
+    """
+    def run(query_model):
+        column = getattr(query_model, order_by)
+        query = query_model.query.filter(*filters(query_model)).order_by(column.desc() if descending else column)
+        return query.limit(limit).all() if limit else query.all()
+
+    rows = run(model)
+    newest_archived = horizon(model, order_by)
+    if newest_archived is None or (since is not None and since > newest_archived):
+        return rows
+    if limit and descending and len(rows) >= limit:
+        last = getattr(rows[-1], order_by)
+        if last is not None and last >= newest_archived:
+            return rows
+
+    rows = sorted(rows + run(ARCHIVED[model]), key=lambda row: _sort_key(getattr(row, order_by)), reverse=descending)
+    return rows[:limit] if limit else rows
@@ -0,0 +1,49 @@
+"""
+Mueve las asignaciones cerradas (validadas o canceladas) antiguas, con su
+completion, a task_assignments_archive / task_completions_archive.
+
+    python archive_assignments.py                   # más de ARCHIVE_AFTER_MONTHS meses
+    python archive_assignments.py --months 6 --dry-run
+    python archive_assignments.py --shard eu2
+
+Desde la API: POST /api/archive (trabajo en segundo plano, por familia).
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def main():
+    parser = argparse.ArgumentParser(description='Archiva las asignaciones cerradas antiguas')
+    parser.add_argument('--months', type=int, help='antigüedad en meses (default ARCHIVE_AFTER_MONTHS)')
+    parser.add_argument('--dry-run', action='store_true', help='solo contar las asignaciones a archivar')
+    parser.add_argument('--shard', help='nombre de un shard de FAMILY_SHARDS')
+    parser.add_argument('--config', default=os.getenv('FLASK_CONFIG', 'production'))
+    args = parser.parse_args()
+
+    from app import create_app
+    from archive import archive_assignments, months_ago
+    from tenancy import set_shard
+
+    app = create_app(args.config)
+    if args.shard and args.shard not in app.config['FAMILY_SHARDS']:
+        parser.error(f"el shard '{args.shard}' no está en FAMILY_SHARDS")
+
+    months = args.months or app.config['ARCHIVE_AFTER_MONTHS']
+    if months < 1:
+        parser.error('--months debe ser positivo')
+
+    with app.app_context():
+        set_shard(args.shard)
+        before = months_ago(datetime.now().date(), months)
+        moved = archive_assignments(before, app.config['ARCHIVE_BATCH_SIZE'], dry_run=args.dry_run)
+        if args.dry_run:
+            print(f"ℹ️  {moved['assignments']} asignaciones anteriores a {before} se archivarían")
+        else:
+            print(f"✅ {moved['assignments']} asignaciones y {moved['completions']} completions "
+                  f"anteriores a {before} archivadas")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Herramientas de carga y benchmark contra un servidor CrediKids en marcha."""
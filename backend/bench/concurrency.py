@@ -0,0 +1,122 @@
+"""
+Prueba de concurrencia: mantiene N conexiones SSE abiertas contra un servidor
+en marcha y, mientras tanto, mide la latencia de un endpoint interactivo y
+la memoria (RSS) total de los procesos gunicorn.
+
+Sirve para comparar perfiles de gunicorn.conf.py con el mismo presupuesto
+de memoria, por ejemplo:
+
+    GUNICORN_WORKER_CLASS=sync   gunicorn -c gunicorn.conf.py
+    GUNICORN_WORKER_CLASS=gevent GUNICORN_WORKERS=2 gunicorn -c gunicorn.conf.py
+
+    python -m bench.concurrency --url http://127.0.0.1:5001 --token <jwt> --connections 200
+
+Con workers sync cada stream ocupa un proceso entero y las peticiones
+interactivas se quedan esperando; con gevent deben seguir respondiendo.
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+import urllib.request
+
+def gunicorn_rss_mb():
+    """Suma el RSS (MB) de todos los procesos gunicorn visibles en /proc (Linux)"""
+    total_kb = 0
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                if b'gunicorn' not in f.read():
+                    continue
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            continue
+    return total_kb / 1024
+
+def hold_stream(url, token, hold_seconds, opened, failed, stop):
+    """Abre un stream SSE y lo mantiene leyendo hasta que se pida parar"""
+    request = urllib.request.Request(f'{url}/api/events/stream?token={token}')
+    try:
+        with urllib.request.urlopen(request, timeout=hold_seconds + 30) as response:
+            response.readline()
+            opened.append(time.monotonic())
+            while not stop.is_set():
+                if not response.readline():
+                    break
+    except Exception:
+        failed.append(time.monotonic())
+
+def probe_latency(url, token, samples, interval):
+    """Mide la latencia (ms) de GET /api/auth/me mientras los streams están abiertos"""
+    latencies = []
+    errors = 0
+    for _ in range(samples):
+        request = urllib.request.Request(
+            f'{url}/api/auth/me',
+            headers={'Authorization': f'Bearer {token}'}
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+            latencies.append((time.perf_counter() - start) * 1000)
+        except Exception:
+            errors += 1
+        time.sleep(interval)
+    return latencies, errors
+
+def main():
+    parser = argparse.ArgumentParser(description='Prueba de conexiones concurrentes (SSE)')
+    parser.add_argument('--url', default='http://127.0.0.1:5001')
+    parser.add_argument('--token', required=True, help='JWT de un usuario existente')
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--hold', type=float, default=20.0, help='segundos con los streams abiertos')
+    parser.add_argument('--probes', type=int, default=50)
+    args = parser.parse_args()
+
+    rss_before = gunicorn_rss_mb()
+    opened, failed = [], []
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=hold_stream,
+            args=(args.url, args.token, args.hold, opened, failed, stop),
+            daemon=True
+        )
+        for _ in range(args.connections)
+    ]
+
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+
+    # Dejar que se establezcan las conexiones antes de medir
+    time.sleep(min(5.0, args.hold / 4))
+    latencies, probe_errors = probe_latency(
+        args.url, args.token, args.probes, max(0.0, (args.hold / 2) / max(args.probes, 1))
+    )
+    rss_during = gunicorn_rss_mb()
+
+    remaining = args.hold - (time.monotonic() - start)
+    if remaining > 0:
+        time.sleep(remaining)
+    stop.set()
+
+    print(f'Streams abiertos:     {len(opened)}/{args.connections} (fallidos: {len(failed)})')
+    print(f'RSS gunicorn:         {rss_before:.1f} MB -> {rss_during:.1f} MB')
+    if latencies:
+        ordered = sorted(latencies)
+        p95 = ordered[int(len(ordered) * 0.95) - 1] if len(ordered) >= 20 else ordered[-1]
+        print(f'/api/auth/me p50/p95: {statistics.median(ordered):.1f} / {p95:.1f} ms '
+              f'({len(latencies)} ok, {probe_errors} errores)')
+    else:
+        print(f'/api/auth/me:         sin respuestas ({probe_errors} errores)')
+
+if __name__ == '__main__':
+    main()
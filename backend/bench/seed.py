@@ -0,0 +1,216 @@
+"""
+Genera una base de datos de benchmark con familias, tareas e historial.
+
+    DATABASE_URL=sqlite:////tmp/credikids_bench.db python -m bench.seed --families 3 --kids 3 --years 2
+
+Cada familia tiene un administrador y `kids` usuarios. Cada niño recibe
+todas las tareas de su familia cada día durante `years` años, con una
+mezcla realista de completadas/validadas, canceladas y pendientes.
+Los códigos de acceso son deterministas (ver access_code_for).
+"""
+import argparse
+import random
+from datetime import datetime, date, timedelta
+from sqlalchemy import insert
+from tenancy import family_context
+from models import (
+    db, Family, User, Task, TaskType, TaskFrequency, TaskAssignment, TaskCompletion,
+    Reward, RewardRedemption, Bonus
+)
+
+def access_code_for(index):
+    """Código de 4 iconos (1-25) único para el usuario número `index`"""
+    digits = []
+    for _ in range(4):
+        index, digit = divmod(index, 25)
+        digits.append(digit + 1)
+    return digits
+
+def _scaled_credits(base_value, score):
+    return {1: int(base_value * 0.10), 2: int(base_value * 0.60), 3: base_value}[score]
+
+def seed(families=2, kids=3, tasks=6, years=1, rewards=5, seed_value=42, today=None):
+    """
+    Llena la base de datos actual (requiere app context). Retorna un resumen
+    con los ids y códigos necesarios para lanzar el benchmark.
+    """
+    rng = random.Random(seed_value)
+    today = today or date.today()
+    start = today - timedelta(days=int(365 * years))
+    now = datetime.utcnow()
+
+    db.drop_all(bind_key=None)
+    db.create_all(bind_key=None)
+
+    summary = {'families': []}
+    user_index = 0
+
+    for family in range(families):
+        family_row = Family(name=f'Familia {family}')
+        db.session.add(family_row)
+        db.session.flush()
+        with family_context(family_row.id):
+            _seed_family(summary, family, family_row, kids, tasks, rewards, rng, start, today, now, user_index)
+        user_index += kids + 1
+
+    summary['assignments'] = TaskAssignment.query.count()
+    summary['completions'] = TaskCompletion.query.count()
+    return summary
+
+def _seed_family(summary, family, family_row, kids, tasks, rewards, rng, start, today, now, user_index):
+    """Crea los datos de una familia (family_id lo pone el contexto)"""
+    admin = User(nick=f'admin{family}', figure='👨', role='admin', score=0)
+    admin.set_access_code(access_code_for(user_index))
+    user_index += 1
+    db.session.add(admin)
+    db.session.flush()
+
+    kid_users = []
+    for k in range(kids):
+        kid = User(nick=f'kid{family}_{k}', figure='🧒', role='user', score=0)
+        kid.set_access_code(access_code_for(user_index))
+        user_index += 1
+        kid_users.append(kid)
+    db.session.add_all(kid_users)
+
+    family_tasks = [
+        Task(
+            title=f'Tarea {family}-{t}',
+            description='Generada para benchmark',
+            task_type=TaskType.OBLIGATORY if t % 3 == 0 else TaskType.SPECIAL,
+            frequency=TaskFrequency.DAILY,
+            base_value=rng.choice([10, 20, 50, 100]),
+            created_by_id=admin.id
+        )
+        for t in range(tasks)
+    ]
+    family_rewards = [
+        Reward(
+            name=f'Premio {family}-{r}',
+            credit_cost=rng.choice([5, 50, 200, 1000]),
+            stock=None if r % 2 == 0 else 1000,
+            created_by_id=admin.id
+        )
+        for r in range(rewards)
+    ]
+    db.session.add_all(family_tasks + family_rewards)
+    db.session.flush()
+
+    for kid in kid_users:
+        score = 0
+        assignment_rows = []
+        day = start
+        while day <= today:
+            for task in family_tasks:
+                roll = rng.random()
+                assignment_rows.append({
+                    'task_id': task.id,
+                    'user_id': kid.id,
+                    'assigned_date': day,
+                    'is_completed': day < today and roll < 0.8,
+                    'is_validated': day < today - timedelta(days=1) and roll < 0.75,
+                    'is_cancelled': day < today and 0.8 <= roll < 0.9,
+                    'cancelled_at': datetime.combine(day, datetime.min.time()) if day < today and 0.8 <= roll < 0.9 else None,
+                    'assigned_by_id': admin.id,
+                    'created_at': now
+                })
+            day += timedelta(days=1)
+
+        db.session.execute(insert(TaskAssignment), assignment_rows)
+
+        # Completions de las asignaciones completadas
+        task_values = {t.id: t for t in family_tasks}
+        assignments = db.session.query(
+            TaskAssignment.id, TaskAssignment.task_id, TaskAssignment.assigned_date,
+            TaskAssignment.is_completed, TaskAssignment.is_validated, TaskAssignment.is_cancelled
+        ).filter(TaskAssignment.user_id == kid.id).all()
+
+        completion_rows = []
+        for a_id, task_id, assigned_date, is_completed, is_validated, is_cancelled in assignments:
+            task = task_values[task_id]
+            if is_cancelled and task.task_type == TaskType.OBLIGATORY:
+                score -= task.base_value
+            if not is_completed:
+                continue
+            completed_at = datetime.combine(assigned_date, datetime.min.time()) + timedelta(hours=18)
+            validation_score = rng.choice([1, 2, 3, 3]) if is_validated else None
+            credits = _scaled_credits(task.base_value, validation_score) if validation_score else 0
+            score += credits
+            completion_rows.append({
+                'assignment_id': a_id,
+                'task_id': task_id,
+                'user_id': kid.id,
+                'completed_at': completed_at,
+                'completion_notes': '',
+                'validation_score': validation_score,
+                'validated_by_id': admin.id if validation_score else None,
+                'validated_at': completed_at + timedelta(hours=2) if validation_score else None,
+                'credits_awarded': credits
+            })
+        if completion_rows:
+            db.session.execute(insert(TaskCompletion), completion_rows)
+
+        # Canjes aprobados: uno por semana aprox.
+        redemption_rows = []
+        day = start
+        while day < today:
+            reward = rng.choice(family_rewards)
+            if reward.credit_cost <= 200:
+                redemption_rows.append({
+                    'reward_id': reward.id,
+                    'user_id': kid.id,
+                    'credits_spent': reward.credit_cost,
+                    'redeemed_at': datetime.combine(day, datetime.min.time()),
+                    'notes': '',
+                    'status': 'approved',
+                    'approved_by_id': admin.id,
+                    'approved_at': datetime.combine(day, datetime.min.time())
+                })
+                score -= reward.credit_cost
+            day += timedelta(days=7)
+        if redemption_rows:
+            db.session.execute(insert(RewardRedemption), redemption_rows)
+
+        bonus = Bonus(user_id=kid.id, credits=100, description='Bonus inicial', assigned_by_id=admin.id)
+        db.session.add(bonus)
+        # Saldo amplio para que los canjes del benchmark no fallen por créditos
+        kid.score = max(score + 100, 0) + 1_000_000
+
+    db.session.commit()
+
+    summary['families'].append({
+        'family_id': family_row.id,
+        'login_code': family_row.login_code,
+        'admin_id': admin.id,
+        'admin_code': admin.get_access_code_icons(),
+        'kid_ids': [k.id for k in kid_users],
+        'kid_codes': [k.get_access_code_icons() for k in kid_users],
+        'task_ids': [t.id for t in family_tasks],
+        'reward_ids': [r.id for r in family_rewards]
+    })
+
+def main():
+    from app import create_app
+
+    parser = argparse.ArgumentParser(description='Genera datos de benchmark')
+    parser.add_argument('--families', type=int, default=2)
+    parser.add_argument('--kids', type=int, default=3)
+    parser.add_argument('--tasks', type=int, default=6)
+    parser.add_argument('--years', type=float, default=1)
+    parser.add_argument('--rewards', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--config', default='development')
+    parser.add_argument('--yes', action='store_true', help='confirmar borrado de una base que no es SQLite')
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite') and not args.yes:
+        parser.error('la base de datos no es SQLite: se borrarían todas las tablas (usa --yes)')
+
+    with app.app_context():
+        summary = seed(args.families, args.kids, args.tasks, args.years, args.rewards, args.seed)
+    print(f"✅ {len(summary['families'])} familias, {summary['assignments']} asignaciones, "
+          f"{summary['completions']} completions")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Compacta el outbox de cambios (outbox_events).
+
+Los eventos más antiguos que OUTBOX_RETENTION_DAYS se funden en uno
+'compacted' por usuario con el delta acumulado. Pensado para cron:
+
+    python compact_outbox.py                 # todas las familias
+    python compact_outbox.py --days 7
+    python compact_outbox.py --shard eu2     # familias de un shard
+
+Desde la API: POST /api/outbox/compact (trabajo en segundo plano).
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def main():
+    parser = argparse.ArgumentParser(description='Compacta los eventos antiguos del outbox')
+    parser.add_argument('--days', type=int, help='días que se conservan (default OUTBOX_RETENTION_DAYS)')
+    parser.add_argument('--shard', help='nombre de un shard de FAMILY_SHARDS')
+    parser.add_argument('--config', default=os.getenv('FLASK_CONFIG', 'production'))
+    args = parser.parse_args()
+
+    from app import create_app
+    from outbox import compact
+    from tenancy import set_shard
+
+    app = create_app(args.config)
+    if args.shard and args.shard not in app.config['FAMILY_SHARDS']:
+        parser.error(f"el shard '{args.shard}' no está en FAMILY_SHARDS")
+
+    days = args.days or app.config['OUTBOX_RETENTION_DAYS']
+    with app.app_context():
+        set_shard(args.shard)
+        before = datetime.utcnow() - timedelta(days=days)
+        removed = compact(before)
+        print(f"✅ {removed} eventos anteriores a {before:%Y-%m-%d %H:%M} compactados")
+
+if __name__ == '__main__':
+    main()
@@ -15,9 +15,39 @@ class Config:
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     DB_NAME = os.getenv('DB_NAME', 'credikids_db')
     
-    SQLALCHEMY_DATABASE_URI = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+    # DATABASE_URL permite apuntar a otra base (p.ej. SQLite local para benchmarks)
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        'DATABASE_URL',
+        f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+    )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Réplica de lectura opcional para historiales y calendario (ver replica/)
+    DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {'replica': DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '5'))
+    REPLICA_LAG_CHECK_SECONDS = float(os.getenv('REPLICA_LAG_CHECK_SECONDS', '5'))
+    REPLICA_COOLDOWN_SECONDS = float(os.getenv('REPLICA_COOLDOWN_SECONDS', '30'))
+    REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '10'))
+    
+    # Shards por familia: "eu1=mysql+pymysql://...,eu2=..." (ver tenancy/)
+    FAMILY_SHARDS = dict(
+        item.strip().split('=', 1) for item in os.getenv('FAMILY_SHARDS', '').split(',') if item.strip()
+    )
+    SQLALCHEMY_BINDS.update({f'shard:{name}': url for name, url in FAMILY_SHARDS.items()})
+    
+    # Pool de conexiones por proceso. Con workers gevent todas las greenlets
+    # de un proceso comparten este pool, así que acota la carga sobre MariaDB.
+    # pool_recycle por debajo del wait_timeout de MariaDB; pre_ping descarta
+    # conexiones cortadas tras reinicios.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+        'max_overflow': int(os.getenv('DB_POOL_MAX_OVERFLOW', '10')),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', '30')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '280')),
+        'pool_pre_ping': True
+    }
+    
     # JWT Configuration
     JWT_TOKEN_LOCATION = ['headers']
     JWT_HEADER_NAME = 'Authorization'
@@ -26,6 +56,86 @@ class Config:
     JWT_ENCODE_ISSUER = None
     JWT_DECODE_AUDIENCE = None
     JWT_ERROR_MESSAGE_KEY = 'msg'
+    JWT_QUERY_STRING_NAME = 'token'  # Solo lo usan los endpoints que lo permiten (SSE)
+    
+    # Trabajos en segundo plano (ver worker.py)
+    JOBS_POLL_INTERVAL = float(os.getenv('JOBS_POLL_INTERVAL', '1.0'))
+    # El worker renueva el heartbeat de su trabajo cada JOBS_HEARTBEAT_SECONDS (y
+    # con esa frecuencia busca caducados); sin heartbeat en JOBS_LEASE_SECONDS
+    # se da por muerto su worker
+    JOBS_HEARTBEAT_SECONDS = int(os.getenv('JOBS_HEARTBEAT_SECONDS', '30'))
+    JOBS_LEASE_SECONDS = int(os.getenv('JOBS_LEASE_SECONDS', '300'))
+    # Asignaciones masivas estimadas por encima de este número se encolan
+    BULK_ASSIGN_ASYNC_THRESHOLD = int(os.getenv('BULK_ASSIGN_ASYNC_THRESHOLD', '2000'))
+    
+    # /api/sync: filas por tabla y página, margen para escrituras que confirman
+    # tarde y días que se guardan los borrados (tokens más antiguos: 410)
+    SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', '500'))
+    SYNC_SAFETY_SECONDS = int(os.getenv('SYNC_SAFETY_SECONDS', '5'))
+    SYNC_TOMBSTONE_DAYS = int(os.getenv('SYNC_TOMBSTONE_DAYS', '30'))
+    
+    # Outbox (/api/outbox): eventos por página, margen para transacciones que
+    # confirman tarde y días que se guardan antes de compactarlos
+    OUTBOX_PAGE_SIZE = int(os.getenv('OUTBOX_PAGE_SIZE', '500'))
+    OUTBOX_SAFETY_SECONDS = int(os.getenv('OUTBOX_SAFETY_SECONDS', '2'))
+    OUTBOX_RETENTION_DAYS = int(os.getenv('OUTBOX_RETENTION_DAYS', '30'))
+    
+    # Clasificaciones que cada proceso guarda en memoria (una por familia)
+    LEADERBOARD_MAX_FAMILIES = int(os.getenv('LEADERBOARD_MAX_FAMILIES', '1000'))
+    
+    # Exportaciones (/api/exports, export_data.py): filas por bloque, directorio
+    # compartido entre worker y API, y días que se guardan los ficheros
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '1000'))
+    EXPORT_DIR = os.getenv('EXPORT_DIR', '/tmp/credikids-exports')
+    EXPORT_RETENTION_DAYS = int(os.getenv('EXPORT_RETENTION_DAYS', '7'))
+    
+    # Archivo: asignaciones cerradas de hace más de N meses y filas por lote
+    ARCHIVE_AFTER_MONTHS = int(os.getenv('ARCHIVE_AFTER_MONTHS', '12'))
+    ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', '1000'))
+    # /api/batch: máximo de sub-peticiones por lote y tiempo total (se comprueba
+    # entre sub-peticiones; no corta una que ya está en marcha)
+    BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', '20'))
+    BATCH_MAX_SECONDS = float(os.getenv('BATCH_MAX_SECONDS', '10'))
+    
+    # Eventos en tiempo real (SSE): 'database', 'memory' o 'paquete.modulo:Clase'
+    EVENTS_BACKEND = os.getenv('EVENTS_BACKEND', 'database')
+    EVENTS_HEARTBEAT_SECONDS = int(os.getenv('EVENTS_HEARTBEAT_SECONDS', '15'))
+    EVENTS_POLL_SECONDS = float(os.getenv('EVENTS_POLL_SECONDS', '1'))
+    # Margen para inserciones que confirman tarde (como OUTBOX_SAFETY_SECONDS)
+    EVENTS_SETTLE_SECONDS = float(os.getenv('EVENTS_SETTLE_SECONDS', '1'))
+    EVENTS_RETENTION_SECONDS = int(os.getenv('EVENTS_RETENTION_SECONDS', '60'))
+    # Streams SSE: 'auto' (solo con servidor async o con hilos), '1' o '0';
+    # cada stream se cierra a los EVENTS_STREAM_MAX_SECONDS y el cliente reconecta
+    EVENTS_STREAMING = os.getenv('EVENTS_STREAMING', 'auto').lower()
+    EVENTS_STREAM_MAX_SECONDS = int(os.getenv('EVENTS_STREAM_MAX_SECONDS', '600'))
+    
+    # Instrumentación SQL por petición (Server-Timing, log de peticiones lentas)
+    SQL_INSTRUMENTATION = os.getenv('SQL_INSTRUMENTATION', '0').lower() in ('1', 'true')
+    SLOW_REQUEST_QUERY_COUNT = int(os.getenv('SLOW_REQUEST_QUERY_COUNT', '30'))
+    SLOW_REQUEST_DB_MS = float(os.getenv('SLOW_REQUEST_DB_MS', '200'))
+    SQL_FINGERPRINTS_MAX = int(os.getenv('SQL_FINGERPRINTS_MAX', '500'))
+    
+    # Métricas Prometheus en /metrics (con gunicorn definir PROMETHEUS_MULTIPROC_DIR)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1').lower() in ('1', 'true')
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # Si se define, se exige como Bearer
+    
+    # /api/debug/queries, /profiling y /profiles afectan a todo el proceso: solo
+    # con este token como Bearer (sin definir, desactivados)
+    DEBUG_TOKEN = os.getenv('DEBUG_TOKEN')
+    
+    # Logging estructurado: 'json' o 'text'; niveles por módulo "routes.auth=DEBUG,..."
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    LOG_LEVELS = os.getenv('LOG_LEVELS', '')
+    
+    # Profiler por muestreo (valores iniciales; el operador los cambia en /api/debug/profiling)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', '0').lower() in ('1', 'true')
+    PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+    PROFILING_ROUTES = [r for r in os.getenv('PROFILING_ROUTES', '').split(',') if r]
+    PROFILING_HEADER = os.getenv('PROFILING_HEADER', 'X-Profile')
+    PROFILING_INTERVAL_MS = int(os.getenv('PROFILING_INTERVAL_MS', '5'))
+    PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', '200'))
+    PROFILING_DIR = os.getenv('PROFILING_DIR', '/tmp/credikids-profiles')
     
 class DevelopmentConfig(Config):
     """Development configuration"""
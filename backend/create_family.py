@@ -0,0 +1,61 @@
+"""
+Crea una familia nueva con su primer administrador.
+
+    python create_family.py --name "Familia García" --admin-nick papa --admin-code 1,2,3,4
+    python create_family.py --name "Familia López" --admin-nick mama --admin-code 5,6,7,8 --shard eu2
+
+Con --shard la familia vive en la base FAMILY_SHARDS[<shard>]: la fila de
+families se crea en la base principal y se copia al shard (clave foránea).
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from models import db, Family, User
+from tenancy import family_context, shard_bind_key
+
+def create_family(name, admin_nick, admin_code, figure='👤', shard=None):
+    """Crea la familia y su administrador (requiere app context). Retorna (family, admin)"""
+    family = Family(name=name, shard=shard)
+    db.session.add(family)
+    db.session.commit()
+
+    if shard:
+        with db.engines[shard_bind_key(shard)].begin() as connection:
+            connection.execute(Family.__table__.insert().values(
+                id=family.id, name=family.name, login_code=family.login_code, shard=family.shard,
+                created_at=family.created_at, updated_at=family.updated_at
+            ))
+
+    with family_context(family.id):
+        admin = User(nick=admin_nick, figure=figure, role='admin', score=0)
+        admin.set_access_code(admin_code)
+        db.session.add(admin)
+        db.session.commit()
+        return family, admin
+
+def main():
+    parser = argparse.ArgumentParser(description='Crea una familia con su administrador')
+    parser.add_argument('--name', required=True)
+    parser.add_argument('--admin-nick', required=True)
+    parser.add_argument('--admin-code', required=True, help='4 iconos separados por comas, p.ej. 1,5,12,8')
+    parser.add_argument('--figure', default='👤')
+    parser.add_argument('--shard', help='nombre de un shard de FAMILY_SHARDS')
+    parser.add_argument('--config', default=os.getenv('FLASK_CONFIG', 'production'))
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    if args.shard and args.shard not in app.config['FAMILY_SHARDS']:
+        parser.error(f"el shard '{args.shard}' no está en FAMILY_SHARDS")
+
+    code = [int(x) for x in args.admin_code.split(',')]
+    with app.app_context():
+        family, admin = create_family(args.name, args.admin_nick, code, args.figure, args.shard)
+        print(f"✅ Familia {family.id} '{family.name}' creada con el administrador '{admin.nick}' (id {admin.id})")
+        print(f"🔑 Código de familia para el login: {family.login_code}")
+
+if __name__ == '__main__':
+    main()
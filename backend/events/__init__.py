@@ -0,0 +1,270 @@
+"""
+Canal de eventos (pub/sub) para empujar cambios a los clientes vía SSE.
+
+Las rutas llaman a `emit()` durante la transacción; los eventos se publican
+solo cuando la sesión hace commit (y se descartan si hace rollback), así un
+cliente nunca recibe un cambio que no llegó a guardarse.
+
+Backends (EVENTS_BACKEND):
+- 'database' (por defecto): los eventos pasan por la tabla event_messages,
+  así llegan a los clientes de cualquier worker de gunicorn y también los
+  que emiten los trabajos de worker.py.
+- 'memory': solo dentro del proceso (un único worker, desarrollo).
+- 'paquete.modulo:Clase': otro backend con publish/subscribe/unsubscribe.
+"""
+import importlib
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+from models import db, current_family_id, EventMessage
+
+logger = logging.getLogger(__name__)
+
+def admin_channel(family_id):
+    """Canal de los administradores de una familia"""
+    return f'family:{family_id}:admin'
+
+def user_channel(user_id, family_id):
+    # Con shards los ids de usuario solo son únicos dentro de la familia
+    return f'family:{family_id}:user:{user_id}'
+
+class Subscription:
+    """Cola de eventos de un cliente conectado"""
+
+    def __init__(self, channels, maxsize=100, after=0):
+        self.channels = set(channels)
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.after = after  # solo recibe eventos con id mayor (backend 'database')
+
+    def put(self, message):
+        # Si el cliente es lento se descarta el evento más antiguo
+        while True:
+            try:
+                self.queue.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class MemoryBackend:
+    """Pub/sub dentro del proceso (suficiente con un solo worker)"""
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+
+    def subscribe(self, channels):
+        subscription = Subscription(channels)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, channels, message):
+        with self._lock:
+            targets = [
+                s for s in self._subscriptions
+                if s.channels & set(channels) and message['id'] > s.after
+            ]
+        for subscription in targets:
+            subscription.put(message)
+
+    def publish_many(self, events):
+        """Publica varios (channels, message) de una vez"""
+        for channels, message in events:
+            self.publish(channels, message)
+
+class DatabaseBackend(MemoryBackend):
+    """
+    Pub/sub entre procesos: publish_many() inserta los eventos de un commit
+    en event_messages (base principal) en una sola transacción y, en cada
+    proceso con clientes conectados, un hilo lee los nuevos cada
+    EVENTS_POLL_SECONDS y los entrega a sus suscripciones. El id del evento
+    es el de la fila, igual en todos los procesos.
+
+    Como en el outbox, los eventos de los últimos EVENTS_SETTLE_SECONDS se
+    retienen: una inserción que tomó su id antes pero confirma después
+    quedaría por detrás de la posición del hilo. Cada suscripción empieza en
+    el último id que existía al suscribirse, así no pierde los eventos que se
+    publican antes de la siguiente lectura.
+    """
+
+    def __init__(self, app=None):
+        super().__init__(app)
+        self.app = app
+        self._poller = None
+        self._last_id = None  # posición del hilo; None sin clientes
+
+    def subscribe(self, channels):
+        with self.app.app_context(), db.engine.connect() as connection:
+            after = connection.execute(select(func.max(EventMessage.id))).scalar() or 0
+        subscription = Subscription(channels, after=after)
+        with self._lock:
+            if self._last_id is None or after < self._last_id:
+                self._last_id = after
+            self._subscriptions.add(subscription)
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll, name='events-poller', daemon=True)
+                self._poller.start()
+        return subscription
+
+    def publish(self, channels, message):
+        self.publish_many([(channels, message)])
+
+    def publish_many(self, events):
+        # Se llama tras el commit: conexión propia, fuera de la sesión
+        now = datetime.utcnow()
+        with db.engine.begin() as connection:
+            connection.execute(insert(EventMessage), [
+                {'channels': ' '.join(channels), 'message': json.dumps(message), 'created_at': now}
+                for channels, message in events
+            ])
+
+    def _poll(self):
+        interval = self.app.config['EVENTS_POLL_SECONDS']
+        retention = self.app.config['EVENTS_RETENTION_SECONDS']
+        purged_at = 0.0
+        with self.app.app_context():
+            while True:
+                time.sleep(interval)
+                with self._lock:
+                    if not self._subscriptions:
+                        # Sin clientes no se lee; el siguiente subscribe fija la posición
+                        self._last_id = None
+                        continue
+                    last_id = self._last_id
+                try:
+                    delivered = self._deliver(last_id)
+                    with self._lock:
+                        if self._last_id is not None and delivered > self._last_id:
+                            self._last_id = delivered
+                    if time.monotonic() - purged_at >= retention:
+                        purged_at = time.monotonic()
+                        with db.engine.begin() as connection:
+                            connection.execute(delete(EventMessage).where(
+                                EventMessage.created_at < datetime.utcnow() - timedelta(seconds=retention)
+                            ))
+                except Exception:
+                    logger.warning('Event poll failed', exc_info=True)
+
+    def _deliver(self, last_id):
+        """Entrega los eventos asentados posteriores a last_id y retorna el último leído"""
+        settled = datetime.utcnow() - timedelta(seconds=self.app.config['EVENTS_SETTLE_SECONDS'])
+        with db.engine.connect() as connection:
+            rows = connection.execute(
+                select(EventMessage.id, EventMessage.channels, EventMessage.message)
+                .where(EventMessage.id > last_id, EventMessage.created_at <= settled)
+                .order_by(EventMessage.id)
+            ).all()
+        for row_id, channels, message in rows:
+            message = json.loads(message)
+            message['id'] = row_id
+            MemoryBackend.publish(self, channels.split(), message)
+            last_id = row_id
+        return last_id
+
+BACKENDS = {
+    'memory': MemoryBackend,
+    'database': DatabaseBackend,
+}
+
+class EventBroker:
+    """Punto de entrada único para publicar y suscribirse a eventos"""
+
+    def __init__(self):
+        self.backend = None
+        self._ids = itertools.count(1)
+        self._listeners = []
+
+    def init_app(self, app):
+        backend_path = app.config.get('EVENTS_BACKEND', 'database')
+        if backend_path in BACKENDS:
+            self.backend = BACKENDS[backend_path](app)
+        else:
+            module_name, class_name = backend_path.split(':')
+            backend_class = getattr(importlib.import_module(module_name), class_name)
+            self.backend = backend_class(app)
+        app.extensions['events'] = self
+
+    def add_listener(self, fn):
+        """Registra una función local fn(message) que recibe cada evento publicado en este proceso"""
+        if fn not in self._listeners:
+            self._listeners.append(fn)
+
+    def publish(self, event_type, data, user_id=None, notify_admins=True, family_id=None):
+        """Publica un evento al usuario afectado y/o a los administradores de su familia"""
+        self.publish_many([(event_type, data, user_id, notify_admins, family_id)])
+
+    def publish_many(self, events):
+        """Publica varios eventos (event_type, data, user_id, notify_admins, family_id) de una vez"""
+        if self.backend is None or not events:
+            return
+
+        batch = []
+        for event_type, data, user_id, notify_admins, family_id in events:
+            channels = []
+            if user_id is not None:
+                channels.append(user_channel(user_id, family_id))
+            if notify_admins:
+                channels.append(admin_channel(family_id))
+
+            message = {
+                'id': next(self._ids),
+                'type': event_type,
+                'family_id': family_id,
+                'user_id': user_id,
+                'data': data
+            }
+            for listener in self._listeners:
+                listener(message)
+            batch.append((channels, message))
+        try:
+            if hasattr(self.backend, 'publish_many'):
+                self.backend.publish_many(batch)
+            else:
+                for channels, message in batch:
+                    self.backend.publish(channels, message)
+        except Exception:
+            # El cambio ya está guardado: perder el aviso no debe fallar la petición
+            logger.warning('Event publish failed', exc_info=True)
+
+    def subscribe(self, channels):
+        return self.backend.subscribe(channels)
+
+    def unsubscribe(self, subscription):
+        self.backend.unsubscribe(subscription)
+
+broker = EventBroker()
+
+def emit(event_type, data, user_id=None, notify_admins=True):
+    """Registra un evento para publicarlo cuando la sesión haga commit"""
+    db.session.info.setdefault('pending_events', []).append(
+        (event_type, data, user_id, notify_admins, current_family_id())
+    )
+
+@sa_event.listens_for(Session, 'after_commit')
+def _publish_pending_events(session):
+    # Todos los eventos del commit van juntos (una inserción con el backend 'database')
+    broker.publish_many(session.info.pop('pending_events', []))
+
+@sa_event.listens_for(Session, 'after_rollback')
+def _discard_pending_events(session):
+    session.info.pop('pending_events', None)
@@ -0,0 +1,47 @@
+"""
+Exporta los datos de una familia a CSV (gzip) o Parquet, por bloques y con
+memoria constante.
+
+    python export_data.py --family 1 --out /backups/familia1
+    python export_data.py --family 1 --format parquet --tables bonuses
+    python export_data.py --all --out /backups/todo     # todas las familias (del shard)
+
+Desde la API: POST /api/exports (trabajo en segundo plano con descarga).
+"""
+import argparse
+import os
+import sys
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from exports import EXPORT_TABLES, available_formats, export_tables
+
+def main():
+    parser = argparse.ArgumentParser(description='Exporta los datos de una familia')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--family', type=int, help='id de la familia')
+    target.add_argument('--all', action='store_true', help='todas las familias (del shard)')
+    parser.add_argument('--format', choices=available_formats(), default='csv')
+    parser.add_argument('--tables', nargs='+', choices=list(EXPORT_TABLES), default=list(EXPORT_TABLES))
+    parser.add_argument('--out', required=True, help='directorio de salida')
+    parser.add_argument('--shard', help='nombre de un shard de FAMILY_SHARDS (con --all)')
+    parser.add_argument('--config', default=os.getenv('FLASK_CONFIG', 'production'))
+    args = parser.parse_args()
+
+    from app import create_app
+    from tenancy import family_context, set_shard
+
+    app = create_app(args.config)
+    if args.shard and args.shard not in app.config['FAMILY_SHARDS']:
+        parser.error(f"el shard '{args.shard}' no está en FAMILY_SHARDS")
+
+    with app.app_context():
+        set_shard(args.shard)
+        with family_context(args.family) if args.family else nullcontext():
+            files = export_tables(args.out, args.tables, args.format, app.config['EXPORT_CHUNK_SIZE'])
+        for f in files:
+            print(f"✅ {f['file']}: {f['rows']} filas, {f['bytes']} bytes")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Exportación completa de los datos de una familia (fin de año, copias).
+
+Cada tabla se lee por bloques de EXPORT_CHUNK_SIZE filas con un cursor del
+servidor (stream_results) y se escribe al momento en su fichero, así la
+memoria no depende del tamaño de la familia:
+
+- csv: <tabla>.csv.gz (UTF-8, cabecera con los nombres de columna)
+- parquet: <tabla>.parquet, un row group por bloque (requiere pyarrow,
+  ver requirements-export.txt)
+
+Los ficheros quedan en EXPORT_DIR/family-<id>/<nombre>/; la API los sirve
+desde ahí, así que el worker y gunicorn deben compartir ese directorio.
+"""
+import csv
+import gzip
+import os
+import shutil
+import time
+from datetime import date, datetime
+from sqlalchemy import select
+from models import (
+    ArchivedAssignment, ArchivedCompletion, Bonus, RewardRedemption, TaskAssignment, TaskCompletion, db
+)
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - dependencia opcional
+    pyarrow = None
+
+EXPORT_TABLES = {
+    'task_assignments': TaskAssignment,
+    'task_completions': TaskCompletion,
+    'reward_redemptions': RewardRedemption,
+    'bonuses': Bonus,
+    'task_assignments_archive': ArchivedAssignment,
+    'task_completions_archive': ArchivedCompletion,
+}
+
+FORMATS = {'csv': '.csv.gz', 'parquet': '.parquet'}
+
+def available_formats():
+    return [name for name in FORMATS if name != 'parquet' or pyarrow is not None]
+
+def export_path(directory, family_id, name):
+    """Directorio de una exportación (family_id None: exportación de todo el shard)"""
+    return os.path.join(directory, f'family-{family_id or "all"}', name)
+
+def artifact_path(directory, family_id, name, filename):
+    """Ruta de un fichero exportado, o None si no existe o el nombre no es válido"""
+    if os.path.basename(filename) != filename or os.path.basename(name) != name:
+        return None
+    path = os.path.join(export_path(directory, family_id, name), filename)
+    return path if os.path.isfile(path) else None
+
+def _chunks(model, chunk_size):
+    """Bloques de filas (tuplas) de la tabla en orden de id, con cursor del servidor"""
+    # Atributos del modelo, no columnas de la tabla: así se aplica el filtro de familia
+    columns = [getattr(model, column.name) for column in model.__table__.columns]
+    result = db.session.execute(
+        select(*columns).order_by(model.id)
+        .execution_options(stream_results=True, yield_per=chunk_size)
+    )
+    return [c.key for c in columns], result.partitions()
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+def _write_csv(path, names, chunks):
+    rows = 0
+    with gzip.open(path, 'wt', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        for chunk in chunks:
+            writer.writerows([_csv_value(v) for v in row] for row in chunk)
+            rows += len(chunk)
+    return rows
+
+# Tipo Python de la columna -> tipo Arrow
+_ARROW_TYPES = {
+    int: lambda: pyarrow.int64(),
+    bool: lambda: pyarrow.bool_(),
+    str: lambda: pyarrow.string(),
+    datetime: lambda: pyarrow.timestamp('us'),
+    date: lambda: pyarrow.date32(),
+}
+
+def _arrow_schema(model):
+    fields = []
+    for column in model.__table__.columns:
+        try:
+            arrow_type = _ARROW_TYPES.get(column.type.python_type, _ARROW_TYPES[str])()
+        except NotImplementedError:
+            arrow_type = pyarrow.string()
+        fields.append(pyarrow.field(column.name, arrow_type))
+    return pyarrow.schema(fields)
+
+def _write_parquet(path, names, chunks, model):
+    schema = _arrow_schema(model)
+    rows = 0
+    with pyarrow.parquet.ParquetWriter(path, schema, compression='snappy') as writer:
+        for chunk in chunks:
+            columns = list(zip(*chunk))
+            writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+            rows += len(chunk)
+        if not rows:
+            writer.write_table(schema.empty_table())
+    return rows
+
+def export_tables(directory, tables, fmt, chunk_size):
+    """
+    Escribe las tablas en `directory` y retorna [{table, file, rows, bytes}].
+    Se filtra por la familia del contexto (tenancy) como cualquier consulta.
+    """
+    if fmt not in available_formats():
+        raise ValueError(f'Unsupported export format: {fmt}')
+
+    os.makedirs(directory, exist_ok=True)
+    files = []
+    for table in tables:
+        model = EXPORT_TABLES[table]
+        filename = table + FORMATS[fmt]
+        path = os.path.join(directory, filename)
+        names, chunks = _chunks(model, chunk_size)
+        if fmt == 'csv':
+            rows = _write_csv(path, names, chunks)
+        else:
+            rows = _write_parquet(path, names, chunks, model)
+        files.append({'table': table, 'file': filename, 'rows': rows, 'bytes': os.path.getsize(path)})
+    return files
+
+def prune_exports(directory, family_id, max_age_days):
+    """Borra las exportaciones de la familia más antiguas que max_age_days"""
+    base = export_path(directory, family_id, '')
+    cutoff = time.time() - max_age_days * 86400
+    try:
+        names = os.listdir(base)
+    except FileNotFoundError:
+        return
+    for name in names:
+        path = os.path.join(base, name)
+        if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
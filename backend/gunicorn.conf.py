@@ -0,0 +1,43 @@
+"""
+Configuración de gunicorn
+Ejecutar con: gunicorn -c gunicorn.conf.py
+
+Perfiles (variable GUNICORN_WORKER_CLASS):
+- sync (por defecto): 4 procesos, un request por proceso. Igual que antes.
+- gevent: pocos procesos con cientos de conexiones cada uno (greenlets).
+  PyMySQL es Python puro, así que con el monkey-patching de gevent sus
+  sockets ceden el control y las consultas lentas o los streams SSE no
+  bloquean el proceso. Requiere: pip install -r requirements-async.txt
+"""
+import os
+
+wsgi_app = os.getenv('GUNICORN_APP', 'app:create_app()')
+bind = os.getenv('GUNICORN_BIND', '127.0.0.1:5001')
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+
+if worker_class in ('gevent', 'eventlet'):
+    # Cada proceso atiende muchas conexiones; el límite real de concurrencia
+    # contra MariaDB lo pone el pool (DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW)
+    workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+    worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '500'))
+    # La app no debe importarse antes del fork, o el patch llegaría tarde
+    preload_app = False
+else:
+    workers = int(os.getenv('GUNICORN_WORKERS', '4'))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+
+
+def on_starting(server):
+    """Antes de crear los workers: reiniciar métricas y hacer el conteo inicial"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        import metrics
+        from config import Config
+        metrics.clear_multiprocess_dir()
+        metrics.set_domain_baseline_from_url(Config.SQLALCHEMY_DATABASE_URI)
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
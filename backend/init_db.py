@@ -12,7 +12,8 @@ from getpass import getpass
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app import create_app, db
-from models import User, Icon
+from models import User, Icon, Family
+from tenancy import set_family
 
 def init_database():
     """Crear todas las tablas de la base de datos"""
@@ -26,7 +27,7 @@ def init_database():
     with app.app_context():
         print("📦 Creando tablas de base de datos...")
         try:
-            db.create_all()
+            db.create_all(bind_key=None)
             print("✅ Tablas creadas exitosamente")
         except Exception as e:
             print(f"❌ Error creando tablas: {e}")
@@ -41,6 +42,15 @@ def init_database():
             print(f"❌ Error inicializando iconos: {e}")
             return False
         
+        # Los usuarios y tareas que se creen a continuación van a la primera familia
+        family = Family.query.order_by(Family.id).first()
+        if not family:
+            family = Family(name='Familia')
+            db.session.add(family)
+            db.session.commit()
+            print(f"✅ Familia inicial creada (id {family.id}, código de login {family.login_code})")
+        set_family(family.id)
+        
         print()
         print("👤 ¿Deseas crear un usuario administrador? (s/n): ", end='')
         if input().lower() == 's':
@@ -0,0 +1,127 @@
+"""
+Instrumentación SQL por petición (opcional, SQL_INSTRUMENTATION=1).
+
+Cuenta y cronometra las consultas de cada petición con los eventos
+before/after_cursor_execute de SQLAlchemy y:
+- añade la cabecera Server-Timing (visible en las devtools del navegador),
+- registra en el log las peticiones que superan los umbrales configurados,
+- mantiene un ranking de sentencias normalizadas (huellas) por tiempo total,
+  consultable en /api/debug/queries.
+
+Las estadísticas son por proceso: cada worker de gunicorn tiene las suyas.
+"""
+import logging
+import re
+import threading
+import time
+from flask import g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_NUMBER = re.compile(r'\b\d+\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_IN_LIST = re.compile(r'\(\s*(?:\?|%\(\w+\)s|:\w+|%s)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+|%s))+\s*\)')
+_SPACES = re.compile(r'\s+')
+
+def fingerprint(statement):
+    """Normaliza una sentencia para agrupar las que solo difieren en valores"""
+    statement = _STRING.sub('?', statement)
+    statement = _NUMBER.sub('?', statement)
+    statement = _IN_LIST.sub('(?+)', statement)
+    return _SPACES.sub(' ', statement).strip()
+
+class QueryStats:
+    """Ranking acotado de huellas de sentencias, seguro entre hilos"""
+
+    def __init__(self, max_fingerprints=500):
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, statement, elapsed_ms):
+        key = fingerprint(statement)
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    # Descartar la huella con menos tiempo acumulado
+                    weakest = min(self._stats, key=lambda k: self._stats[k]['total_ms'])
+                    del self._stats[weakest]
+                entry = self._stats[key] = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+            entry['count'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+
+    def top(self, limit=20, order_by='total_ms'):
+        with self._lock:
+            items = [dict(statement=k, **v) for k, v in self._stats.items()]
+        items.sort(key=lambda item: item[order_by], reverse=True)
+        for item in items[:limit]:
+            item['total_ms'] = round(item['total_ms'], 2)
+            item['max_ms'] = round(item['max_ms'], 2)
+            item['avg_ms'] = round(item['total_ms'] / item['count'], 2)
+        return items[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+query_stats = QueryStats()
+
+# El inicio se guarda en el contexto de ejecución, no en la conexión: si la
+# sentencia falla no hay after_cursor_execute y no queda nada pendiente en
+# las conexiones del pool
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._ck_query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_ck_query_started', None)
+    if started is None:
+        return
+
+    # Solo se contabilizan las consultas hechas dentro de una petición
+    if has_app_context() and 'sql_stats' in g:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        g.sql_stats['count'] += 1
+        g.sql_stats['time_ms'] += elapsed_ms
+        query_stats.record(statement, elapsed_ms)
+
+def _start_request():
+    g.sql_stats = {'count': 0, 'time_ms': 0.0, 'started': time.perf_counter()}
+
+def _finish_request(response, app):
+    stats = g.pop('sql_stats', None)
+    if stats is None:
+        return response
+
+    total_ms = (time.perf_counter() - stats['started']) * 1000
+    response.headers.add(
+        'Server-Timing',
+        f'db;dur={stats["time_ms"]:.1f};desc="{stats["count"]} queries", app;dur={total_ms:.1f}'
+    )
+
+    if (stats['count'] > app.config['SLOW_REQUEST_QUERY_COUNT']
+            or stats['time_ms'] > app.config['SLOW_REQUEST_DB_MS']):
+        logger.warning(
+            'Slow request %s %s: %d queries, %.1f ms DB, %.1f ms total',
+            request.method, request.path, stats['count'], stats['time_ms'], total_ms
+        )
+    return response
+
+def init_app(app):
+    """Activa la instrumentación si SQL_INSTRUMENTATION está habilitado"""
+    app.config.setdefault('SLOW_REQUEST_QUERY_COUNT', 30)
+    app.config.setdefault('SLOW_REQUEST_DB_MS', 200)
+    query_stats.max_fingerprints = app.config.get('SQL_FINGERPRINTS_MAX', 500)
+
+    if not app.config.get('SQL_INSTRUMENTATION'):
+        return
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    app.before_request(_start_request)
+    app.after_request(lambda response: _finish_request(response, app))
@@ -0,0 +1,176 @@
+"""
+Cola de trabajos en segundo plano.
+
+Las operaciones largas (asignaciones masivas, exportaciones de historial...)
+se guardan en la tabla `jobs` y las procesa un proceso worker aparte
+(ver worker.py), de modo que los workers de gunicorn responden 202 al momento.
+
+Mientras un trabajo corre, un hilo del worker actualiza su heartbeat_at cada
+JOBS_HEARTBEAT_SECONDS. Si el worker muere o se reinicia a mitad, el
+heartbeat deja de avanzar y, pasados JOBS_LEASE_SECONDS sin él, el bucle de
+cualquier worker (que lo comprueba cada JOBS_HEARTBEAT_SECONDS, no en cada
+vuelta) lo marca como fallido: no se reintenta, puede haber hecho parte de
+sus cambios, y los clientes dejan de esperarlo. Un trabajo largo pero vivo
+no caduca, y el resultado solo se guarda si el trabajo sigue en 'running'.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import func, inspect, update
+from models import db, Job
+from tenancy import family_context, set_shard
+
+logger = logging.getLogger(__name__)
+
+# job_type -> función(payload, job) que retorna (resultado, status_code)
+_handlers = {}
+
+def job_handler(job_type):
+    """Decorator para registrar la función que procesa un tipo de trabajo"""
+    def decorator(fn):
+        _handlers[job_type] = fn
+        return fn
+    return decorator
+
+def enqueue(job_type, payload, user_id=None):
+    """Encola un trabajo y lo confirma en la base de datos"""
+    if job_type not in _handlers:
+        raise ValueError(f'Unknown job type: {job_type}')
+
+    job = Job(
+        job_type=job_type,
+        status='queued',
+        payload=json.dumps(payload),
+        created_by_id=user_id
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+def claim_next_job():
+    """
+    Reserva el siguiente trabajo en cola. La reserva es un UPDATE condicional,
+    así que varios workers pueden competir sin procesar dos veces el mismo trabajo.
+    """
+    while True:
+        job_id = db.session.query(Job.id).filter(
+            Job.status == 'queued'
+        ).order_by(Job.id).limit(1).scalar()
+
+        if job_id is None:
+            db.session.rollback()
+            return None
+
+        now = datetime.utcnow()
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == 'queued')
+            .values(status='running', started_at=now, heartbeat_at=now)
+        ).rowcount
+        db.session.commit()
+
+        if claimed:
+            return db.session.get(Job, job_id)
+
+def expire_stale_jobs(lease_seconds):
+    """Marca como fallidos los trabajos en 'running' sin heartbeat en lease_seconds"""
+    now = datetime.utcnow()
+    expired = db.session.execute(
+        update(Job)
+        .where(
+            Job.status == 'running',
+            func.coalesce(Job.heartbeat_at, Job.started_at) < now - timedelta(seconds=lease_seconds)
+        )
+        .values(status='failed', error='Job lease expired (worker stopped)', finished_at=now)
+    ).rowcount
+    db.session.commit()
+    return expired
+
+@contextmanager
+def heartbeat(job_id, interval):
+    """Actualiza heartbeat_at del trabajo cada `interval` segundos mientras dura el bloque"""
+    # El hilo no tiene contexto de Flask: la conexión (la del shard) se elige aquí
+    engine = db.session.get_bind(mapper=inspect(Job))
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(interval):
+            try:
+                with engine.begin() as connection:
+                    connection.execute(
+                        update(Job.__table__)
+                        .where(Job.id == job_id, Job.status == 'running')
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+            except Exception:
+                logger.exception('Heartbeat of job %s failed', job_id)
+
+    thread = threading.Thread(target=beat, name=f'job-{job_id}-heartbeat', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+def run_job(job, heartbeat_seconds=30):
+    """
+    Ejecuta un trabajo ya reservado (dentro de su familia) y guarda su
+    resultado o error, salvo que entretanto haya caducado (queda 'failed').
+    """
+    handler = _handlers.get(job.job_type)
+    job_id = job.id
+
+    try:
+        if handler is None:
+            raise ValueError(f'Unknown job type: {job.job_type}')
+        with heartbeat(job_id, heartbeat_seconds), family_context(job.family_id):
+            result, status_code = handler(job.get_payload(), job)
+    except Exception as e:
+        db.session.rollback()
+        values = {'status': 'failed', 'error': str(e)}
+    else:
+        values = {'result': json.dumps(result), 'status': 'finished'}
+        if status_code >= 400:
+            values['status'] = 'failed'
+            values['error'] = result.get('error') if isinstance(result, dict) else None
+
+    written = db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == 'running')
+        .values(finished_at=datetime.utcnow(), **values)
+    ).rowcount
+    db.session.commit()
+    if not written:
+        logger.warning('Job %s finished after its lease expired; result discarded', job_id)
+    return db.session.get(Job, job_id)
+
+def run_worker(app, once=False, shard=None):
+    """
+    Bucle principal del worker: procesa trabajos en cola hasta que no queden
+    (si once=True) o indefinidamente, esperando JOBS_POLL_INTERVAL segundos.
+    Cada shard de familias tiene su propia tabla jobs: un worker por shard.
+    """
+    poll_interval = app.config.get('JOBS_POLL_INTERVAL', 1.0)
+    lease_seconds = app.config.get('JOBS_LEASE_SECONDS', 300)
+    heartbeat_seconds = app.config.get('JOBS_HEARTBEAT_SECONDS', 30)
+    last_expiry = None
+
+    with app.app_context():
+        set_shard(shard)
+        while True:
+            if last_expiry is None or time.monotonic() - last_expiry >= heartbeat_seconds:
+                expire_stale_jobs(lease_seconds)
+                last_expiry = time.monotonic()
+            job = claim_next_job()
+            if job is not None:
+                run_job(job, heartbeat_seconds)
+                db.session.remove()
+                continue
+
+            if once:
+                return
+            time.sleep(poll_interval)
@@ -0,0 +1,199 @@
+"""
+Clasificación de los usuarios de una familia (/api/users/leaderboard).
+
+Cada proceso guarda por familia, en memoria, una lista ordenada por métrica:
+
+- score: créditos actuales (users.score, índice ix_users_family_score)
+- weekly: créditos ganados en los últimos 7 días UTC (suma de
+  stats_user_daily.credits_earned)
+- streak: racha actual más larga del usuario en alguna tarea (task_streaks,
+  a fecha del día del tablero)
+
+La lista se construye una vez y después se mantiene con el outbox: en cada
+lectura se leen los eventos nuevos de la familia y solo se vuelven a leer de
+la base los usuarios que aparecen en ellos. Las lecturas van con
+OUTBOX_SAFETY_SECONDS de retraso, como cualquier consumidor del outbox.
+Al cambiar de día (la ventana semanal se mueve) o si hay más de una página
+de eventos pendientes, se reconstruye entera.
+
+Las consultas a la base se hacen sin ningún lock; cada familia tiene el suyo
+y solo protege la actualización de sus listas en memoria, así que una
+familia no espera a otra. Se guardan como mucho LEADERBOARD_MAX_FAMILIES
+familias: al pasar del límite se descarta la usada hace más tiempo.
+
+El rango de un usuario se busca con bisect (O(log n)) y el top-k es un slice.
+"""
+import threading
+from collections import OrderedDict
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, select
+from models import db, OutboxEvent, StatsUserDaily, TaskStreak, User
+from outbox import read_events
+from streaks import current_on
+
+METRICS = ('score', 'weekly', 'streak')
+
+WEEK_DAYS = 7
+
+class Ranking:
+    """Valores de una métrica ordenados de mayor a menor (empates por user_id)"""
+
+    def __init__(self):
+        self._keys = []     # (-valor, user_id), ordenada
+        self._values = {}   # user_id -> valor
+
+    def __len__(self):
+        return len(self._keys)
+
+    def set(self, user_id, value):
+        self.remove(user_id)
+        self._values[user_id] = value
+        insort(self._keys, (-value, user_id))
+
+    def remove(self, user_id):
+        if user_id in self._values:
+            key = (-self._values.pop(user_id), user_id)
+            del self._keys[bisect_left(self._keys, key)]
+
+    def value(self, user_id):
+        return self._values.get(user_id)
+
+    def rank(self, user_id):
+        """Posición (1 = primero; empatados comparten posición) o None"""
+        if user_id not in self._values:
+            return None
+        return bisect_left(self._keys, (-self._values[user_id],)) + 1
+
+    def top(self, k):
+        """[(posición, user_id, valor)] de los k primeros"""
+        return [(self.rank(user_id), user_id, -value) for value, user_id in self._keys[:k]]
+
+class FamilyBoard:
+    """Clasificaciones de una familia y posición leída del outbox"""
+
+    def __init__(self, day, seq):
+        self.day = day
+        self.seq = seq
+        self.members = {}   # user_id -> (nick, figure)
+        self.rankings = {metric: Ranking() for metric in METRICS}
+        self.lock = threading.Lock()
+        self.generation = 0  # sube con cada apply() de _refresh
+
+    def week_start(self):
+        return self.day - timedelta(days=WEEK_DAYS - 1)
+
+    def fetch(self, user_ids=None):
+        """
+        Lee de la base los usuarios indicados (None: todos), sin tocar el
+        tablero. Retorna [(user_id, nick, figure, score, semanal, racha)].
+        """
+        kids = select(User.id, User.nick, User.figure, User.score).where(
+            User.role == 'user', User.is_active.is_(True)
+        ).order_by(User.score.desc(), User.id)
+        weekly = select(StatsUserDaily.user_id, func.sum(StatsUserDaily.credits_earned)).where(
+            StatsUserDaily.day.between(self.week_start(), self.day)
+        ).group_by(StatsUserDaily.user_id)
+        streak = select(TaskStreak.user_id, func.max(current_on(self.day))).group_by(TaskStreak.user_id)
+        if user_ids is not None:
+            kids = kids.where(User.id.in_(user_ids))
+            weekly = weekly.where(StatsUserDaily.user_id.in_(user_ids))
+            streak = streak.where(TaskStreak.user_id.in_(user_ids))
+
+        earned = dict(db.session.execute(weekly).all())
+        streaks = dict(db.session.execute(streak).all())
+        return [
+            (user_id, nick, figure, score or 0, int(earned.get(user_id) or 0), streaks.get(user_id) or 0)
+            for user_id, nick, figure, score in db.session.execute(kids)
+        ]
+
+    def apply(self, rows, user_ids=None):
+        """Recoloca los usuarios leídos con fetch() (con self.lock tomado)"""
+        for user_id in user_ids or ():
+            self.members.pop(user_id, None)
+            for ranking in self.rankings.values():
+                ranking.remove(user_id)
+        for user_id, nick, figure, score, weekly, streak in rows:
+            self.members[user_id] = (nick, figure)
+            self.rankings['score'].set(user_id, score)
+            self.rankings['weekly'].set(user_id, weekly)
+            self.rankings['streak'].set(user_id, streak)
+
+_boards = OrderedDict()     # family_id -> FamilyBoard, de menos a más reciente
+_boards_lock = threading.Lock()
+
+def _settled_seq():
+    """Última secuencia del outbox que read_events() ya entrega"""
+    settled = datetime.utcnow() - timedelta(seconds=current_app.config['OUTBOX_SAFETY_SECONDS'])
+    return db.session.execute(
+        select(func.max(OutboxEvent.id)).where(OutboxEvent.created_at <= settled)
+    ).scalar() or 0
+
+def _build(day):
+    board = FamilyBoard(day, _settled_seq())
+    board.apply(board.fetch())
+    return board
+
+def _get(family_id):
+    with _boards_lock:
+        board = _boards.get(family_id)
+        if board is not None:
+            _boards.move_to_end(family_id)
+        return board
+
+def _put(family_id, board, replaces):
+    """
+    Guarda un tablero recién construido si el de la familia sigue siendo
+    `replaces` (si otra petición ya lo cambió, se queda el suyo). Retorna el vigente.
+    """
+    with _boards_lock:
+        current = _boards.get(family_id)
+        if current is not None and current is not replaces:
+            return current
+        _boards[family_id] = board
+        _boards.move_to_end(family_id)
+        while len(_boards) > current_app.config['LEADERBOARD_MAX_FAMILIES']:
+            _boards.popitem(last=False)
+        return board
+
+def _refresh(family_id):
+    """
+    Clasificación de la familia al día. Las lecturas de la base van fuera de
+    los locks. Las filas leídas solo se aplican si nadie ha aplicado otras
+    desde que se tomó la posición (generation): unas filas leídas antes no
+    pisan nunca otras más nuevas. La petición que pierde no avanza la
+    posición, así sus eventos se vuelven a leer en la siguiente.
+    """
+    today = datetime.utcnow().date()
+    page_size = current_app.config['OUTBOX_PAGE_SIZE']
+    board = _get(family_id)
+    if board is None or board.day != today:
+        return _put(family_id, _build(today), board)
+
+    with board.lock:
+        generation, seq = board.generation, board.seq
+    events = read_events(seq, page_size)
+    if len(events) > page_size:
+        return _put(family_id, _build(today), board)
+    if events:
+        user_ids = {event.user_id for event in events}
+        rows = board.fetch(user_ids)
+        with board.lock:
+            if board.generation == generation:
+                board.apply(rows, user_ids)
+                board.seq = events[-1].id
+                board.generation += 1
+    return board
+
+def standings(family_id, metric, limit, user_id=None):
+    """
+    Top `limit` de la métrica y posición de `user_id` (con la familia ya en
+    el contexto). Retorna (board, [(posición, user_id, valor)], (posición, valor)).
+    """
+    board = _refresh(family_id)
+    with board.lock:
+        ranking = board.rankings[metric]
+        leaders = ranking.top(limit)
+        position = (ranking.rank(user_id), ranking.value(user_id)) if user_id in board.members else None
+        return board, leaders, position
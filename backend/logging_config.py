@@ -0,0 +1,128 @@
+"""
+Configuración de logging estructurado (JSON) para la API.
+
+- Cada petición recibe un request id (cabecera X-Request-ID o uno nuevo) que
+  se añade a todos los registros y se devuelve en la respuesta.
+- Los handlers reales escriben desde un hilo aparte (QueueHandler +
+  QueueListener): el worker solo encola el registro y nunca espera a stdout.
+- Los campos sensibles (códigos de acceso) se sustituyen antes de encolar.
+- Niveles por módulo con LOG_LEVELS="routes.auth=DEBUG,sqlalchemy.engine=WARNING".
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import sys
+import uuid
+from datetime import datetime, timezone
+from flask import g, has_request_context, request
+
+REDACTED = '***'
+SENSITIVE_FIELDS = {'access_code', 'icon_codes', 'old_icon_codes', 'new_icon_codes', 'password', 'token'}
+_SENSITIVE_IN_TEXT = re.compile(
+    r'(?P<key>access_code|icon_codes|old_icon_codes|new_icon_codes)(?P<sep>["\']?\s*[:=]\s*)'
+    r'(?P<value>\[[^\]]*\]|"[^"]*"|\'[^\']*\'|\d+(?:\s*,\s*\d+)*)'
+)
+
+# Atributos estándar de LogRecord: el resto son campos "extra"
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_listener = None
+
+class RequestContextFilter(logging.Filter):
+    """Añade request_id, método y ruta de la petición en curso"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id')
+            record.method = request.method
+            record.path = request.path
+        return True
+
+class RedactFilter(logging.Filter):
+    """Oculta códigos de acceso en los campos extra y en el texto del mensaje"""
+
+    def filter(self, record):
+        for key in SENSITIVE_FIELDS:
+            if hasattr(record, key):
+                setattr(record, key, REDACTED)
+
+        # Formatear aquí (en el hilo de la petición) para redactar también los args
+        message = record.getMessage()
+        redacted = _SENSITIVE_IN_TEXT.sub(lambda m: f"{m.group('key')}{m.group('sep')}{REDACTED}", message)
+        if redacted != message or record.args:
+            record.msg = redacted
+            record.args = None
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por línea"""
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith('_') and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+def _parse_levels(spec):
+    """'a.b=DEBUG,c=WARNING' -> {'a.b': 'DEBUG', 'c': 'WARNING'}"""
+    levels = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        name, _, level = item.partition('=')
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+def _assign_request_id():
+    g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+
+def _add_request_id_header(response):
+    if 'request_id' in g:
+        response.headers['X-Request-ID'] = g.request_id
+    return response
+
+def configure_logging(app):
+    """Configura el logging del proceso (una sola vez) y los hooks de request id"""
+    global _listener
+
+    app.before_request(_assign_request_id)
+    app.after_request(_add_request_id_header)
+
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if app.config.get('LOG_FORMAT', 'json') == 'json':
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(name)s] %(message)s'))
+
+    queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(RequestContextFilter())
+    queue_handler.addFilter(RedactFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
+
+    for name, level in _parse_levels(app.config.get('LOG_LEVELS')).items():
+        logging.getLogger(name).setLevel(level)
+
+    # Los registros de Flask/werkzeug también pasan por la cola
+    app.logger.handlers.clear()
+    app.logger.propagate = True
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
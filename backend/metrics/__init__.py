@@ -0,0 +1,148 @@
+"""
+Métricas en formato Prometheus (GET /metrics).
+
+- Latencia por ruta: histograma alimentado por los hooks de petición de Flask,
+  etiquetado por blueprint, regla de URL, método y clase de status.
+- Pool de conexiones: gauges por proceso (conexiones en uso, overflow).
+- Dominio: validaciones y canjes pendientes. No se calculan con COUNT(*) en
+  cada scrape: se cuenta una vez al arrancar y luego se suman/restan los
+  deltas de los eventos confirmados (ver events.emit).
+
+Con varios workers de gunicorn hay que definir PROMETHEUS_MULTIPROC_DIR: cada
+proceso escribe sus valores en ese directorio y /metrics los agrega. En ese
+modo el conteo inicial lo hace el proceso master (ver gunicorn.conf.py), para
+que no se sume una vez por worker.
+"""
+import glob
+import os
+import time
+from flask import g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram,
+    REGISTRY, generate_latest, multiprocess
+)
+from sqlalchemy import create_engine, text
+
+REQUEST_LATENCY = Histogram(
+    'credikids_request_duration_seconds',
+    'Latencia de las peticiones HTTP',
+    ['blueprint', 'route', 'method', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    'credikids_db_pool_checked_out',
+    'Conexiones del pool en uso',
+    multiprocess_mode='livesum'
+)
+DB_POOL_OVERFLOW = Gauge(
+    'credikids_db_pool_overflow',
+    'Conexiones abiertas por encima de pool_size',
+    multiprocess_mode='livesum'
+)
+
+DOMAIN_EVENTS = Counter(
+    'credikids_domain_events',
+    'Eventos de dominio confirmados (completions, validaciones, canjes...)',
+    ['type']
+)
+# 'sum' conserva los valores de procesos que ya terminaron: son deltas acumulados
+PENDING_VALIDATIONS = Gauge(
+    'credikids_pending_validations',
+    'Tareas completadas pendientes de validar',
+    multiprocess_mode='sum'
+)
+PENDING_REDEMPTIONS = Gauge(
+    'credikids_pending_redemptions',
+    'Canjes pendientes de aprobación',
+    multiprocess_mode='sum'
+)
+
+BASELINE_QUERIES = {
+    PENDING_VALIDATIONS: 'SELECT COUNT(*) FROM task_completions WHERE validation_score IS NULL',
+    PENDING_REDEMPTIONS: "SELECT COUNT(*) FROM reward_redemptions WHERE status = 'pending'",
+}
+
+def is_multiprocess():
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+def set_domain_baseline(connection):
+    """Fija el valor inicial de los gauges de dominio con un único conteo"""
+    for gauge, query in BASELINE_QUERIES.items():
+        gauge.set(connection.execute(text(query)).scalar() or 0)
+
+def set_domain_baseline_from_url(database_url):
+    """Conteo inicial sin crear la app (lo usa el master de gunicorn antes del fork)"""
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as connection:
+            set_domain_baseline(connection)
+    finally:
+        engine.dispose()
+
+def clear_multiprocess_dir():
+    """Borra los ficheros de una ejecución anterior (solo al arrancar el master)"""
+    for path in glob.glob(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], '*.db')):
+        os.remove(path)
+
+def _on_event(message):
+    event_type = message['type']
+    DOMAIN_EVENTS.labels(type=event_type).inc()
+
+    if event_type == 'completion':
+        PENDING_VALIDATIONS.inc()
+    elif event_type == 'validation':
+        PENDING_VALIDATIONS.dec()
+    elif event_type == 'reset' and message['data'].get('pending_validation_removed'):
+        PENDING_VALIDATIONS.dec()
+    elif event_type == 'redemption':
+        PENDING_REDEMPTIONS.inc()
+    elif event_type in ('redemption_approved', 'redemption_rejected'):
+        PENDING_REDEMPTIONS.dec()
+
+def _start_timer():
+    g.metrics_started = time.perf_counter()
+
+def _observe_request(response, db):
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return response
+
+    rule = request.url_rule.rule if request.url_rule else 'unmatched'
+    REQUEST_LATENCY.labels(
+        blueprint=request.blueprint or 'none',
+        route=rule,
+        method=request.method,
+        status=f'{response.status_code // 100}xx'
+    ).observe(time.perf_counter() - started)
+
+    pool = db.engine.pool
+    if hasattr(pool, 'checkedout'):
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+    return response
+
+def render_metrics():
+    """Retorna (cuerpo, content_type) con todas las métricas del despliegue"""
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def init_app(app, db, broker):
+    """Registra los hooks de petición y el listener de eventos de dominio"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    broker.add_listener(_on_event)
+
+    app.before_request(_start_timer)
+    app.after_request(lambda response: _observe_request(response, db))
+
+    # Un solo proceso: el conteo inicial se hace aquí
+    if not is_multiprocess():
+        with app.app_context():
+            with db.engine.connect() as connection:
+                set_domain_baseline(connection)
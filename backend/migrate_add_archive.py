@@ -0,0 +1,87 @@
+"""
+Migración: Archivo de asignaciones cerradas
+Fecha: 2026-10-19
+
+Crea task_assignments_archive y task_completions_archive, con las mismas
+columnas que las tablas vivas (se copian con INSERT ... SELECT) más
+archived_at. Para archivar: python archive_assignments.py
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from sqlalchemy import text
+
+def migrate():
+    """Crear las tablas del archivo"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            print("📝 Creando tabla task_assignments_archive...")
+            db.session.execute(text("""
+                CREATE TABLE IF NOT EXISTS task_assignments_archive (
+                    id INT PRIMARY KEY,
+                    family_id INT NOT NULL,
+                    task_id INT NOT NULL,
+                    user_id INT NOT NULL,
+                    assigned_date DATE NOT NULL,
+                    is_completed BOOLEAN DEFAULT FALSE,
+                    is_validated BOOLEAN DEFAULT FALSE,
+                    is_cancelled BOOLEAN DEFAULT FALSE,
+                    cancelled_at DATETIME,
+                    assigned_by_id INT NOT NULL,
+                    created_at DATETIME,
+                    updated_at DATETIME(6),
+                    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (family_id) REFERENCES families(id),
+                    FOREIGN KEY (task_id) REFERENCES tasks(id),
+                    FOREIGN KEY (user_id) REFERENCES users(id),
+                    FOREIGN KEY (assigned_by_id) REFERENCES users(id),
+                    INDEX ix_assignments_archive_family_date (family_id, assigned_date),
+                    INDEX ix_assignments_archive_family_user_date (family_id, user_id, assigned_date),
+                    INDEX ix_assignments_archive_family_cancelled (family_id, cancelled_at)
+                )
+            """))
+            
+            print("📝 Creando tabla task_completions_archive...")
+            db.session.execute(text("""
+                CREATE TABLE IF NOT EXISTS task_completions_archive (
+                    id INT PRIMARY KEY,
+                    family_id INT NOT NULL,
+                    assignment_id INT NOT NULL UNIQUE,
+                    task_id INT NOT NULL,
+                    user_id INT NOT NULL,
+                    completed_at DATETIME,
+                    completion_notes TEXT,
+                    validation_score INT,
+                    validated_by_id INT,
+                    validated_at DATETIME,
+                    validation_notes TEXT,
+                    credits_awarded INT DEFAULT 0,
+                    updated_at DATETIME(6),
+                    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (family_id) REFERENCES families(id),
+                    FOREIGN KEY (assignment_id) REFERENCES task_assignments_archive(id),
+                    FOREIGN KEY (task_id) REFERENCES tasks(id),
+                    FOREIGN KEY (user_id) REFERENCES users(id),
+                    FOREIGN KEY (validated_by_id) REFERENCES users(id),
+                    INDEX ix_completions_archive_family_completed (family_id, completed_at),
+                    INDEX ix_completions_archive_family_user_completed (family_id, user_id, completed_at)
+                )
+            """))
+            db.session.commit()
+            print("✅ Tablas de archivo creadas")
+            print("ℹ️  Ejecuta archive_assignments.py --dry-run para ver cuántas asignaciones se archivarían")
+            
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
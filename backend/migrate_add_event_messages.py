@@ -0,0 +1,43 @@
+"""
+Migración: Eventos SSE entre procesos
+Fecha: 2026-10-19
+
+Crea event_messages, por donde el backend de eventos 'database' reparte los
+eventos entre los workers de gunicorn y worker.py. Solo en la base principal.
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from sqlalchemy import text
+
+def migrate():
+    """Crear la tabla event_messages"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            print("📝 Creando tabla event_messages...")
+            db.session.execute(text("""
+                CREATE TABLE IF NOT EXISTS event_messages (
+                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    channels VARCHAR(255) NOT NULL,
+                    message TEXT NOT NULL,
+                    created_at DATETIME NOT NULL,
+                    INDEX ix_event_messages_created_at (created_at)
+                )
+            """))
+            db.session.commit()
+            print("✅ Tabla event_messages creada")
+            
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
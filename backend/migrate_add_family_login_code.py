@@ -0,0 +1,77 @@
+"""
+Migración: Código de familia para el login
+Fecha: 2026-10-19
+
+Los códigos de iconos solo son únicos dentro de cada familia, así que el
+login necesita saber la familia: families.login_code es el código que se
+teclea una vez en cada dispositivo. Se genera uno para cada familia existente
+(también en la copia de la fila de cada shard).
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from models import generate_login_code
+from sqlalchemy import text
+from tenancy import SHARD_PREFIX
+
+def _add_column(connection):
+    result = connection.execute(text("SHOW COLUMNS FROM families LIKE 'login_code'"))
+    if result.fetchone():
+        return False
+    connection.execute(text("ALTER TABLE families ADD COLUMN login_code VARCHAR(12) NULL AFTER name"))
+    return True
+
+def migrate():
+    """Agregar families.login_code y generar un código por familia"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            print("📝 Agregando login_code a families...")
+            with db.engine.begin() as connection:
+                if not _add_column(connection):
+                    print("⚠️  families.login_code ya existe, saltando columna")
+                pending = connection.execute(text("SELECT id, name FROM families WHERE login_code IS NULL")).all()
+                codes = {}
+                for family_id, name in pending:
+                    codes[family_id] = generate_login_code()
+                    connection.execute(
+                        text("UPDATE families SET login_code = :code WHERE id = :id"),
+                        {'code': codes[family_id], 'id': family_id}
+                    )
+                    print(f"🔑 {name} (id {family_id}): {codes[family_id]}")
+                connection.execute(text("ALTER TABLE families MODIFY login_code VARCHAR(12) NOT NULL"))
+                connection.execute(text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS uq_families_login_code ON families (login_code)"
+                ))
+            print("✅ families.login_code lista")
+            
+            # Copia de la fila en cada shard (solo la usa la clave foránea)
+            for bind_key, engine in db.engines.items():
+                if not bind_key or not bind_key.startswith(SHARD_PREFIX):
+                    continue
+                print(f"📝 Actualizando families en {bind_key}...")
+                with engine.begin() as connection:
+                    _add_column(connection)
+                    main_codes = db.session.execute(text("SELECT id, login_code FROM families")).all()
+                    for family_id, code in main_codes:
+                        connection.execute(
+                            text("UPDATE families SET login_code = :code WHERE id = :id"),
+                            {'code': code, 'id': family_id}
+                        )
+                print(f"✅ {bind_key} listo")
+            
+            print("ℹ️  Comunica a cada familia su código: lo pide la pantalla de login")
+            
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
@@ -0,0 +1,120 @@
+"""
+Migración: Agregar familias (multi-tenant) y family_id a todas las tablas
+Fecha: 2026-10-19
+
+Crea la tabla families con una familia inicial, asigna todos los datos
+existentes a esa familia y crea los índices compuestos que empiezan por
+family_id. El nick pasa a ser único dentro de cada familia.
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from sqlalchemy import text
+
+DEFAULT_FAMILY_NAME = os.getenv('DEFAULT_FAMILY_NAME', 'Familia')
+
+# tabla -> (family_id obligatorio, índices compuestos)
+TABLES = {
+    'users': (True, {
+        'ix_users_family_role': 'family_id, role, is_active',
+    }),
+    'tasks': (True, {
+        'ix_tasks_family_status': 'family_id, status',
+    }),
+    'task_assignments': (True, {
+        'ix_assignments_family_date': 'family_id, assigned_date',
+        'ix_assignments_family_user_date': 'family_id, user_id, assigned_date',
+    }),
+    'task_completions': (True, {
+        'ix_completions_family_validation': 'family_id, validation_score',
+        'ix_completions_family_user_completed': 'family_id, user_id, completed_at',
+    }),
+    'task_proposals': (True, {
+        'ix_proposals_family_status': 'family_id, status',
+    }),
+    'rewards': (True, {
+        'ix_rewards_family_active': 'family_id, is_active',
+    }),
+    'reward_redemptions': (True, {
+        'ix_redemptions_family_status': 'family_id, status',
+        'ix_redemptions_family_user_redeemed': 'family_id, user_id, redeemed_at',
+    }),
+    'bonuses': (True, {
+        'ix_bonuses_family_user': 'family_id, user_id',
+    }),
+    'jobs': (False, {
+        'ix_jobs_family_id': 'family_id, id',
+    }),
+}
+
+def migrate():
+    """Agregar tabla families y columna family_id"""
+    app = create_app()
+
+    with app.app_context():
+        try:
+            print("📝 Creando tabla families...")
+            db.session.execute(text("""
+                CREATE TABLE IF NOT EXISTS families (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    name VARCHAR(100) NOT NULL,
+                    shard VARCHAR(50) NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+
+            family_id = db.session.execute(text("SELECT MIN(id) FROM families")).scalar()
+            if family_id is None:
+                db.session.execute(
+                    text("INSERT INTO families (name) VALUES (:name)"),
+                    {'name': DEFAULT_FAMILY_NAME}
+                )
+                family_id = db.session.execute(text("SELECT MIN(id) FROM families")).scalar()
+                print(f"✅ Familia inicial '{DEFAULT_FAMILY_NAME}' creada (id {family_id})")
+            db.session.commit()
+
+            for table, (required, indexes) in TABLES.items():
+                result = db.session.execute(text(f"SHOW COLUMNS FROM {table} LIKE 'family_id'"))
+                if result.fetchone():
+                    print(f"⚠️  {table}.family_id ya existe, saltando columna")
+                else:
+                    print(f"📝 Agregando family_id a {table}...")
+                    db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN family_id INT NULL AFTER id"))
+                    db.session.execute(
+                        text(f"UPDATE {table} SET family_id = :family_id"),
+                        {'family_id': family_id}
+                    )
+                    null_clause = 'NOT NULL' if required else 'NULL'
+                    db.session.execute(text(f"""
+                        ALTER TABLE {table}
+                        MODIFY family_id INT {null_clause},
+                        ADD FOREIGN KEY (family_id) REFERENCES families(id)
+                    """))
+
+                for name, columns in indexes.items():
+                    db.session.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+                db.session.commit()
+                print(f"✅ {table} lista")
+
+            # El nick deja de ser único globalmente: único dentro de cada familia
+            print("📝 Cambiando unicidad de users.nick a (family_id, nick)...")
+            db.session.execute(text("ALTER TABLE users DROP INDEX IF EXISTS nick"))
+            db.session.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_users_family_nick ON users (family_id, nick)"
+            ))
+            db.session.commit()
+            print("✅ Índices actualizados")
+
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
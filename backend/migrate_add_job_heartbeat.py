@@ -0,0 +1,52 @@
+"""
+Migración: Heartbeat de los trabajos en segundo plano
+Fecha: 2026-10-19
+
+Agrega jobs.heartbeat_at, que el worker renueva mientras el trabajo corre:
+un trabajo solo caduca cuando deja de renovarse (worker parado), no por
+durar más de JOBS_LEASE_SECONDS. En la base principal y en cada shard.
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from sqlalchemy import text
+from tenancy import SHARD_PREFIX
+
+def _add_column(connection):
+    result = connection.execute(text("SHOW COLUMNS FROM jobs LIKE 'heartbeat_at'"))
+    if result.fetchone():
+        return False
+    connection.execute(text("ALTER TABLE jobs ADD COLUMN heartbeat_at DATETIME NULL AFTER finished_at"))
+    # Los que ya corren parten del momento de la migración
+    connection.execute(text("UPDATE jobs SET heartbeat_at = UTC_TIMESTAMP() WHERE status = 'running'"))
+    return True
+
+def migrate():
+    """Agregar jobs.heartbeat_at"""
+    app = create_app()
+
+    with app.app_context():
+        try:
+            for bind_key, engine in db.engines.items():
+                if bind_key and not bind_key.startswith(SHARD_PREFIX):
+                    continue
+                name = bind_key or 'principal'
+                print(f"📝 Agregando heartbeat_at a jobs ({name})...")
+                with engine.begin() as connection:
+                    if _add_column(connection):
+                        print(f"✅ jobs.heartbeat_at agregada ({name})")
+                    else:
+                        print(f"⚠️  jobs.heartbeat_at ya existe ({name}), saltando")
+
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
@@ -0,0 +1,39 @@
+"""
+Migración: Índice de puntuación para la clasificación
+Fecha: 2026-10-19
+
+La clasificación (/api/users/leaderboard) se construye leyendo los usuarios
+de la familia por score; ix_users_family_score permite leerlos ya ordenados
+del índice.
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from sqlalchemy import text
+
+def migrate():
+    """Crear índice (family_id, score) en users"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            print("📝 Creando índice ix_users_family_score...")
+            db.session.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_users_family_score "
+                "ON users (family_id, score)"
+            ))
+            db.session.commit()
+            print("✅ Índice creado")
+            
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
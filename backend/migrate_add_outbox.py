@@ -0,0 +1,68 @@
+"""
+Migración: Outbox de cambios (change data capture)
+Fecha: 2026-10-19
+
+Crea outbox_events, donde las rutas registran cada cambio de créditos o
+tareas en la misma transacción. El id (BIGINT) es la secuencia que leen los
+consumidores (/api/outbox).
+
+Cada usuario con saldo recibe un evento 'opening_balance' con su score
+actual, así la suma de deltas de un usuario es su saldo desde el principio.
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from sqlalchemy import text
+
+def migrate():
+    """Crear la tabla outbox_events"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            print("📝 Creando tabla outbox_events...")
+            db.session.execute(text("""
+                CREATE TABLE IF NOT EXISTS outbox_events (
+                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    family_id INT NOT NULL,
+                    event_type VARCHAR(30) NOT NULL,
+                    user_id INT NOT NULL,
+                    entity_id INT NULL,
+                    delta INT NOT NULL DEFAULT 0,
+                    created_at DATETIME NOT NULL,
+                    FOREIGN KEY (family_id) REFERENCES families(id),
+                    INDEX ix_outbox_family_id (family_id, id),
+                    INDEX ix_outbox_family_type (family_id, event_type, id)
+                )
+            """))
+            db.session.commit()
+            print("✅ Tabla outbox_events creada")
+            
+            # Solo usuarios sin eventos: repetir la migración no duplica saldos
+            print("📝 Registrando saldos iniciales...")
+            opened = db.session.execute(text("""
+                INSERT INTO outbox_events (family_id, event_type, user_id, entity_id, delta, created_at)
+                SELECT u.family_id, 'opening_balance', u.id, NULL, u.score, UTC_TIMESTAMP()
+                FROM users u
+                WHERE u.score <> 0
+                  AND NOT EXISTS (
+                      SELECT 1 FROM outbox_events e
+                      WHERE e.family_id = u.family_id AND e.user_id = u.id
+                  )
+                ORDER BY u.id
+            """)).rowcount
+            db.session.commit()
+            print(f"✅ {opened} saldos iniciales registrados")
+            
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
@@ -0,0 +1,39 @@
+"""
+Migración: Índice para el historial paginado de canjes
+Fecha: 2026-10-19
+
+El historial de canjes se pagina por (redeemed_at, id) dentro de la familia;
+ix_redemptions_family_redeemed permite leer cada página directamente del
+índice, sin ordenar todas las filas del rango de fechas.
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from sqlalchemy import text
+
+def migrate():
+    """Crear índice (family_id, redeemed_at, id) en reward_redemptions"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            print("📝 Creando índice ix_redemptions_family_redeemed...")
+            db.session.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_redemptions_family_redeemed "
+                "ON reward_redemptions (family_id, redeemed_at, id)"
+            ))
+            db.session.commit()
+            print("✅ Índice creado")
+            
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
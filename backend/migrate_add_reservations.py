@@ -0,0 +1,68 @@
+"""
+Migración: Agregar reservas de stock y créditos para canjes pendientes
+Fecha: 2026-10-19
+
+rewards.reserved: unidades apartadas por canjes pendientes
+users.reserved_credits: créditos apartados por canjes pendientes
+Ambos se calculan a partir de los canjes pendientes existentes.
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from sqlalchemy import text
+
+def migrate():
+    """Agregar columnas de reserva y calcular su valor inicial"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            result = db.session.execute(text("SHOW COLUMNS FROM rewards LIKE 'reserved'"))
+            if result.fetchone():
+                print("⚠️  rewards.reserved ya existe, saltando")
+            else:
+                print("📝 Agregando rewards.reserved...")
+                db.session.execute(text(
+                    "ALTER TABLE rewards ADD COLUMN reserved INT NOT NULL DEFAULT 0 AFTER stock"
+                ))
+            
+            result = db.session.execute(text("SHOW COLUMNS FROM users LIKE 'reserved_credits'"))
+            if result.fetchone():
+                print("⚠️  users.reserved_credits ya existe, saltando")
+            else:
+                print("📝 Agregando users.reserved_credits...")
+                db.session.execute(text(
+                    "ALTER TABLE users ADD COLUMN reserved_credits INT NOT NULL DEFAULT 0 AFTER score"
+                ))
+            db.session.commit()
+            
+            print("📝 Calculando reservas a partir de los canjes pendientes...")
+            db.session.execute(text("""
+                UPDATE rewards r
+                SET r.reserved = (
+                    SELECT COUNT(*) FROM reward_redemptions rr
+                    WHERE rr.reward_id = r.id AND rr.status = 'pending'
+                )
+            """))
+            db.session.execute(text("""
+                UPDATE users u
+                SET u.reserved_credits = (
+                    SELECT COALESCE(SUM(rr.credits_spent), 0) FROM reward_redemptions rr
+                    WHERE rr.user_id = u.id AND rr.status = 'pending'
+                )
+            """))
+            db.session.commit()
+            print("✅ Reservas calculadas")
+            
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
@@ -0,0 +1,62 @@
+"""
+Migración: Reglas de puntuación por familia
+Fecha: 2026-10-19
+
+Agrega families.scoring_rules / scoring_version (ver backend/scoring) y
+penalty_applied a las asignaciones (vivas y archivadas): la penalización
+que se restó al cancelar, para devolver lo mismo al resetear aunque las
+reglas cambien. Las canceladas de antes se rellenan con la regla de
+siempre: base_value entero si la tarea es obligatoria.
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from sqlalchemy import text
+
+# tabla -> (columna, definición)
+COLUMNS = [
+    ('families', 'scoring_rules', 'TEXT NULL'),
+    ('families', 'scoring_version', 'INT NOT NULL DEFAULT 0'),
+    ('task_assignments', 'penalty_applied', 'INT NOT NULL DEFAULT 0'),
+    ('task_assignments_archive', 'penalty_applied', 'INT NOT NULL DEFAULT 0'),
+]
+
+def migrate():
+    """Agregar las columnas de reglas de puntuación y penalty_applied"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            for table, column, definition in COLUMNS:
+                result = db.session.execute(text(f"SHOW COLUMNS FROM {table} LIKE '{column}'"))
+                if result.fetchone():
+                    print(f"⚠️  {table}.{column} ya existe, saltando")
+                    continue
+                
+                print(f"📝 Agregando {column} a {table}...")
+                db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+                
+                if column == 'penalty_applied':
+                    print(f"📝 Rellenando penalty_applied de las canceladas en {table}...")
+                    db.session.execute(text(f"""
+                        UPDATE {table} a
+                        JOIN tasks t ON t.id = a.task_id
+                        SET a.penalty_applied = t.base_value
+                        WHERE a.is_cancelled = TRUE AND t.task_type IN ('OBLIGATORY', 'obligatory')
+                    """))
+                db.session.commit()
+            
+            print("✅ Reglas de puntuación listas")
+            
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
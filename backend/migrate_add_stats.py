@@ -0,0 +1,74 @@
+"""
+Migración: Resúmenes para estadísticas (/api/stats)
+Fecha: 2026-10-19
+
+Crea stats_user_daily (usuario, día) y stats_task_weekly (tarea, semana).
+Las escrituras nuevas las mantienen al día; para los datos anteriores
+ejecutar después: python rebuild_stats.py --start <primera fecha>
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from sqlalchemy import text
+
+COUNTERS = """
+                    assigned INT NOT NULL DEFAULT 0,
+                    completed INT NOT NULL DEFAULT 0,
+                    cancelled INT NOT NULL DEFAULT 0,
+                    validated INT NOT NULL DEFAULT 0,
+                    score_1 INT NOT NULL DEFAULT 0,
+                    score_2 INT NOT NULL DEFAULT 0,
+                    score_3 INT NOT NULL DEFAULT 0,"""
+
+def migrate():
+    """Crear las tablas de resúmenes"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            print("📝 Creando tabla stats_user_daily...")
+            db.session.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS stats_user_daily (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    family_id INT NOT NULL,
+                    user_id INT NOT NULL,
+                    day DATE NOT NULL,{COUNTERS}
+                    credits_earned INT NOT NULL DEFAULT 0,
+                    credits_penalty INT NOT NULL DEFAULT 0,
+                    credits_bonus INT NOT NULL DEFAULT 0,
+                    credits_spent INT NOT NULL DEFAULT 0,
+                    FOREIGN KEY (family_id) REFERENCES families(id),
+                    UNIQUE KEY uq_stats_user_day (family_id, user_id, day),
+                    INDEX ix_stats_user_daily_family_day (family_id, day)
+                )
+            """))
+            
+            print("📝 Creando tabla stats_task_weekly...")
+            db.session.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS stats_task_weekly (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    family_id INT NOT NULL,
+                    task_id INT NOT NULL,
+                    week DATE NOT NULL,{COUNTERS}
+                    credits_awarded INT NOT NULL DEFAULT 0,
+                    FOREIGN KEY (family_id) REFERENCES families(id),
+                    UNIQUE KEY uq_stats_task_week (family_id, task_id, week),
+                    INDEX ix_stats_task_weekly_family_week (family_id, week)
+                )
+            """))
+            db.session.commit()
+            print("✅ Tablas de estadísticas creadas")
+            print("ℹ️  Ejecuta rebuild_stats.py --start <fecha> para los datos anteriores")
+            
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
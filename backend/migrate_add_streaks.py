@@ -0,0 +1,53 @@
+"""
+Migración: Rachas por usuario y tarea
+Fecha: 2026-10-19
+
+Crea task_streaks (racha actual y máxima por usuario y tarea). Las rutas de
+tareas la mantienen al día; para el historial anterior ejecutar después:
+python rebuild_streaks.py
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from sqlalchemy import text
+
+def migrate():
+    """Crear la tabla task_streaks"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            print("📝 Creando tabla task_streaks...")
+            db.session.execute(text("""
+                CREATE TABLE IF NOT EXISTS task_streaks (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    family_id INT NOT NULL,
+                    user_id INT NOT NULL,
+                    task_id INT NOT NULL,
+                    current INT NOT NULL DEFAULT 0,
+                    longest INT NOT NULL DEFAULT 0,
+                    last_date DATE,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (family_id) REFERENCES families(id),
+                    FOREIGN KEY (user_id) REFERENCES users(id),
+                    FOREIGN KEY (task_id) REFERENCES tasks(id),
+                    UNIQUE KEY uq_task_streaks_user_task (family_id, user_id, task_id),
+                    INDEX ix_task_streaks_family_current (family_id, current)
+                )
+            """))
+            db.session.commit()
+            print("✅ Tabla task_streaks creada")
+            print("ℹ️  Ejecuta rebuild_streaks.py para calcular las rachas del historial")
+            
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
@@ -0,0 +1,75 @@
+"""
+Migración: Sincronización por diferencias (/api/sync)
+Fecha: 2026-10-19
+
+Agrega updated_at (DATETIME(6), con microsegundos) e índice
+(family_id, updated_at) a las tablas sincronizadas, y crea sync_tombstones
+para registrar los borrados. updated_at se rellena con la última fecha
+conocida de cada fila.
+"""
+import sys
+import os
+
+# Agregar el directorio backend al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from sqlalchemy import text
+
+# tabla -> (índice, valor inicial de updated_at)
+TABLES = {
+    'task_assignments': ('ix_assignments_family_updated', 'COALESCE(cancelled_at, created_at)'),
+    'task_completions': ('ix_completions_family_updated', 'COALESCE(validated_at, completed_at)'),
+    'rewards': ('ix_rewards_family_updated', 'created_at'),
+    'reward_redemptions': ('ix_redemptions_family_updated', 'COALESCE(approved_at, redeemed_at)'),
+    'bonuses': ('ix_bonuses_family_updated', 'created_at'),
+}
+
+def migrate():
+    """Agregar updated_at a las tablas sincronizadas y crear sync_tombstones"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            for table, (index, initial) in TABLES.items():
+                result = db.session.execute(text(f"SHOW COLUMNS FROM {table} LIKE 'updated_at'"))
+                if result.fetchone():
+                    print(f"⚠️  {table}.updated_at ya existe, saltando columna")
+                else:
+                    print(f"📝 Agregando updated_at a {table}...")
+                    db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN updated_at DATETIME(6) NULL"))
+                
+                # También rewards.updated_at, que ya existía con precisión de segundos
+                db.session.execute(text(
+                    f"UPDATE {table} SET updated_at = COALESCE({initial}, UTC_TIMESTAMP(6)) WHERE updated_at IS NULL"
+                ))
+                db.session.execute(text(f"ALTER TABLE {table} MODIFY updated_at DATETIME(6) NOT NULL"))
+                
+                db.session.execute(text(f"CREATE INDEX IF NOT EXISTS {index} ON {table} (family_id, updated_at)"))
+                db.session.commit()
+                print(f"✅ {table} lista")
+            
+            print("📝 Creando tabla sync_tombstones...")
+            db.session.execute(text("""
+                CREATE TABLE IF NOT EXISTS sync_tombstones (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    family_id INT NOT NULL,
+                    table_name VARCHAR(50) NOT NULL,
+                    row_id INT NOT NULL,
+                    user_id INT NULL,
+                    deleted_at DATETIME(6) NOT NULL,
+                    FOREIGN KEY (family_id) REFERENCES families(id),
+                    INDEX ix_tombstones_family_deleted (family_id, deleted_at, id)
+                )
+            """))
+            db.session.commit()
+            print("✅ Tabla sync_tombstones creada")
+            
+        except Exception as e:
+            print(f"❌ Error en migración: {str(e)}")
+            db.session.rollback()
+            raise
+
+if __name__ == '__main__':
+    migrate()
+    print("\n✅ Migración completada exitosamente")
@@ -1,7 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
+from replica import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
+from .tenant import TenantMixin, current_family_id
+from .sync import SyncMixin, SyncTombstone
+from .family import Family, generate_login_code
 from .user import User
 from .task import Task, TaskType, TaskFrequency, TaskStatus
 from .task_assignment import TaskAssignment
@@ -11,9 +15,21 @@ from .reward import Reward
 from .reward_redemption import RewardRedemption
 from .icon import Icon
 from .bonus import Bonus
+from .job import Job
+from .outbox import OutboxEvent
+from .event_message import EventMessage
+from .stats import StatsUserDaily, StatsTaskWeekly
+from .archive import ArchivedAssignment, ArchivedCompletion
+from .streak import TaskStreak
 
 __all__ = [
     'db',
+    'TenantMixin',
+    'current_family_id',
+    'SyncMixin',
+    'SyncTombstone',
+    'Family',
+    'generate_login_code',
     'User',
     'Task',
     'TaskType',
@@ -26,5 +42,13 @@ __all__ = [
     'Reward',
     'RewardRedemption',
     'Icon',
-    'Bonus'
+    'Bonus',
+    'Job',
+    'OutboxEvent',
+    'EventMessage',
+    'StatsUserDaily',
+    'StatsTaskWeekly',
+    'ArchivedAssignment',
+    'ArchivedCompletion',
+    'TaskStreak'
 ]
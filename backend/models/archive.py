@@ -0,0 +1,111 @@
+from models import db
+from .tenant import TenantMixin
+from .sync import SyncTimestamp
+from datetime import datetime
+
+class ArchivedAssignment(TenantMixin, db.Model):
+    """Asignación cerrada (validada o cancelada) movida fuera de task_assignments"""
+    __tablename__ = 'task_assignments_archive'
+
+    # Mismas columnas que task_assignments (INSERT ... SELECT) + archived_at
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    assigned_date = db.Column(db.Date, nullable=False)
+    is_completed = db.Column(db.Boolean, default=False)
+    is_validated = db.Column(db.Boolean, default=False)
+    is_cancelled = db.Column(db.Boolean, default=False)
+    cancelled_at = db.Column(db.DateTime)
+    penalty_applied = db.Column(db.Integer, nullable=False, default=0)
+    assigned_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(SyncTimestamp)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_assignments_archive_family_date', 'family_id', 'assigned_date'),
+        db.Index('ix_assignments_archive_family_user_date', 'family_id', 'user_id', 'assigned_date'),
+        db.Index('ix_assignments_archive_family_cancelled', 'family_id', 'cancelled_at'),
+    )
+
+    task = db.relationship('Task')
+    user = db.relationship('User', foreign_keys=[user_id])
+    completion = db.relationship('ArchivedCompletion', back_populates='assignment', uselist=False)
+
+    def to_dict(self):
+        """Mismo formato que TaskAssignment.to_dict, con archived=True"""
+        return {
+            'id': self.id,
+            'task_id': self.task_id,
+            'user_id': self.user_id,
+            'assigned_date': self.assigned_date.isoformat(),
+            'is_completed': self.is_completed,
+            'is_validated': self.is_validated,
+            'is_cancelled': self.is_cancelled,
+            'cancelled_at': self.cancelled_at.isoformat() if self.cancelled_at else None,
+            'penalty_applied': self.penalty_applied,
+            'assigned_by_id': self.assigned_by_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'archived': True,
+            'task': self.task.to_dict() if self.task else None,
+            'user': {
+                'id': self.user.id,
+                'nick': self.user.nick,
+                'figure': self.user.figure,
+                'role': self.user.role
+            } if self.user else None,
+            'completion': self.completion.to_dict() if self.completion else None
+        }
+
+class ArchivedCompletion(TenantMixin, db.Model):
+    """Completado de una asignación archivada"""
+    __tablename__ = 'task_completions_archive'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    assignment_id = db.Column(db.Integer, db.ForeignKey('task_assignments_archive.id'), nullable=False, unique=True)
+    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    completed_at = db.Column(db.DateTime)
+    completion_notes = db.Column(db.Text)
+    validation_score = db.Column(db.Integer)
+    validated_by_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    validated_at = db.Column(db.DateTime)
+    validation_notes = db.Column(db.Text)
+    credits_awarded = db.Column(db.Integer, default=0)
+    updated_at = db.Column(SyncTimestamp)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_completions_archive_family_completed', 'family_id', 'completed_at'),
+        db.Index('ix_completions_archive_family_user_completed', 'family_id', 'user_id', 'completed_at'),
+    )
+
+    assignment = db.relationship('ArchivedAssignment', back_populates='completion')
+    task = db.relationship('Task')
+    user = db.relationship('User', foreign_keys=[user_id])
+
+    def to_dict(self):
+        """Mismo formato que TaskCompletion.to_dict, con archived=True"""
+        return {
+            'id': self.id,
+            'assignment_id': self.assignment_id,
+            'task_id': self.task_id,
+            'user_id': self.user_id,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'completion_notes': self.completion_notes,
+            'validation_score': self.validation_score,
+            'validated_by_id': self.validated_by_id,
+            'validated_at': self.validated_at.isoformat() if self.validated_at else None,
+            'validation_notes': self.validation_notes,
+            'credits_awarded': self.credits_awarded,
+            'archived': True,
+            'task': self.task.to_dict() if self.task else None,
+            'user': {
+                'id': self.user.id,
+                'nick': self.user.nick,
+                'figure': self.user.figure,
+                'role': self.user.role
+            } if self.user else None
+        }
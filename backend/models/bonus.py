@@ -1,7 +1,9 @@
 from models import db
+from .tenant import TenantMixin
+from .sync import SyncMixin
 from datetime import datetime
 
-class Bonus(db.Model):
+class Bonus(TenantMixin, SyncMixin, db.Model):
     """Bonos de créditos asignados por el administrador"""
     __tablename__ = 'bonuses'
     
@@ -12,6 +14,11 @@ class Bonus(db.Model):
     assigned_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_bonuses_family_updated', 'family_id', 'updated_at'),
+        db.Index('ix_bonuses_family_user', 'family_id', 'user_id'),
+    )
+    
     # Relationships
     user = db.relationship('User', foreign_keys=[user_id], backref='bonuses_received')
     assigned_by = db.relationship('User', foreign_keys=[assigned_by_id])
@@ -25,6 +32,7 @@ class Bonus(db.Model):
             'assigned_by_id': self.assigned_by_id,
             'assigned_by': self.assigned_by.nick if self.assigned_by else None,
             'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'user': {
                 'id': self.user.id,
                 'nick': self.user.nick,
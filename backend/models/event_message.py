@@ -0,0 +1,19 @@
+from models import db
+from .outbox import OutboxSequence
+from datetime import datetime
+
+class EventMessage(db.Model):
+    """
+    Evento SSE pendiente de repartir entre procesos (backend 'database' de
+    events). Vive en la base principal; se borra a los EVENTS_RETENTION_SECONDS.
+    """
+    __tablename__ = 'event_messages'
+
+    id = db.Column(OutboxSequence, primary_key=True, autoincrement=True)
+    channels = db.Column(db.String(255), nullable=False)  # canales separados por espacios
+    message = db.Column(db.Text, nullable=False)  # JSON
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_event_messages_created_at', 'created_at'),
+    )
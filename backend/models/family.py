@@ -0,0 +1,39 @@
+from . import db
+from datetime import datetime
+import json
+import secrets
+
+# Sin caracteres que se confunden al teclearlos (0/O, 1/I/L)
+LOGIN_CODE_ALPHABET = 'ABCDEFGHJKMNPQRSTUVWXYZ23456789'
+LOGIN_CODE_LENGTH = 8
+
+def generate_login_code():
+    return ''.join(secrets.choice(LOGIN_CODE_ALPHABET) for _ in range(LOGIN_CODE_LENGTH))
+
+class Family(db.Model):
+    """Familia (tenant): agrupa usuarios, tareas, premios e historial"""
+    __tablename__ = 'families'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    # Código de familia para el login (los códigos de iconos solo son únicos dentro de la familia)
+    login_code = db.Column(db.String(12), unique=True, nullable=False, default=generate_login_code)
+    # Bind de SQLALCHEMY_BINDS donde viven sus datos (NULL = base principal)
+    shard = db.Column(db.String(50))
+    # Reglas de puntuación (JSON, NULL = las de por defecto; ver backend/scoring)
+    scoring_rules = db.Column(db.Text)
+    scoring_version = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def get_scoring_rules(self):
+        return json.loads(self.scoring_rules) if self.scoring_rules else None
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'login_code': self.login_code,
+            'shard': self.shard,
+            'created_at': self.created_at.isoformat()
+        }
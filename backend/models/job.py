@@ -0,0 +1,51 @@
+from . import db
+from .tenant import TenantMixin, current_family_id
+from datetime import datetime
+from sqlalchemy.dialects import mysql
+import json
+
+# Texto largo para payloads/resultados (en MariaDB TEXT se queda en 64KB)
+LongText = db.Text().with_variant(mysql.LONGTEXT(), 'mysql')
+
+class Job(TenantMixin, db.Model):
+    """Trabajo en segundo plano encolado por una operación larga de administración"""
+    __tablename__ = 'jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, finished, failed
+    payload = db.Column(LongText)  # JSON con los parámetros
+    result = db.Column(LongText)  # JSON con el resultado
+    error = db.Column(db.Text)
+    
+    # NULL para trabajos lanzados fuera de una familia (scripts)
+    family_id = db.Column(db.Integer, db.ForeignKey('families.id'), default=current_family_id)
+    created_by_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # lo renueva el worker mientras corre (ver backend/jobs)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_jobs_status_id', 'status', 'id'),
+        db.Index('ix_jobs_family_id', 'family_id', 'id'),
+    )
+    
+    def get_payload(self):
+        return json.loads(self.payload) if self.payload else {}
+    
+    def get_result(self):
+        return json.loads(self.result) if self.result else None
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'status': self.status,
+            'error': self.error,
+            'created_by_id': self.created_by_id,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
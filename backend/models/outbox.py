@@ -0,0 +1,35 @@
+from models import db
+from .tenant import TenantMixin
+from datetime import datetime
+
+# BIGINT en MySQL/MariaDB; SQLite solo autoincrementa INTEGER PRIMARY KEY
+OutboxSequence = db.BigInteger().with_variant(db.Integer, 'sqlite')
+
+class OutboxEvent(TenantMixin, db.Model):
+    """
+    Cambio de créditos o tareas registrado en la misma transacción que la
+    escritura (outbox). El id es el número de secuencia que leen los consumidores.
+    """
+    __tablename__ = 'outbox_events'
+
+    id = db.Column(OutboxSequence, primary_key=True, autoincrement=True)
+    event_type = db.Column(db.String(30), nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    entity_id = db.Column(db.Integer)  # tarea, asignación, completado, propuesta, premio, canje o bonus según el tipo
+    delta = db.Column(db.Integer, nullable=False, default=0)  # cambio en users.score
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_outbox_family_id', 'family_id', 'id'),
+        db.Index('ix_outbox_family_type', 'family_id', 'event_type', 'id'),
+    )
+
+    def to_dict(self):
+        return {
+            'seq': self.id,
+            'type': self.event_type,
+            'user_id': self.user_id,
+            'entity_id': self.entity_id,
+            'delta': self.delta,
+            'created_at': self.created_at.isoformat()
+        }
@@ -1,7 +1,9 @@
 from . import db
+from .tenant import TenantMixin
+from .sync import SyncMixin
 from datetime import datetime
 
-class Reward(db.Model):
+class Reward(TenantMixin, SyncMixin, db.Model):
     """Premios canjeables por créditos"""
     __tablename__ = 'rewards'
     
@@ -12,12 +14,18 @@ class Reward(db.Model):
     credit_cost = db.Column(db.Integer, nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     stock = db.Column(db.Integer)  # NULL = ilimitado, número = stock disponible
+    # Unidades apartadas por canjes pendientes (se mantiene con UPDATE condicionales)
+    reserved = db.Column(db.Integer, nullable=False, default=0)
     
     created_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     created_by = db.relationship('User', foreign_keys=[created_by_id])
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_rewards_family_updated', 'family_id', 'updated_at'),
+        db.Index('ix_rewards_family_active', 'family_id', 'is_active'),
+    )
     
     # Relaciones
     redemptions = db.relationship('RewardRedemption', back_populates='reward', lazy='dynamic')
@@ -30,11 +38,8 @@ class Reward(db.Model):
         if self.stock is None:
             return None  # Stock ilimitado
         
-        # Contar solicitudes pendientes
-        pending_count = self.redemptions.filter_by(status='pending').count()
-        
-        # Stock disponible = stock actual - solicitudes pendientes
-        return self.stock - pending_count
+        # Stock disponible = stock actual - unidades reservadas por solicitudes pendientes
+        return self.stock - self.reserved
     
     def to_dict(self):
         return {
@@ -1,7 +1,9 @@
 from . import db
+from .tenant import TenantMixin
+from .sync import SyncMixin
 from datetime import datetime
 
-class RewardRedemption(db.Model):
+class RewardRedemption(TenantMixin, SyncMixin, db.Model):
     """Registro de canje de premios"""
     __tablename__ = 'reward_redemptions'
     
@@ -19,6 +21,14 @@ class RewardRedemption(db.Model):
     approved_at = db.Column(db.DateTime)
     rejection_reason = db.Column(db.Text)
     
+    __table_args__ = (
+        db.Index('ix_redemptions_family_updated', 'family_id', 'updated_at'),
+        db.Index('ix_redemptions_family_status', 'family_id', 'status'),
+        db.Index('ix_redemptions_family_user_redeemed', 'family_id', 'user_id', 'redeemed_at'),
+        # Historial paginado por (redeemed_at, id) sin filtro de usuario
+        db.Index('ix_redemptions_family_redeemed', 'family_id', 'redeemed_at', 'id'),
+    )
+    
     # Relaciones
     reward = db.relationship('Reward', back_populates='redemptions')
     user = db.relationship('User', foreign_keys=[user_id], back_populates='reward_redemptions')
@@ -31,6 +41,7 @@ class RewardRedemption(db.Model):
             'user_id': self.user_id,
             'credits_spent': self.credits_spent,
             'redeemed_at': self.redeemed_at.isoformat(),
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'notes': self.notes,
             'status': self.status,
             'approved_by_id': self.approved_by_id,
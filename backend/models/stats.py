@@ -0,0 +1,73 @@
+from models import db
+from .tenant import TenantMixin
+
+# Contadores de tareas, por fecha de la asignación
+TASK_COUNTERS = ('assigned', 'completed', 'cancelled', 'validated', 'score_1', 'score_2', 'score_3')
+
+# Movimientos de créditos, por día (UTC) en que ocurren
+CREDIT_FLOW = ('credits_earned', 'credits_penalty', 'credits_bonus', 'credits_spent')
+
+def _counter():
+    return db.Column(db.Integer, nullable=False, default=0)
+
+class StatsUserDaily(TenantMixin, db.Model):
+    """Resumen diario por usuario: tareas del día y créditos ganados/gastados"""
+    __tablename__ = 'stats_user_daily'
+
+    COLUMNS = TASK_COUNTERS + CREDIT_FLOW
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    day = db.Column(db.Date, nullable=False)
+
+    assigned = _counter()
+    completed = _counter()
+    cancelled = _counter()  # canceladas sin completar
+    validated = _counter()
+    score_1 = _counter()
+    score_2 = _counter()
+    score_3 = _counter()
+
+    credits_earned = _counter()   # validaciones (menos las revertidas)
+    credits_penalty = _counter()  # penalizaciones por cancelar obligatorias
+    credits_bonus = _counter()    # bonus netos (los castigos restan)
+    credits_spent = _counter()    # canjes aprobados
+
+    __table_args__ = (
+        db.UniqueConstraint('family_id', 'user_id', 'day', name='uq_stats_user_day'),
+        db.Index('ix_stats_user_daily_family_day', 'family_id', 'day'),
+    )
+
+    def to_dict(self):
+        data = {'user_id': self.user_id, 'day': self.day.isoformat()}
+        data.update({name: getattr(self, name) for name in self.COLUMNS})
+        return data
+
+class StatsTaskWeekly(TenantMixin, db.Model):
+    """Resumen semanal por tarea (week = lunes de la semana de la asignación)"""
+    __tablename__ = 'stats_task_weekly'
+
+    COLUMNS = TASK_COUNTERS + ('credits_awarded',)
+
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=False)
+    week = db.Column(db.Date, nullable=False)
+
+    assigned = _counter()
+    completed = _counter()
+    cancelled = _counter()
+    validated = _counter()
+    score_1 = _counter()
+    score_2 = _counter()
+    score_3 = _counter()
+    credits_awarded = _counter()
+
+    __table_args__ = (
+        db.UniqueConstraint('family_id', 'task_id', 'week', name='uq_stats_task_week'),
+        db.Index('ix_stats_task_weekly_family_week', 'family_id', 'week'),
+    )
+
+    def to_dict(self):
+        data = {'task_id': self.task_id, 'week': self.week.isoformat()}
+        data.update({name: getattr(self, name) for name in self.COLUMNS})
+        return data
@@ -0,0 +1,29 @@
+from models import db
+from .tenant import TenantMixin
+from datetime import datetime
+
+class TaskStreak(TenantMixin, db.Model):
+    """Racha actual y máxima de un usuario en una tarea (ver backend/streaks)"""
+    __tablename__ = 'task_streaks'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False)
+    current = db.Column(db.Integer, nullable=False, default=0)
+    longest = db.Column(db.Integer, nullable=False, default=0)
+    last_date = db.Column(db.Date)  # Fecha de la última asignación resuelta
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('family_id', 'user_id', 'task_id', name='uq_task_streaks_user_task'),
+        db.Index('ix_task_streaks_family_current', 'family_id', 'current'),
+    )
+
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'task_id': self.task_id,
+            'current': self.current,
+            'longest': self.longest,
+            'last_date': self.last_date.isoformat() if self.last_date else None
+        }
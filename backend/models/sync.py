@@ -0,0 +1,66 @@
+from models import db
+from .tenant import TenantMixin
+from datetime import datetime, timedelta
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session, declared_attr
+
+# Microsegundos en MySQL/MariaDB: DATETIME a secas redondea al segundo y dos
+# cambios del mismo segundo serían indistinguibles para /api/sync
+SyncTimestamp = db.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql', 'mariadb')
+
+class SyncMixin:
+    """
+    Tablas que los clientes sincronizan por diferencias (/api/sync): updated_at
+    se actualiza en cada INSERT/UPDATE, también en los UPDATE masivos, y los
+    DELETE dejan una fila en sync_tombstones.
+    Cada tabla declara su índice (family_id, updated_at).
+    """
+    @declared_attr
+    def updated_at(cls):
+        return db.Column(SyncTimestamp, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class SyncTombstone(TenantMixin, db.Model):
+    """Registro de filas borradas de tablas sincronizadas"""
+    __tablename__ = 'sync_tombstones'
+
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer)  # dueño de la fila (los usuarios solo reciben los suyos)
+    deleted_at = db.Column(SyncTimestamp, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_tombstones_family_deleted', 'family_id', 'deleted_at', 'id'),
+    )
+
+    def to_dict(self):
+        return {
+            'table': self.table_name,
+            'id': self.row_id,
+            'deleted_at': self.deleted_at.isoformat()
+        }
+
+@event.listens_for(Session, 'before_flush')
+def _record_tombstones(session, flush_context, instances):
+    deleted = [obj for obj in session.deleted if isinstance(obj, SyncMixin)]
+    if not deleted:
+        return
+
+    for obj in deleted:
+        session.add(SyncTombstone(
+            table_name=obj.__tablename__,
+            row_id=obj.id,
+            user_id=getattr(obj, 'user_id', None),
+            family_id=obj.family_id
+        ))
+
+    # Los borrados son raros: se aprovecha para purgar las lápidas caducadas
+    if has_app_context():
+        cutoff = datetime.utcnow() - timedelta(days=current_app.config.get('SYNC_TOMBSTONE_DAYS', 30))
+        session.execute(
+            db.delete(SyncTombstone)
+            .where(SyncTombstone.deleted_at < cutoff)
+            .execution_options(synchronize_session=False)
+        )
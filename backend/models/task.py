@@ -1,4 +1,5 @@
 from . import db
+from .tenant import TenantMixin
 from datetime import datetime
 from enum import Enum
 
@@ -18,7 +19,7 @@ class TaskStatus(str, Enum):
     INACTIVE = 'inactive'
     ARCHIVED = 'archived'
 
-class Task(db.Model):
+class Task(TenantMixin, db.Model):
     __tablename__ = 'tasks'
     
     id = db.Column(db.Integer, primary_key=True)
@@ -36,6 +37,10 @@ class Task(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_tasks_family_status', 'family_id', 'status'),
+    )
+    
     # Relaciones
     assignments = db.relationship('TaskAssignment', back_populates='task', lazy='dynamic')
     completions = db.relationship('TaskCompletion', back_populates='task', lazy='dynamic')
@@ -1,7 +1,9 @@
 from . import db
+from .tenant import TenantMixin
+from .sync import SyncMixin
 from datetime import datetime
 
-class TaskAssignment(db.Model):
+class TaskAssignment(TenantMixin, SyncMixin, db.Model):
     """Asignación de una tarea a un usuario con fecha específica"""
     __tablename__ = 'task_assignments'
     
@@ -13,11 +15,18 @@ class TaskAssignment(db.Model):
     is_validated = db.Column(db.Boolean, default=False)
     is_cancelled = db.Column(db.Boolean, default=False)  # Usuario decidió no completar
     cancelled_at = db.Column(db.DateTime)  # Fecha de cancelación
+    penalty_applied = db.Column(db.Integer, nullable=False, default=0)  # Créditos restados al cancelar
     
     assigned_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_assignments_family_updated', 'family_id', 'updated_at'),
+        db.Index('ix_assignments_family_date', 'family_id', 'assigned_date'),
+        db.Index('ix_assignments_family_user_date', 'family_id', 'user_id', 'assigned_date'),
+    )
+    
     # Relaciones
     task = db.relationship('Task', back_populates='assignments')
     user = db.relationship('User', foreign_keys=[user_id], back_populates='task_assignments')
@@ -34,8 +43,10 @@ class TaskAssignment(db.Model):
             'is_validated': self.is_validated,
             'is_cancelled': self.is_cancelled,
             'cancelled_at': self.cancelled_at.isoformat() if self.cancelled_at else None,
+            'penalty_applied': self.penalty_applied,
             'assigned_by_id': self.assigned_by_id,
             'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'task': self.task.to_dict() if self.task else None,
             'user': {
                 'id': self.user.id,
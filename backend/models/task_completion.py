@@ -1,7 +1,9 @@
 from . import db
+from .tenant import TenantMixin
+from .sync import SyncMixin
 from datetime import datetime
 
-class TaskCompletion(db.Model):
+class TaskCompletion(TenantMixin, SyncMixin, db.Model):
     """Registro de completado y validación de una tarea"""
     __tablename__ = 'task_completions'
     
@@ -14,7 +16,7 @@ class TaskCompletion(db.Model):
     completion_notes = db.Column(db.Text)  # Comentario del usuario al completar
     
     # Validación por admin
-    validation_score = db.Column(db.Integer)  # 1, 2 o 3 (10%, 60%, 100%)
+    validation_score = db.Column(db.Integer)  # 1, 2 o 3 (% del base_value según las reglas, ver backend/scoring)
     validated_by_id = db.Column(db.Integer, db.ForeignKey('users.id'))
     validated_at = db.Column(db.DateTime)
     validation_notes = db.Column(db.Text)
@@ -22,30 +24,18 @@ class TaskCompletion(db.Model):
     # Créditos otorgados
     credits_awarded = db.Column(db.Integer, default=0)
     
+    __table_args__ = (
+        db.Index('ix_completions_family_updated', 'family_id', 'updated_at'),
+        db.Index('ix_completions_family_validation', 'family_id', 'validation_score'),
+        db.Index('ix_completions_family_user_completed', 'family_id', 'user_id', 'completed_at'),
+    )
+    
     # Relaciones
     assignment = db.relationship('TaskAssignment', back_populates='completion')
     task = db.relationship('Task', back_populates='completions')
     user = db.relationship('User', foreign_keys=[user_id], back_populates='task_completions')
     validated_by = db.relationship('User', foreign_keys=[validated_by_id])
     
-    def calculate_credits(self, base_value):
-        """
-        Calcula créditos según la puntuación de validación
-        - Score 1: 10% del base_value
-        - Score 2: 60% del base_value
-        - Score 3: 100% del base_value
-        
-        Los créditos se SUMAN al administrador que valida.
-        Si es tarea obligatoria, se RESTAN al usuario.
-        """
-        if self.validation_score == 1:
-            return int(base_value * 0.10)
-        elif self.validation_score == 2:
-            return int(base_value * 0.60)
-        elif self.validation_score == 3:
-            return base_value
-        return 0
-    
     def to_dict(self):
         return {
             'id': self.id,
@@ -53,6 +43,7 @@ class TaskCompletion(db.Model):
             'task_id': self.task_id,
             'user_id': self.user_id,
             'completed_at': self.completed_at.isoformat(),
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'completion_notes': self.completion_notes,
             'validation_score': self.validation_score,
             'validated_by_id': self.validated_by_id,
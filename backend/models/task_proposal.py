@@ -1,4 +1,5 @@
 from . import db
+from .tenant import TenantMixin
 from datetime import datetime
 from enum import Enum
 
@@ -8,7 +9,7 @@ class ProposalStatus(str, Enum):
     REJECTED = 'rejected'
     MODIFIED = 'modified'
 
-class TaskProposal(db.Model):
+class TaskProposal(TenantMixin, db.Model):
     """Propuestas de tareas creadas por usuarios"""
     __tablename__ = 'task_proposals'
     
@@ -40,6 +41,10 @@ class TaskProposal(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_proposals_family_status', 'family_id', 'status'),
+    )
+    
     # Relaciones
     user = db.relationship('User', foreign_keys=[user_id], back_populates='task_proposals')
     reviewed_by = db.relationship('User', foreign_keys=[reviewed_by_id])
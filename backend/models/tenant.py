@@ -0,0 +1,22 @@
+from . import db
+from flask import g, has_app_context
+from sqlalchemy.orm import declared_attr
+
+def current_family_id():
+    """Familia del contexto actual (petición o trabajo), o None"""
+    if has_app_context():
+        return g.get('family_id')
+    return None
+
+class TenantMixin:
+    """
+    Columna family_id para los modelos que pertenecen a una familia.
+    Las consultas se filtran automáticamente por la familia actual (ver tenancy)
+    y las filas nuevas la toman del contexto si no se indica.
+    """
+    # Marca para RoutingSession: la tabla vive en el shard de la familia
+    __tenant__ = True
+    
+    @declared_attr
+    def family_id(cls):
+        return db.Column(db.Integer, db.ForeignKey('families.id'), nullable=False, default=current_family_id)
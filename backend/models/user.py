@@ -1,20 +1,28 @@
 from . import db
+from .tenant import TenantMixin
 from datetime import datetime
 import bcrypt
 
-class User(db.Model):
+class User(TenantMixin, db.Model):
     __tablename__ = 'users'
     
     id = db.Column(db.Integer, primary_key=True)
-    nick = db.Column(db.String(50), unique=True, nullable=False)
+    nick = db.Column(db.String(50), nullable=False)  # Único dentro de la familia
     figure = db.Column(db.String(100), nullable=False)  # Avatar/imagen
     access_code = db.Column(db.String(200), nullable=False)  # 4 iconos codificados
     role = db.Column(db.String(20), nullable=False, default='user')  # 'admin' o 'user'
     score = db.Column(db.Integer, default=0)  # Créditos actuales
+    reserved_credits = db.Column(db.Integer, nullable=False, default=0)  # Apartados por canjes pendientes
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.UniqueConstraint('family_id', 'nick', name='uq_users_family_nick'),
+        db.Index('ix_users_family_role', 'family_id', 'role', 'is_active'),
+        db.Index('ix_users_family_score', 'family_id', 'score'),
+    )
+    
     # Relaciones
     task_assignments = db.relationship('TaskAssignment', foreign_keys='TaskAssignment.user_id', back_populates='user', lazy='dynamic')
     task_completions = db.relationship('TaskCompletion', foreign_keys='TaskCompletion.user_id', back_populates='user', lazy='dynamic')
@@ -50,13 +58,20 @@ class User(db.Model):
         """Resta créditos del score (puede quedar negativo)"""
         self.score -= amount
     
+    def get_available_credits(self):
+        """Créditos que aún se pueden canjear (score menos canjes pendientes)"""
+        return self.score - (self.reserved_credits or 0)
+    
     def to_dict(self):
         return {
             'id': self.id,
+            'family_id': self.family_id,
             'nick': self.nick,
             'figure': self.figure,
             'role': self.role,
             'score': self.score,
+            'reserved_credits': self.reserved_credits,
+            'available_credits': self.get_available_credits(),
             'is_active': self.is_active,
             'created_at': self.created_at.isoformat(),
             'access_code_icons': self.get_access_code_icons()
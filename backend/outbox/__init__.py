@@ -0,0 +1,100 @@
+"""
+Outbox de cambios (change data capture).
+
+Cada escritura de las rutas de tasks, rewards y users (tareas, asignaciones,
+propuestas, premios, canjes, bonus y usuarios) llama a `record()` antes del
+commit: el evento se guarda en outbox_events en la misma transacción, así
+nunca hay un evento de un cambio que no llegó a guardarse ni un cambio sin
+su evento. Los borrados dejan un evento '<entidad>_deleted' con el id de la
+fila borrada. En los eventos de tareas y premios el usuario es el admin que
+hizo el cambio; en el resto, el usuario afectado.
+
+Los consumidores (analítica, cachés, réplicas) leen por número de secuencia
+con `read_events()` o GET /api/outbox. La compactación (`compact()`) funde
+los eventos antiguos de cada usuario en uno 'compacted' con el delta
+acumulado: la suma de deltas de un usuario sigue siendo su saldo, y un
+consumidor nuevo puede empezar desde la secuencia 0.
+
+Para que la suma cuadre también con los saldos anteriores al outbox, la
+migración (migrate_add_outbox.py) abre cada usuario con un evento
+'opening_balance' igual a su score de ese momento. Los usuarios creados por
+la API empiezan en 0; los scripts que crean usuarios con saldo (seed_data.py)
+no dejan evento.
+"""
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, func, select, update
+from models import db, OutboxEvent
+
+COMPACTED = 'compacted'
+OPENING_BALANCE = 'opening_balance'
+
+def record(event_type, user_id, entity_id=None, delta=0):
+    """Añade un evento a la transacción actual (delta: cambio en users.score)"""
+    db.session.add(OutboxEvent(
+        event_type=event_type,
+        user_id=user_id,
+        entity_id=entity_id,
+        delta=delta
+    ))
+
+def compaction_watermark():
+    """Última secuencia compactada: los eventos anteriores ya no existen por separado"""
+    return db.session.execute(
+        select(func.max(OutboxEvent.id)).where(OutboxEvent.event_type == COMPACTED)
+    ).scalar() or 0
+
+def read_events(after, limit, user_id=None):
+    """
+    Eventos con secuencia mayor que `after`, en orden (hasta limit + 1 para
+    saber si hay más). Los de los últimos OUTBOX_SAFETY_SECONDS se retienen:
+    una transacción que tomó su secuencia antes pero confirma después
+    quedaría por detrás de la posición del consumidor.
+    """
+    settled = datetime.utcnow() - timedelta(seconds=current_app.config['OUTBOX_SAFETY_SECONDS'])
+    query = OutboxEvent.query.filter(OutboxEvent.id > after, OutboxEvent.created_at <= settled)
+    if user_id is not None:
+        query = query.filter(OutboxEvent.user_id == user_id)
+    return query.order_by(OutboxEvent.id).limit(limit + 1).all()
+
+def compact(before):
+    """
+    Compacta los eventos creados antes de `before`. Por familia se toma la
+    última secuencia anterior a la fecha y, por usuario, se conserva su último
+    evento (convertido en 'compacted' con la suma de deltas) y se borra el resto.
+    Sin familia en el contexto recorre todas las del shard.
+    Retorna el número de eventos borrados.
+    """
+    cutoffs = db.session.execute(
+        select(OutboxEvent.family_id, func.max(OutboxEvent.id))
+        .where(OutboxEvent.created_at < before)
+        .group_by(OutboxEvent.family_id)
+    ).all()
+
+    removed = 0
+    for family_id, cutoff in cutoffs:
+        in_range = (OutboxEvent.family_id == family_id, OutboxEvent.id <= cutoff)
+        groups = db.session.execute(
+            select(OutboxEvent.user_id, func.max(OutboxEvent.id), func.sum(OutboxEvent.delta), func.count(OutboxEvent.id))
+            .where(*in_range)
+            .group_by(OutboxEvent.user_id)
+        ).all()
+
+        keep = []
+        for user_id, last_id, total, count in groups:
+            keep.append(last_id)
+            db.session.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id == last_id)
+                .values(event_type=COMPACTED, entity_id=None, delta=int(total or 0))
+                .execution_options(synchronize_session=False)
+            )
+
+        removed += db.session.execute(
+            delete(OutboxEvent)
+            .where(*in_range, OutboxEvent.id.not_in(keep))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+
+    return removed
@@ -0,0 +1,297 @@
+"""
+Profiler por muestreo para peticiones en producción.
+
+Un middleware WSGI envuelve la app. Si el profiling está activo y la petición
+entra en la muestra (porcentaje aleatorio, prefijo de ruta o cabecera
+X-Profile), un hilo auxiliar captura la pila del hilo de la petición cada
+`interval_ms` y al terminar se guarda un fichero de pilas colapsadas
+("marco;marco;marco N"), compatible con flamegraph.pl y speedscope. Las
+peticiones más cortas que el intervalo no llegan a generar fichero.
+
+Los ajustes se guardan en PROFILING_DIR/settings.json para que el admin pueda
+activarlo desde /api/debug/profiling y lo vean todos los workers de gunicorn.
+Con el profiling desactivado el coste por petición es una comparación de
+tiempo (el fichero se relee como mucho una vez por segundo).
+
+Con workers gevent no sirve un hilo auxiliar: la petición es un greenlet
+(sys._current_frames() no lo ve) y el hilo auxiliar también sería cooperativo.
+Ahí se usa `CallSampler`: un hook de sys.setprofile que, en las llamadas del
+greenlet de la petición, toma la pila cuando ha pasado el intervalo. Cuesta
+más por llamada, pero solo en las peticiones perfiladas.
+"""
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+
+SETTINGS_FILE = 'settings.json'
+PROFILE_SUFFIX = '.collapsed'
+RELOAD_SECONDS = 1.0
+
+_SLUG = re.compile(r'[^A-Za-z0-9]+')
+
+class ProfilerSettings:
+    """Ajustes compartidos entre procesos a través de un fichero JSON"""
+
+    FIELDS = ('enabled', 'sample_rate', 'routes', 'header', 'interval_ms', 'max_files')
+
+    def __init__(self, directory, defaults):
+        self.directory = directory
+        self.defaults = defaults
+        self._values = dict(defaults)
+        self._mtime = None
+        self._checked_at = 0.0
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, SETTINGS_FILE)
+
+    def current(self):
+        """Ajustes vigentes, releyendo el fichero si cambió"""
+        now = time.monotonic()
+        if now - self._checked_at >= RELOAD_SECONDS:
+            self._checked_at = now
+            self._reload()
+        return self._values
+
+    def _reload(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            self._values, self._mtime = dict(self.defaults), None
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._values = {**self.defaults, **{k: v for k, v in stored.items() if k in self.FIELDS}}
+        self._mtime = mtime
+
+    def update(self, changes):
+        """Guarda los cambios (escritura atómica) y retorna los ajustes resultantes"""
+        values = {**self.current(), **{k: v for k, v in changes.items() if k in self.FIELDS}}
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(values, f)
+        os.replace(tmp_path, self.path)
+        self._values = values
+        self._checked_at = 0.0
+        return values
+
+    def reset(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self._values, self._mtime = dict(self.defaults), None
+        return self._values
+
+def _collapse(frame, stop_code):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        # Los marcos por encima del middleware son del servidor WSGI
+        if code is stop_code:
+            break
+        names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+def _uses_greenlets():
+    """¿Está el proceso parcheado por gevent (worker gevent de gunicorn)?"""
+    gevent_monkey = sys.modules.get('gevent.monkey')
+    return gevent_monkey is not None and gevent_monkey.is_module_patched('threading')
+
+class StackSampler:
+    """Captura periódicamente la pila de un hilo y acumula pilas colapsadas"""
+
+    def __init__(self, thread_id, interval, stop_code=None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stop_code = stop_code
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = _collapse(frame, self.stop_code) if frame is not None else None
+            # Una muestra tomada mientras se llamaba a stop() no es de la petición
+            if stack and not self._stop.is_set():
+                self.stacks[stack] += 1
+
+class CallSampler:
+    """
+    Muestreo para greenlets: en cada llamada del greenlet que llamó a start()
+    se toma la pila si ha pasado el intervalo desde la última muestra
+    """
+
+    def __init__(self, interval, stop_code=None):
+        self.interval = interval
+        self.stop_code = stop_code
+        self.stacks = Counter()
+        self._owner = None
+        self._next = 0.0
+        self._previous = None
+
+    def start(self):
+        import greenlet
+        self._getcurrent = greenlet.getcurrent
+        self._owner = greenlet.getcurrent()
+        self._next = time.perf_counter() + self.interval
+        self._previous = sys.getprofile()
+        sys.setprofile(self._profile)
+
+    def stop(self):
+        sys.setprofile(self._previous)
+
+    def _profile(self, frame, event, arg):
+        if event != 'call':
+            return
+        now = time.perf_counter()
+        # sys.setprofile es por hilo: se ignoran las llamadas de otros greenlets
+        if now < self._next or self._getcurrent() is not self._owner:
+            return
+        self._next = now + self.interval
+        stack = _collapse(frame, self.stop_code)
+        if stack:
+            self.stacks[stack] += 1
+
+class ProfilingMiddleware:
+    """Middleware WSGI que perfila las peticiones seleccionadas"""
+
+    def __init__(self, wsgi_app, settings):
+        self.wsgi_app = wsgi_app
+        self.settings = settings
+
+    def _should_profile(self, environ, values):
+        header = values.get('header')
+        if header and environ.get('HTTP_' + header.upper().replace('-', '_')):
+            return True
+        path = environ.get('PATH_INFO', '')
+        if any(path.startswith(prefix) for prefix in values.get('routes') or []):
+            return True
+        return random.random() < (values.get('sample_rate') or 0)
+
+    def __call__(self, environ, start_response):
+        values = self.settings.current()
+        if not values['enabled'] or not self._should_profile(environ, values):
+            return self.wsgi_app(environ, start_response)
+
+        status = {}
+
+        def capture_start_response(code, headers, *args):
+            status['code'] = code.split(' ', 1)[0]
+            status['request_id'] = dict(headers).get('X-Request-ID')
+            return start_response(code, headers, *args)
+
+        interval = max(values['interval_ms'], 1) / 1000
+        stop_code = ProfilingMiddleware.__call__.__code__
+        if _uses_greenlets():
+            sampler = CallSampler(interval, stop_code=stop_code)
+        else:
+            sampler = StackSampler(threading.get_ident(), interval, stop_code=stop_code)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            return self.wsgi_app(environ, capture_start_response)
+        finally:
+            sampler.stop()
+            save_profile(
+                self.settings.directory,
+                sampler.stacks,
+                method=environ.get('REQUEST_METHOD', ''),
+                path=environ.get('PATH_INFO', ''),
+                status=status.get('code'),
+                duration_ms=(time.perf_counter() - started) * 1000,
+                request_id=status.get('request_id') or uuid.uuid4().hex,
+                max_files=values['max_files']
+            )
+
+def save_profile(directory, stacks, method, path, status, duration_ms, request_id, max_files):
+    """Escribe el perfil y borra los más antiguos por encima de max_files"""
+    if not stacks:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    name = '{}_{}_{}_{}_{}ms_{}{}'.format(
+        datetime.utcnow().strftime('%Y%m%dT%H%M%S%f'),
+        method,
+        _SLUG.sub('-', path).strip('-')[:60] or 'root',
+        status or 'na',
+        int(duration_ms),
+        _SLUG.sub('-', request_id)[:32],
+        PROFILE_SUFFIX
+    )
+    with open(os.path.join(directory, name), 'w') as f:
+        for stack, count in stacks.most_common():
+            f.write(f'{stack} {count}\n')
+
+    profiles = list_profiles(directory)
+    for old in profiles[max_files:]:
+        try:
+            os.remove(os.path.join(directory, old['name']))
+        except FileNotFoundError:
+            pass
+    return name
+
+def list_profiles(directory):
+    """Perfiles guardados, del más reciente al más antiguo"""
+    try:
+        names = [n for n in os.listdir(directory) if n.endswith(PROFILE_SUFFIX)]
+    except FileNotFoundError:
+        return []
+
+    profiles = []
+    for name in sorted(names, reverse=True):
+        parts = name[:-len(PROFILE_SUFFIX)].split('_')
+        if len(parts) != 6:
+            continue
+        created, method, path, status, duration, request_id = parts
+        profiles.append({
+            'name': name,
+            'created_at': datetime.strptime(created, '%Y%m%dT%H%M%S%f').isoformat(),
+            'method': method,
+            'path': path,
+            'status': status,
+            'duration_ms': int(duration.rstrip('ms')),
+            'request_id': request_id
+        })
+    return profiles
+
+def profile_path(directory, name):
+    """Ruta de un perfil guardado, o None si el nombre no es válido"""
+    if os.path.basename(name) != name or not name.endswith(PROFILE_SUFFIX):
+        return None
+    path = os.path.join(directory, name)
+    return path if os.path.isfile(path) else None
+
+def init_app(app):
+    """Envuelve la app con el middleware y deja los ajustes en app.extensions"""
+    settings = ProfilerSettings(app.config['PROFILING_DIR'], {
+        'enabled': app.config['PROFILING_ENABLED'],
+        'sample_rate': app.config['PROFILING_SAMPLE_RATE'],
+        'routes': app.config['PROFILING_ROUTES'],
+        'header': app.config['PROFILING_HEADER'],
+        'interval_ms': app.config['PROFILING_INTERVAL_MS'],
+        'max_files': app.config['PROFILING_MAX_FILES']
+    })
+    app.extensions['profiling'] = settings
+    app.wsgi_app = ProfilingMiddleware(app.wsgi_app, settings)
@@ -0,0 +1,46 @@
+"""
+Recalcula los resúmenes de estadísticas (stats_user_daily, stats_task_weekly)
+desde las tablas de origen. Necesario tras crear las tablas (datos previos)
+o tras escrituras hechas por fuera del ORM.
+
+    python rebuild_stats.py --start 2025-01-01            # hasta hoy
+    python rebuild_stats.py --start 2025-01-01 --end 2025-12-31
+    python rebuild_stats.py --start 2025-01-01 --shard eu2
+
+Desde la API: POST /api/stats/rebuild (trabajo en segundo plano, por familia).
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def _date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+def main():
+    parser = argparse.ArgumentParser(description='Recalcula los resúmenes de estadísticas')
+    parser.add_argument('--start', type=_date, required=True, help='primer día (YYYY-MM-DD)')
+    parser.add_argument('--end', type=_date, default=datetime.now().date(), help='último día (default hoy)')
+    parser.add_argument('--shard', help='nombre de un shard de FAMILY_SHARDS')
+    parser.add_argument('--config', default=os.getenv('FLASK_CONFIG', 'production'))
+    args = parser.parse_args()
+
+    from app import create_app
+    from models import db
+    from stats import rebuild
+    from tenancy import set_shard
+
+    app = create_app(args.config)
+    if args.shard and args.shard not in app.config['FAMILY_SHARDS']:
+        parser.error(f"el shard '{args.shard}' no está en FAMILY_SHARDS")
+
+    with app.app_context():
+        set_shard(args.shard)
+        user_days, task_weeks = rebuild(args.start, args.end)
+        db.session.commit()
+        print(f"✅ {user_days} filas usuario-día y {task_weeks} filas tarea-semana recalculadas")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Recalcula las rachas (task_streaks) desde el historial de asignaciones,
+incluidas las archivadas, en una sola pasada ordenada. Necesario tras crear
+la tabla (datos previos) o tras escrituras hechas por fuera de la API.
+
+    python rebuild_streaks.py                 # todas las familias
+    python rebuild_streaks.py --family 1
+    python rebuild_streaks.py --shard eu2
+
+Desde la API: POST /api/tasks/streaks/rebuild (trabajo en segundo plano, por familia).
+"""
+import argparse
+import os
+import sys
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def main():
+    parser = argparse.ArgumentParser(description='Recalcula las rachas de tareas')
+    parser.add_argument('--family', type=int, help='id de la familia (default todas)')
+    parser.add_argument('--shard', help='nombre de un shard de FAMILY_SHARDS (sin --family)')
+    parser.add_argument('--config', default=os.getenv('FLASK_CONFIG', 'production'))
+    args = parser.parse_args()
+
+    from app import create_app
+    from models import db
+    from streaks import rebuild
+    from tenancy import family_context, set_shard
+
+    app = create_app(args.config)
+    if args.shard and args.shard not in app.config['FAMILY_SHARDS']:
+        parser.error(f"el shard '{args.shard}' no está en FAMILY_SHARDS")
+
+    with app.app_context():
+        set_shard(args.shard)
+        with family_context(args.family) if args.family else nullcontext():
+            streaks = rebuild()
+            db.session.commit()
+        print(f"✅ {streaks} rachas recalculadas")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Comprueba (y opcionalmente corrige) las reservas de canjes pendientes
+(ver backend/reservations).
+
+    python reconcile_reservations.py                # solo informa
+    python reconcile_reservations.py --fix          # recalcula las filas con diferencias
+    python reconcile_reservations.py --shard eu2    # familias de un shard
+
+Desde la API: GET /api/debug/reservations y POST /api/debug/reservations/reconcile.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def main():
+    parser = argparse.ArgumentParser(description='Comprueba las reservas de canjes pendientes')
+    parser.add_argument('--fix', action='store_true', help='recalcular las filas con diferencias')
+    parser.add_argument('--shard', help='nombre de un shard de FAMILY_SHARDS')
+    parser.add_argument('--config', default=os.getenv('FLASK_CONFIG', 'production'))
+    args = parser.parse_args()
+
+    from app import create_app
+    from reservations import find_reservation_drift, fix_reservation_drift
+    from tenancy import set_shard
+
+    app = create_app(args.config)
+    if args.shard and args.shard not in app.config['FAMILY_SHARDS']:
+        parser.error(f"el shard '{args.shard}' no está en FAMILY_SHARDS")
+
+    with app.app_context():
+        set_shard(args.shard)
+        drift = find_reservation_drift()
+        for u in drift['users']:
+            print(f"⚠️  Usuario {u['id']} '{u['nick']}' (familia {u['family_id']}): "
+                  f"reserved_credits={u['reserved_credits']}, esperado {u['expected']}")
+        for r in drift['rewards']:
+            print(f"⚠️  Premio {r['id']} '{r['name']}' (familia {r['family_id']}): "
+                  f"reserved={r['reserved']}, esperado {r['expected']}")
+
+        if not drift['users'] and not drift['rewards']:
+            print("✅ Reservas cuadradas")
+        elif args.fix:
+            fix_reservation_drift(drift)
+            print(f"✅ Corregidos {len(drift['users'])} usuarios y {len(drift['rewards'])} premios")
+        else:
+            print("Ejecuta con --fix para corregirlo")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Lecturas en réplica para endpoints de consulta (opcional).
+
+Si DATABASE_REPLICA_URL está definido se registra el bind 'replica' en
+SQLALCHEMY_BINDS. Las vistas decoradas con @read_replica leen de la réplica;
+las escrituras (flush) siempre van al primario.
+
+Se vuelve al primario cuando:
+- la réplica va más retrasada que REPLICA_MAX_LAG_SECONDS (se comprueba como
+  mucho cada REPLICA_LAG_CHECK_SECONDS) o la replicación está parada,
+- una consulta en la réplica falla (la vista se repite en el primario y la
+  réplica queda descartada REPLICA_COOLDOWN_SECONDS),
+- el cliente escribió hace menos de REPLICA_STICKY_SECONDS: las respuestas de
+  peticiones que escriben llevan la cookie ck_primary_until, así quien acaba
+  de modificar algo ve su cambio aunque la réplica aún no lo tenga.
+"""
+import logging
+import threading
+import time
+from functools import wraps
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, inspect, text
+from sqlalchemy.exc import DBAPIError
+
+REPLICA_BIND = 'replica'
+STICKY_COOKIE = 'ck_primary_until'
+
+logger = logging.getLogger(__name__)
+
+class RoutingSession(Session):
+    """Sesión que elige la base: shard de la familia, réplica (@read_replica) o primario"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context():
+            # Familias repartidas en otra base (ver tenancy): sus tablas van al shard
+            shard = g.get('db_shard')
+            if shard and mapper is not None and getattr(inspect(mapper).class_, '__tenant__', False):
+                return self._db.engines[shard]
+            
+            # Tras una escritura, el resto de la petición también lee del primario
+            if (not self._flushing and has_request_context()
+                    and g.get('db_route') == REPLICA_BIND and not g.get('db_wrote')):
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _remember_write(session, flush_context):
+    if has_request_context():
+        g.db_wrote = True
+
+class ReplicaHealth:
+    """Estado de la réplica por proceso: retraso medido y descartes tras errores"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._healthy = True
+        self._unhealthy_until = 0.0
+
+    def usable(self, app, engine):
+        now = time.monotonic()
+        if now < self._unhealthy_until:
+            return False
+        with self._lock:
+            if now - self._checked_at >= app.config['REPLICA_LAG_CHECK_SECONDS']:
+                self._checked_at = now
+                self._healthy = self._check_lag(engine, app.config['REPLICA_MAX_LAG_SECONDS'])
+        return self._healthy
+
+    def mark_failed(self, cooldown):
+        self._unhealthy_until = time.monotonic() + cooldown
+
+    def _check_lag(self, engine, max_lag):
+        if engine.dialect.name not in ('mysql', 'mariadb'):
+            return True
+        try:
+            with engine.connect() as connection:
+                status = connection.execute(text('SHOW SLAVE STATUS')).mappings().first()
+        except DBAPIError:
+            # Lo habitual: al usuario de la réplica le falta REPLICATION CLIENT
+            logger.warning('Replica lag check failed (does the replica user have REPLICATION CLIENT?), '
+                           'reading from primary', exc_info=True)
+            return False
+
+        # Sin estado de replicación: la URL apunta a un servidor que no es réplica
+        if status is None:
+            return True
+        lag = status.get('Seconds_Behind_Master')
+        if lag is None or lag > max_lag:
+            logger.warning('Replica unusable, reading from primary', extra={'replica_lag': lag})
+            return False
+        return True
+
+health = ReplicaHealth()
+
+def _replica_available(db):
+    if REPLICA_BIND not in current_app.config.get('SQLALCHEMY_BINDS', {}):
+        return False
+    primary_until = request.cookies.get(STICKY_COOKIE, type=float)
+    if primary_until and primary_until > time.time():
+        return False
+    return health.usable(current_app, db.engines[REPLICA_BIND])
+
+def read_replica(fn):
+    """Decorator para vistas de solo lectura que pueden leer de la réplica"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        db = current_app.extensions['sqlalchemy']
+        if not _replica_available(db):
+            return fn(*args, **kwargs)
+
+        g.db_route = REPLICA_BIND
+        try:
+            return fn(*args, **kwargs)
+        except DBAPIError:
+            logger.warning('Replica query failed, retrying on primary', exc_info=True)
+            health.mark_failed(current_app.config['REPLICA_COOLDOWN_SECONDS'])
+            db.session.rollback()
+        finally:
+            g.pop('db_route', None)
+        return fn(*args, **kwargs)
+    return wrapper
+
+def _set_sticky_cookie(response):
+    if g.pop('db_wrote', False):
+        seconds = current_app.config['REPLICA_STICKY_SECONDS']
+        response.set_cookie(
+            STICKY_COOKIE, str(int(time.time() + seconds)),
+            max_age=seconds, httponly=True, samesite='Lax'
+        )
+    return response
+
+def init_app(app):
+    """Activa la cookie de lectura-tras-escritura si hay réplica configurada"""
+    if REPLICA_BIND in app.config.get('SQLALCHEMY_BINDS', {}):
+        app.after_request(_set_sticky_cookie)
@@ -0,0 +1,83 @@
+"""
+Reservas de canjes pendientes.
+
+users.reserved_credits y rewards.reserved se mantienen al solicitar, aprobar
+y rechazar canjes; deben coincidir con la suma de credits_spent y el número
+de canjes 'pending'. Una diferencia indica una escritura hecha por fuera de
+la API (SQL a mano, restauraciones parciales...).
+
+Dentro de una petición solo revisa la familia actual (filtro de tenancy).
+Por consola: python reconcile_reservations.py [--fix].
+"""
+from sqlalchemy import func, select, update
+from models import db, Reward, RewardRedemption, User
+
+def _pending_credits_by_user():
+    return dict(db.session.execute(
+        select(RewardRedemption.user_id, func.sum(RewardRedemption.credits_spent))
+        .where(RewardRedemption.status == 'pending')
+        .group_by(RewardRedemption.user_id)
+    ).all())
+
+def _pending_count_by_reward():
+    return dict(db.session.execute(
+        select(RewardRedemption.reward_id, func.count(RewardRedemption.id))
+        .where(RewardRedemption.status == 'pending')
+        .group_by(RewardRedemption.reward_id)
+    ).all())
+
+def find_reservation_drift():
+    """Filas cuya reserva no coincide con sus canjes pendientes (requiere app context)"""
+    pending_credits = _pending_credits_by_user()
+    pending_count = _pending_count_by_reward()
+
+    users = db.session.execute(
+        select(User.id, User.family_id, User.nick, User.reserved_credits)
+        .where((User.reserved_credits != 0) | User.id.in_(pending_credits.keys()))
+    ).all()
+    rewards = db.session.execute(
+        select(Reward.id, Reward.family_id, Reward.name, Reward.reserved)
+        .where((Reward.reserved != 0) | Reward.id.in_(pending_count.keys()))
+    ).all()
+
+    return {
+        'users': [
+            {'id': u.id, 'family_id': u.family_id, 'nick': u.nick,
+             'reserved_credits': u.reserved_credits, 'expected': int(pending_credits.get(u.id, 0))}
+            for u in users if u.reserved_credits != pending_credits.get(u.id, 0)
+        ],
+        'rewards': [
+            {'id': r.id, 'family_id': r.family_id, 'name': r.name,
+             'reserved': r.reserved, 'expected': pending_count.get(r.id, 0)}
+            for r in rewards if r.reserved != pending_count.get(r.id, 0)
+        ]
+    }
+
+def fix_reservation_drift(drift):
+    """
+    Recalcula las filas de `drift` (resultado de find_reservation_drift).
+    Cada UPDATE calcula el valor con una subconsulta, así un canje que llegue
+    mientras tanto no vuelve a descuadrar la fila.
+    """
+    user_ids = [u['id'] for u in drift['users']]
+    reward_ids = [r['id'] for r in drift['rewards']]
+
+    if user_ids:
+        db.session.execute(
+            update(User)
+            .where(User.id.in_(user_ids))
+            .values(reserved_credits=select(func.coalesce(func.sum(RewardRedemption.credits_spent), 0))
+                    .where(RewardRedemption.user_id == User.id, RewardRedemption.status == 'pending')
+                    .scalar_subquery())
+            .execution_options(synchronize_session=False)
+        )
+    if reward_ids:
+        db.session.execute(
+            update(Reward)
+            .where(Reward.id.in_(reward_ids))
+            .values(reserved=select(func.count(RewardRedemption.id))
+                    .where(RewardRedemption.reward_id == Reward.id, RewardRedemption.status == 'pending')
+                    .scalar_subquery())
+            .execution_options(synchronize_session=False)
+        )
+    db.session.commit()
@@ -6,6 +6,18 @@ def register_blueprints(app):
     from .rewards import rewards_bp
     from .calendar import calendar_bp
     from .icons import icons_bp
+    from .jobs import jobs_bp
+    from .events import events_bp
+    from .debug import debug_bp
+    from .metrics import metrics_bp
+    from .dashboard import dashboard_bp
+    from .batch import batch_bp
+    from .sync import sync_bp
+    from .outbox import outbox_bp
+    from .stats import stats_bp
+    from .exports import exports_bp
+    from .archive import archive_bp
+    from .scoring import scoring_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(users_bp, url_prefix='/api/users')
@@ -13,3 +25,15 @@ def register_blueprints(app):
     app.register_blueprint(rewards_bp, url_prefix='/api/rewards')
     app.register_blueprint(calendar_bp, url_prefix='/api/calendar')
     app.register_blueprint(icons_bp, url_prefix='/api/icons')
+    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+    app.register_blueprint(events_bp, url_prefix='/api/events')
+    app.register_blueprint(debug_bp, url_prefix='/api/debug')
+    app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+    app.register_blueprint(batch_bp, url_prefix='/api/batch')
+    app.register_blueprint(sync_bp, url_prefix='/api/sync')
+    app.register_blueprint(outbox_bp, url_prefix='/api/outbox')
+    app.register_blueprint(stats_bp, url_prefix='/api/stats')
+    app.register_blueprint(exports_bp, url_prefix='/api/exports')
+    app.register_blueprint(archive_bp, url_prefix='/api/archive')
+    app.register_blueprint(scoring_bp, url_prefix='/api/scoring')
+    app.register_blueprint(metrics_bp)
@@ -0,0 +1,70 @@
+from functools import wraps
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models import db, User, TaskAssignment, ArchivedAssignment, ArchivedCompletion
+from datetime import datetime
+from sqlalchemy import func, select
+from archive import archive_assignments, horizon, months_ago
+from jobs import enqueue, job_handler
+from replica import read_replica
+
+archive_bp = Blueprint('archive', __name__)
+
+def admin_required(fn):
+    """Decorator para verificar que el usuario es admin"""
+    @wraps(fn)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        user_id = int(get_jwt_identity())
+        user = User.query.get(user_id)
+        if not user or user.role != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+@archive_bp.route('', methods=['GET'])
+@read_replica
+@admin_required
+def get_archive_status():
+    """
+    Estado del archivo de la familia (solo admin): filas archivadas, fecha
+    de la asignación archivada más reciente y filas vivas
+    """
+    newest = horizon(TaskAssignment, 'assigned_date')
+    return jsonify({
+        'archived_assignments': db.session.execute(select(func.count(ArchivedAssignment.id))).scalar(),
+        'archived_completions': db.session.execute(select(func.count(ArchivedCompletion.id))).scalar(),
+        'live_assignments': db.session.execute(select(func.count(TaskAssignment.id))).scalar(),
+        'archived_until': newest.isoformat() if newest else None,
+        'archive_after_months': current_app.config['ARCHIVE_AFTER_MONTHS']
+    }), 200
+
+@archive_bp.route('', methods=['POST'])
+@admin_required
+def archive_family():
+    """
+    Archivar las asignaciones cerradas antiguas de la familia (trabajo en segundo plano)
+    Body (opcional): { "months": 12 }  // por defecto ARCHIVE_AFTER_MONTHS
+
+    Se archivan las validadas o canceladas de antes del primer día del mes
+    de hace `months` meses. Siguen visibles en el calendario, el historial
+    y las estadísticas.
+    """
+    admin_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    months = data.get('months', current_app.config['ARCHIVE_AFTER_MONTHS'])
+    if not isinstance(months, int) or months < 1:
+        return jsonify({'error': 'months must be a positive integer'}), 400
+
+    job = enqueue('archive_assignments', {'months': months}, admin_id)
+    return jsonify({
+        'message': 'Archive queued',
+        'job': job.to_dict()
+    }), 202
+
+@job_handler('archive_assignments')
+def archive_assignments_job(payload, job):
+    """Archiva las asignaciones cerradas de la familia del trabajo"""
+    before = months_ago(datetime.now().date(), payload['months'])
+    moved = archive_assignments(before, current_app.config['ARCHIVE_BATCH_SIZE'])
+    return dict(moved, before=before.isoformat()), 200
@@ -1,14 +1,19 @@
+import logging
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from models import db, User
+from models import db, current_family_id, Family, User
+from tenancy import access_token_claims, family_for_login, set_family
 
 auth_bp = Blueprint('auth', __name__)
+logger = logging.getLogger(__name__)
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
     """
-    Login solo con código de iconos
-    Body: { "icon_codes": [1, 5, 12, 8] }
+    Login con el código de la familia y el código de iconos
+    Body: { "family_code": "K7P2QX9M", "icon_codes": [1, 5, 12, 8] }
+    family_code solo se puede omitir si la instalación tiene una única familia.
+    El código de iconos es único dentro de la familia.
     """
     data = request.get_json()
     
@@ -20,21 +25,40 @@ def login():
     if len(icon_codes) != 4:
         return jsonify({'error': 'Icon codes must contain exactly 4 icons'}), 400
     
-    # Buscar usuario por código de iconos
+    family_code = data.get('family_code')
+    family = family_for_login(family_code)
+    if family is None:
+        if not family_code:
+            return jsonify({'error': 'family_code is required'}), 400
+        return jsonify({'error': 'Invalid credentials'}), 401
+    
+    # Buscar usuario por código de iconos dentro de la familia (y de su shard)
+    set_family(family.id)
     icon_string = ','.join(map(str, icon_codes))
     user = User.query.filter_by(access_code=icon_string, is_active=True).first()
     
     if not user:
         return jsonify({'error': 'Invalid credentials'}), 401
     
-    # Crear token JWT (identity debe ser string)
-    access_token = create_access_token(identity=str(user.id))
+    # Crear token JWT (identity debe ser string); la familia va como claim
+    access_token = create_access_token(identity=str(user.id), additional_claims=access_token_claims(user))
     
     return jsonify({
         'access_token': access_token,
-        'user': user.to_dict()
+        'user': user.to_dict(),
+        'family': {'id': family.id, 'name': family.name, 'login_code': family.login_code}
     }), 200
 
+@auth_bp.route('/family', methods=['GET'])
+@jwt_required()
+def get_current_family():
+    """Familia del usuario actual (con el código de familia para el login)"""
+    family = Family.query.get(current_family_id())
+    if not family:
+        return jsonify({'error': 'Family not found'}), 404
+    
+    return jsonify({'id': family.id, 'name': family.name, 'login_code': family.login_code}), 200
+
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_current_user():
@@ -82,29 +106,21 @@ def change_pin():
     old_codes = data['old_icon_codes']
     new_codes = data['new_icon_codes']
     
-    # Debug logs
-    print(f"DEBUG - User: {user.nick}")
-    print(f"DEBUG - Current access_code: {user.access_code}")
-    print(f"DEBUG - Old codes received: {old_codes}")
-    print(f"DEBUG - Old codes type: {type(old_codes)}")
-    print(f"DEBUG - New codes received: {new_codes}")
+    logger.debug('PIN change requested', extra={'user_id': user.id})
     
     if len(old_codes) != 4 or len(new_codes) != 4:
         return jsonify({'error': 'Icon codes must contain exactly 4 icons'}), 400
     
     # Verificar PIN actual
     if not user.verify_access_code(old_codes):
-        print(f"DEBUG - PIN verification failed!")
-        print(f"DEBUG - Expected: {user.access_code}")
-        provided_code = ','.join(map(str, old_codes))
-        print(f"DEBUG - Provided: {provided_code}")
+        logger.warning('PIN change rejected: current PIN is incorrect', extra={'user_id': user.id})
         return jsonify({'error': 'Current PIN is incorrect'}), 401
     
     # Establecer nuevo PIN
     user.set_access_code(new_codes)
     db.session.commit()
     
-    print(f"DEBUG - PIN changed successfully to: {user.access_code}")
+    logger.info('PIN changed', extra={'user_id': user.id})
     
     return jsonify({
         'message': 'PIN changed successfully',
@@ -0,0 +1,112 @@
+import logging
+import time
+from flask import Blueprint, request, jsonify, current_app, g
+from flask_jwt_extended import jwt_required
+from werkzeug.test import EnvironBuilder
+from models import db
+
+batch_bp = Blueprint('batch', __name__)
+
+logger = logging.getLogger(__name__)
+
+BATCH_METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+
+# Rutas que no tienen sentido dentro de un lote (streams o el propio lote)
+BATCH_EXCLUDED_PREFIXES = ('/api/batch', '/api/events')
+
+def _validate(sub_requests, max_requests):
+    """Mensaje de error si el lote no es válido, None si lo es"""
+    if not isinstance(sub_requests, list) or not sub_requests:
+        return 'Body must be a non-empty list of requests'
+    if len(sub_requests) > max_requests:
+        return f'At most {max_requests} requests per batch'
+    for index, sub in enumerate(sub_requests):
+        if not isinstance(sub, dict) or not isinstance(sub.get('path'), str):
+            return f'Request {index} needs a path'
+        if sub.get('method', 'GET').upper() not in BATCH_METHODS:
+            return f'Request {index} has an unsupported method'
+        path = sub['path']
+        if not path.startswith('/api/') or path.startswith(BATCH_EXCLUDED_PREFIXES):
+            return f'Request {index} path is not allowed in a batch'
+    return None
+
+def _dispatch(sub):
+    """
+    Ejecuta una sub-petición con la maquinaria normal de Flask (hooks,
+    decoradores, manejadores de error) dentro del app context del lote, con
+    la misma sesión de base de datos. Cada ruta hace commit de su trabajo, así
+    que al terminar se descarta lo que quede pendiente: una ruta que cambia un
+    objeto y luego responde 4xx no debe colarse en el commit de la siguiente.
+    """
+    app = current_app._get_current_object()
+    headers = {'X-Request-ID': g.get('request_id', '')}
+    for name in ('Authorization', 'Cookie'):
+        if name in request.headers:
+            headers[name] = request.headers[name]
+
+    builder = EnvironBuilder(
+        path=sub['path'],
+        method=sub.get('method', 'GET').upper(),
+        json=sub.get('body'),
+        headers=headers,
+        environ_base={'REMOTE_ADDR': request.remote_addr}
+    )
+
+    # Los hooks de cada sub-petición escriben en g (familia, métricas,
+    # contadores SQL); se restaura para que el lote se mida como una petición
+    saved = dict(vars(g))
+    try:
+        with app.request_context(builder.get_environ()):
+            try:
+                response = app.full_dispatch_request()
+            except Exception:
+                logger.exception('Batch sub-request failed', extra={'path': sub['path']})
+                return 500, {'error': 'Internal server error'}
+            finally:
+                db.session.rollback()
+    finally:
+        wrote = g.get('db_wrote')
+        vars(g).clear()
+        vars(g).update(saved)
+        if wrote:
+            g.db_wrote = True
+
+    body = response.get_json(silent=True)
+    if body is None and response.status_code != 304:
+        body = response.get_data(as_text=True) or None
+    return response.status_code, body
+
+@batch_bp.route('', methods=['POST'])
+@jwt_required()
+def run_batch():
+    """
+    Ejecutar varias peticiones de la API en una sola (mismo usuario)
+    Body: [
+        {"id": "tasks", "method": "GET", "path": "/api/tasks"},
+        {"id": "users", "path": "/api/users/options?role=user"},
+        {"method": "POST", "path": "/api/users/2/bonus", "body": {...}}
+    ]
+    Respuesta: [{"id": ..., "status": 200, "body": {...}}, ...] en el mismo orden.
+
+    Las sub-peticiones se ejecutan en orden; cada una hace su propio commit
+    y lo que deje sin confirmar (p.ej. al responder 4xx) se descarta.
+    Como mucho BATCH_MAX_REQUESTS por lote. BATCH_MAX_SECONDS se comprueba
+    entre sub-peticiones: las que falten al superarlo responden 504, pero una
+    sub-petición ya empezada no se interrumpe (el lote puede durar el límite
+    más lo que tarde la más lenta).
+    """
+    sub_requests = request.get_json(silent=True)
+    error = _validate(sub_requests, current_app.config['BATCH_MAX_REQUESTS'])
+    if error:
+        return jsonify({'error': error}), 400
+
+    deadline = time.monotonic() + current_app.config['BATCH_MAX_SECONDS']
+    results = []
+    for index, sub in enumerate(sub_requests):
+        if time.monotonic() > deadline:
+            status, body = 504, {'error': 'Batch time limit exceeded'}
+        else:
+            status, body = _dispatch(sub)
+        results.append({'id': sub.get('id', index), 'status': status, 'body': body})
+
+    return jsonify(results), 200
@@ -1,12 +1,16 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, User, TaskAssignment, TaskCompletion
+from models import db, User, TaskAssignment, TaskCompletion, TaskStreak
 from datetime import datetime, timedelta
 from sqlalchemy import and_, or_
+from replica import read_replica
+from archive import with_archive
+from streaks import current_on, with_current
 
 calendar_bp = Blueprint('calendar', __name__)
 
 @calendar_bp.route('/user/<int:user_id>', methods=['GET'])
+@read_replica
 @jwt_required()
 def get_user_calendar(user_id):
     """
@@ -45,14 +49,17 @@ def get_user_calendar(user_id):
         start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
         end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
     
-    # Obtener asignaciones en el rango de fechas
-    assignments = TaskAssignment.query.filter(
-        and_(
-            TaskAssignment.user_id == user_id,
-            TaskAssignment.assigned_date >= start_date,
-            TaskAssignment.assigned_date <= end_date
-        )
-    ).order_by(TaskAssignment.assigned_date).all()
+    # Obtener asignaciones en el rango de fechas (con el archivo si el rango llega)
+    assignments = with_archive(
+        TaskAssignment,
+        lambda model: [
+            model.user_id == user_id,
+            model.assigned_date >= start_date,
+            model.assigned_date <= end_date
+        ],
+        'assigned_date',
+        since=start_date
+    )
     
     # Agrupar por fecha
     calendar_data = {}
@@ -62,12 +69,18 @@ def get_user_calendar(user_id):
             calendar_data[date_str] = []
         calendar_data[date_str].append(assignment.to_dict())
     
+    # Rachas por tarea, ya calculadas en task_streaks (la actual, a fecha de hoy)
+    streaks = with_current(db.session.query(
+        TaskStreak, current_on(datetime.now().date())
+    ).filter(TaskStreak.user_id == user_id).all())
+    
     return jsonify({
         'user_id': user_id,
         'start_date': start_date.isoformat(),
         'end_date': end_date.isoformat(),
         'view': view,
-        'calendar': calendar_data
+        'calendar': calendar_data,
+        'streaks': {s['task_id']: s for s in streaks}
     }), 200
 
 @calendar_bp.route('/user/<int:user_id>/day/<string:date>', methods=['GET'])
@@ -92,12 +105,12 @@ def get_user_day(user_id, date):
     target_date = datetime.strptime(date, '%Y-%m-%d').date()
     
     # Obtener asignaciones del día
-    assignments = TaskAssignment.query.filter(
-        and_(
-            TaskAssignment.user_id == user_id,
-            TaskAssignment.assigned_date == target_date
-        )
-    ).all()
+    assignments = with_archive(
+        TaskAssignment,
+        lambda model: [model.user_id == user_id, model.assigned_date == target_date],
+        'assigned_date',
+        since=target_date
+    )
     
     return jsonify({
         'user_id': user_id,
@@ -156,12 +169,13 @@ def get_user_cancelled_tasks(user_id):
     limit = request.args.get('limit', 30, type=int)
     
     # Tareas canceladas
-    cancelled_assignments = TaskAssignment.query.filter(
-        and_(
-            TaskAssignment.user_id == user_id,
-            TaskAssignment.is_cancelled.is_(True)
-        )
-    ).order_by(TaskAssignment.cancelled_at.desc()).limit(limit).all()
+    cancelled_assignments = with_archive(
+        TaskAssignment,
+        lambda model: [model.user_id == user_id, model.is_cancelled.is_(True)],
+        'cancelled_at',
+        descending=True,
+        limit=limit
+    )
     
     return jsonify({
         'user_id': user_id,
@@ -187,12 +201,13 @@ def get_user_completed_tasks(user_id):
     # Límite de resultados (últimas 100 por defecto)
     limit = request.args.get('limit', 100, type=int)
     
-    completed_assignments = TaskAssignment.query.filter(
-        and_(
-            TaskAssignment.user_id == user_id,
-            TaskAssignment.is_completed.is_(True)
-        )
-    ).order_by(TaskAssignment.assigned_date.desc()).limit(limit).all()
+    completed_assignments = with_archive(
+        TaskAssignment,
+        lambda model: [model.user_id == user_id, model.is_completed.is_(True)],
+        'assigned_date',
+        descending=True,
+        limit=limit
+    )
     
     return jsonify({
         'user_id': user_id,
@@ -218,9 +233,13 @@ def get_all_users_tasks(date):
         return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
     
     # Obtener todas las asignaciones para ese día
-    assignments = TaskAssignment.query.filter(
-        TaskAssignment.assigned_date == target_date
-    ).order_by(TaskAssignment.user_id).all()
+    assignments = with_archive(
+        TaskAssignment,
+        lambda model: [model.assigned_date == target_date],
+        'assigned_date',
+        since=target_date
+    )
+    assignments.sort(key=lambda a: a.user_id)
     
     return jsonify([a.to_dict() for a in assignments]), 200
 
@@ -258,9 +277,8 @@ def get_today_stats():
                 total_credits += completion.credits_awarded or 0
         elif assignment.is_cancelled:
             cancelled_count += 1
-            # Si es obligatoria y fue cancelada, restar penalización
-            if assignment.task.task_type == 'obligatory':
-                total_credits -= assignment.task.base_value or 0
+            # Restar la penalización que se aplicó al cancelar
+            total_credits -= assignment.penalty_applied or 0
         else:
             pending_count += 1
     
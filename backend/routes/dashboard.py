@@ -0,0 +1,165 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models import (
+    db, User, TaskAssignment, TaskCompletion, TaskProposal, ProposalStatus,
+    Reward, RewardRedemption, TaskStreak
+)
+from datetime import datetime
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import joinedload
+from replica import read_replica
+from streaks import current_on, with_current
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+# Cada sección es una sola consulta (el usuario ya viene de la autenticación)
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+def _admin_stats(user, today):
+    """Estadísticas de hoy de todos los usuarios (como /api/calendar/today-stats)"""
+    row = db.session.execute(
+        select(
+            _count_if(and_(TaskAssignment.is_completed.is_(False), TaskAssignment.is_cancelled.is_(False))).label('pending'),
+            _count_if(TaskAssignment.is_completed.is_(True)).label('completed'),
+            _count_if(and_(TaskAssignment.is_completed.is_(False), TaskAssignment.is_cancelled.is_(True))).label('cancelled'),
+            func.coalesce(func.sum(case(
+                (TaskAssignment.is_completed.is_(True), func.coalesce(TaskCompletion.credits_awarded, 0)),
+                (TaskAssignment.is_cancelled.is_(True), -TaskAssignment.penalty_applied),
+                else_=0
+            )), 0).label('credits')
+        )
+        .select_from(TaskAssignment)
+        .outerjoin(TaskCompletion, TaskCompletion.assignment_id == TaskAssignment.id)
+        .where(TaskAssignment.assigned_date == today)
+    ).one()
+
+    return {
+        'date': today.isoformat(),
+        'total_credits': int(row.credits),
+        'pending_tasks': int(row.pending),
+        'completed_tasks': int(row.completed),
+        'cancelled_tasks': int(row.cancelled)
+    }
+
+def _admin_pending(user, today):
+    """Colas que esperan al admin: validaciones, canjes y propuestas"""
+    row = db.session.execute(select(
+        select(func.count(TaskCompletion.id))
+        .where(TaskCompletion.validation_score.is_(None)).scalar_subquery().label('validations'),
+        select(func.count(RewardRedemption.id))
+        .where(RewardRedemption.status == 'pending').scalar_subquery().label('redemptions'),
+        select(func.count(TaskProposal.id))
+        .where(TaskProposal.status == ProposalStatus.PENDING).scalar_subquery().label('proposals')
+    )).one()
+
+    return {
+        'validations': row.validations,
+        'redemptions': row.redemptions,
+        'proposals': row.proposals
+    }
+
+def _user_stats(user, today):
+    """Créditos y contadores de tareas del usuario"""
+    row = db.session.execute(
+        select(
+            _count_if(and_(
+                TaskAssignment.is_completed.is_(False),
+                TaskAssignment.is_cancelled.is_(False),
+                TaskAssignment.assigned_date <= today
+            )).label('pending'),
+            _count_if(TaskAssignment.is_completed.is_(True)).label('completed'),
+            _count_if(TaskAssignment.is_cancelled.is_(True)).label('cancelled')
+        )
+        .where(TaskAssignment.user_id == user.id)
+    ).one()
+
+    return {
+        'credits': user.score,
+        'available_credits': user.get_available_credits(),
+        'pending_tasks': int(row.pending),
+        'completed_tasks': int(row.completed),
+        'cancelled_tasks': int(row.cancelled)
+    }
+
+def _user_pending_tasks(user, today):
+    """Tareas pendientes hasta hoy (como /api/calendar/user/<id>/pending)"""
+    assignments = TaskAssignment.query.options(
+        joinedload(TaskAssignment.task), joinedload(TaskAssignment.user), joinedload(TaskAssignment.completion)
+    ).filter(
+        TaskAssignment.user_id == user.id,
+        TaskAssignment.is_completed.is_(False),
+        TaskAssignment.is_cancelled.is_(False),
+        TaskAssignment.assigned_date <= today
+    ).order_by(TaskAssignment.assigned_date).all()
+
+    return [a.to_dict() for a in assignments]
+
+def _admin_streaks(user, today):
+    """Rachas actuales más largas de la familia"""
+    current = current_on(today)
+    return with_current(db.session.query(TaskStreak, current).filter(
+        TaskStreak.current > 0, current > 0
+    ).order_by(current.desc(), TaskStreak.id).limit(10).all())
+
+def _user_streaks(user, today):
+    """Rachas del usuario por tarea (task_streaks, sin recorrer el historial)"""
+    current = current_on(today)
+    return with_current(db.session.query(TaskStreak, current).filter(
+        TaskStreak.user_id == user.id
+    ).order_by(current.desc()).all())
+
+def _user_rewards(user, today):
+    """Premios activos del catálogo"""
+    return [r.to_dict() for r in Reward.query.filter_by(is_active=True).all()]
+
+SECTIONS = {
+    'admin': {
+        'stats': _admin_stats,
+        'pending': _admin_pending,
+        'streaks': _admin_streaks,
+    },
+    'user': {
+        'stats': _user_stats,
+        'pending_tasks': _user_pending_tasks,
+        'rewards': _user_rewards,
+        'streaks': _user_streaks,
+    },
+}
+
+@dashboard_bp.route('', methods=['GET'])
+@read_replica
+@jwt_required()
+def get_dashboard():
+    """
+    Datos iniciales del dashboard en una sola petición
+    Query params:
+        - sections: lista separada por comas (por defecto todas las del rol)
+            admin: user, stats, pending, streaks
+            user:  user, stats, pending_tasks, rewards, streaks
+
+    Cada sección cuesta una consulta como máximo, así la primera carga es
+    un solo viaje de ida y vuelta con un número fijo de consultas.
+    """
+    user_id = int(get_jwt_identity())
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    available = SECTIONS['admin' if user.role == 'admin' else 'user']
+    requested = request.args.get('sections')
+    if requested:
+        sections = [s.strip() for s in requested.split(',') if s.strip()]
+        unknown = [s for s in sections if s != 'user' and s not in available]
+        if unknown:
+            return jsonify({'error': f'Unknown sections: {", ".join(unknown)}'}), 400
+    else:
+        sections = ['user', *available]
+
+    today = datetime.now().date()
+    response = {'role': user.role, 'date': today.isoformat()}
+    for section in sections:
+        response[section] = user.to_dict() if section == 'user' else available[section](user, today)
+
+    return jsonify(response), 200
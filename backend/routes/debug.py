@@ -0,0 +1,150 @@
+import hmac
+from functools import wraps
+from flask import Blueprint, request, jsonify, current_app, send_file
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models import User
+from instrumentation import query_stats
+from profiling import list_profiles, profile_path
+from reservations import find_reservation_drift, fix_reservation_drift
+
+debug_bp = Blueprint('debug', __name__)
+
+def admin_required(fn):
+    """Decorator para verificar que el usuario es administrador"""
+    @wraps(fn)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        user_id = int(get_jwt_identity())
+        user = User.query.get(user_id)
+        
+        if not user or user.role != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+        
+        return fn(*args, **kwargs)
+    return wrapper
+
+def operator_required(fn):
+    """
+    Decorator para los endpoints que ven o cambian el estado de todo el
+    proceso (sentencias, profiler, perfiles con peticiones de cualquier
+    familia): exigen DEBUG_TOKEN como Bearer, no basta con ser admin de una
+    familia. Sin DEBUG_TOKEN definido quedan desactivados.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = current_app.config.get('DEBUG_TOKEN')
+        if not token:
+            return jsonify({'error': 'Debug endpoints are disabled (DEBUG_TOKEN is not set)'}), 403
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return jsonify({'error': 'Invalid debug token'}), 401
+        return fn(*args, **kwargs)
+    return wrapper
+
+@debug_bp.route('/queries', methods=['GET'])
+@operator_required
+def get_query_stats():
+    """
+    Ranking de sentencias SQL normalizadas de este proceso (solo operador)
+    Query params:
+        - limit: número de sentencias (default 20)
+        - order_by: total_ms|count|max_ms (default total_ms)
+    """
+    limit = request.args.get('limit', 20, type=int)
+    order_by = request.args.get('order_by', 'total_ms')
+    if order_by not in ('total_ms', 'count', 'max_ms'):
+        return jsonify({'error': 'order_by must be total_ms, count or max_ms'}), 400
+    
+    return jsonify({
+        'enabled': bool(current_app.config.get('SQL_INSTRUMENTATION')),
+        'thresholds': {
+            'query_count': current_app.config['SLOW_REQUEST_QUERY_COUNT'],
+            'db_ms': current_app.config['SLOW_REQUEST_DB_MS']
+        },
+        'statements': query_stats.top(limit, order_by)
+    }), 200
+
+@debug_bp.route('/queries', methods=['DELETE'])
+@operator_required
+def reset_query_stats():
+    """Reiniciar el ranking de sentencias (solo operador)"""
+    query_stats.reset()
+    return jsonify({'message': 'Query stats reset'}), 200
+
+@debug_bp.route('/profiling', methods=['GET'])
+@operator_required
+def get_profiling_settings():
+    """Ajustes actuales del profiler por muestreo (solo operador)"""
+    return jsonify(current_app.extensions['profiling'].current()), 200
+
+@debug_bp.route('/profiling', methods=['PUT'])
+@operator_required
+def update_profiling_settings():
+    """
+    Activar/desactivar el profiler o cambiar la muestra (solo operador)
+    Body (todos opcionales):
+    {
+        "enabled": true,
+        "sample_rate": 0.05,             // fracción de peticiones (0-1)
+        "routes": ["/api/calendar/user"],// prefijos de ruta que se perfilan siempre
+        "header": "X-Profile",           // cabecera que fuerza el profiling
+        "interval_ms": 5,
+        "max_files": 200
+    }
+    Enviar {"reset": true} vuelve a los valores de la configuración.
+    """
+    data = request.get_json() or {}
+    settings = current_app.extensions['profiling']
+    
+    if data.get('reset'):
+        return jsonify(settings.reset()), 200
+    
+    if 'enabled' in data and not isinstance(data['enabled'], bool):
+        return jsonify({'error': 'enabled must be a boolean'}), 400
+    if 'sample_rate' in data:
+        if not isinstance(data['sample_rate'], (int, float)) or not 0 <= data['sample_rate'] <= 1:
+            return jsonify({'error': 'sample_rate must be between 0 and 1'}), 400
+    if 'routes' in data:
+        if not isinstance(data['routes'], list) or not all(isinstance(r, str) and r for r in data['routes']):
+            return jsonify({'error': 'routes must be a list of path prefixes'}), 400
+    if 'header' in data and not isinstance(data['header'], (str, type(None))):
+        return jsonify({'error': 'header must be a string or null'}), 400
+    for field, minimum in (('interval_ms', 1), ('max_files', 1)):
+        if field in data and (not isinstance(data[field], int) or data[field] < minimum):
+            return jsonify({'error': f'{field} must be a positive integer'}), 400
+    
+    return jsonify(settings.update(data)), 200
+
+@debug_bp.route('/profiles', methods=['GET'])
+@operator_required
+def get_profiles():
+    """
+    Perfiles guardados, del más reciente al más antiguo (solo operador)
+    Query params:
+        - limit: número de perfiles (default 50)
+    """
+    limit = request.args.get('limit', 50, type=int)
+    profiles = list_profiles(current_app.extensions['profiling'].directory)
+    return jsonify({'total': len(profiles), 'profiles': profiles[:limit]}), 200
+
+@debug_bp.route('/profiles/<name>', methods=['GET'])
+@operator_required
+def get_profile(name):
+    """Descargar un perfil en formato de pilas colapsadas (flamegraph.pl, speedscope)"""
+    path = profile_path(current_app.extensions['profiling'].directory, name)
+    if not path:
+        return jsonify({'error': 'Profile not found'}), 404
+    return send_file(path, mimetype='text/plain', as_attachment=True, download_name=name)
+
+@debug_bp.route('/reservations', methods=['GET'])
+@admin_required
+def get_reservation_drift():
+    """Usuarios y premios de la familia cuya reserva no cuadra con sus canjes pendientes (solo admin)"""
+    return jsonify(find_reservation_drift()), 200
+
+@debug_bp.route('/reservations/reconcile', methods=['POST'])
+@admin_required
+def reconcile_reservations():
+    """Recalcular las reservas descuadradas de la familia (solo admin)"""
+    drift = find_reservation_drift()
+    fix_reservation_drift(drift)
+    return jsonify({'fixed': drift}), 200
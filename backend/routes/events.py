@@ -0,0 +1,81 @@
+import sys
+import time
+from flask import Blueprint, Response, current_app, json, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models import db, User
+from events import broker, user_channel, admin_channel
+from tenancy import set_token_family
+
+events_bp = Blueprint('events', __name__)
+
+def _streaming_supported():
+    """
+    ¿Puede este servidor mantener streams abiertos? Con workers sync de
+    gunicorn cada stream ocuparía un proceso entero hasta el timeout.
+    Sí con gevent/eventlet (socket parcheado) o con un servidor con hilos.
+    """
+    setting = current_app.config.get('EVENTS_STREAMING', 'auto')
+    if setting != 'auto':
+        return setting in ('1', 'true')
+    if request.environ.get('wsgi.multithread'):
+        return True
+    gevent_monkey = sys.modules.get('gevent.monkey')
+    if gevent_monkey is not None and gevent_monkey.is_module_patched('socket'):
+        return True
+    eventlet_patcher = sys.modules.get('eventlet.patcher')
+    return eventlet_patcher is not None and eventlet_patcher.is_monkey_patched('socket')
+
+@events_bp.route('/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_events():
+    """
+    Canal Server-Sent Events con cambios del usuario actual.
+    EventSource no permite cabeceras, así que el token puede ir en ?token=<jwt>.
+    
+    Eventos (campo "event" de SSE):
+        - completion, validation, cancellation, reset, bonus,
+          redemption, redemption_approved, redemption_rejected, assignment
+    Cada evento trae solo el delta: ids afectados y el score nuevo del usuario.
+    Los administradores reciben además los eventos de todos los usuarios de su familia.
+    
+    503 si el servidor no admite streams (workers sync, ver EVENTS_STREAMING).
+    El stream se cierra a los EVENTS_STREAM_MAX_SECONDS; EventSource reconecta solo.
+    """
+    if not _streaming_supported():
+        return jsonify({'error': 'Event stream requires an async worker (GUNICORN_WORKER_CLASS=gevent)'}), 503
+    
+    # El token puede venir en ?token=, que el hook de tenancy no lee
+    set_token_family()
+    user_id = int(get_jwt_identity())
+    user = User.query.get(user_id)
+    if not user:
+        return Response(status=404)
+    
+    channels = [user_channel(user_id, user.family_id)]
+    if user.role == 'admin':
+        channels.append(admin_channel(user.family_id))
+    
+    # No retener la conexión a la base de datos mientras el stream está abierto
+    db.session.remove()
+    
+    heartbeat = current_app.config.get('EVENTS_HEARTBEAT_SECONDS', 15)
+    deadline = time.monotonic() + current_app.config.get('EVENTS_STREAM_MAX_SECONDS', 600)
+    subscription = broker.subscribe(channels)
+    
+    def generate():
+        try:
+            yield 'retry: 5000\n\n'
+            while time.monotonic() < deadline:
+                message = subscription.get(timeout=heartbeat)
+                if message is None:
+                    # Comentario SSE para mantener viva la conexión
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f"id: {message['id']}\nevent: {message['type']}\ndata: {json.dumps(message)}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
@@ -0,0 +1,84 @@
+from functools import wraps
+from flask import Blueprint, request, jsonify, current_app, send_file
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models import User, Job
+from exports import EXPORT_TABLES, artifact_path, available_formats, export_path, export_tables, prune_exports
+from jobs import enqueue, job_handler
+
+exports_bp = Blueprint('exports', __name__)
+
+def admin_required(fn):
+    """Decorator para verificar que el usuario es admin"""
+    @wraps(fn)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        user_id = int(get_jwt_identity())
+        user = User.query.get(user_id)
+        if not user or user.role != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+def _job_dir(job):
+    return export_path(current_app.config['EXPORT_DIR'], job.family_id, f'job-{job.id}')
+
+@exports_bp.route('', methods=['POST'])
+@admin_required
+def create_export():
+    """
+    Exportar todos los datos de la familia (trabajo en segundo plano)
+    Body (opcional): {
+        "format": "csv" | "parquet",   // default csv (parquet requiere pyarrow)
+        "tables": ["task_assignments", "task_completions", "reward_redemptions", "bonuses",
+                   "task_assignments_archive", "task_completions_archive"]
+    }
+    Responde 202 con el trabajo; al terminar, su resultado lista los ficheros
+    con la URL de descarga (GET /api/exports/<job_id>/<fichero>).
+    """
+    admin_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+
+    fmt = data.get('format', 'csv')
+    if fmt not in available_formats():
+        return jsonify({'error': f'format must be one of: {", ".join(available_formats())}'}), 400
+
+    tables = data.get('tables') or list(EXPORT_TABLES)
+    if not isinstance(tables, list) or not all(isinstance(t, str) for t in tables):
+        return jsonify({'error': 'tables must be a list of table names'}), 400
+    unknown = [t for t in tables if t not in EXPORT_TABLES]
+    if unknown:
+        return jsonify({'error': f'Unknown tables: {", ".join(unknown)}'}), 400
+
+    job = enqueue('family_export', {'format': fmt, 'tables': tables}, admin_id)
+    return jsonify({
+        'message': 'Export queued',
+        'job': job.to_dict()
+    }), 202
+
+@job_handler('family_export')
+def family_export_job(payload, job):
+    """Escribe los ficheros de la exportación en EXPORT_DIR"""
+    config = current_app.config
+    prune_exports(config['EXPORT_DIR'], job.family_id, config['EXPORT_RETENTION_DAYS'])
+
+    files = export_tables(_job_dir(job), payload['tables'], payload['format'], config['EXPORT_CHUNK_SIZE'])
+    for f in files:
+        f['url'] = f'/api/exports/{job.id}/{f["file"]}'
+    return {'format': payload['format'], 'files': files}, 200
+
+@exports_bp.route('/<int:job_id>/<filename>', methods=['GET'])
+@admin_required
+def download_export(job_id, filename):
+    """Descargar un fichero de una exportación terminada"""
+    job = Job.query.get(job_id)
+    if not job or job.job_type != 'family_export':
+        return jsonify({'error': 'Export not found'}), 404
+
+    if job.status != 'finished':
+        return jsonify({'error': 'Export not finished', 'job': job.to_dict()}), 409
+
+    path = artifact_path(current_app.config['EXPORT_DIR'], job.family_id, f'job-{job.id}', filename)
+    if not path:
+        return jsonify({'error': 'File not found (exports are kept EXPORT_RETENTION_DAYS)'}), 404
+
+    return send_file(path, as_attachment=True, download_name=f'credikids-{job.id}-{filename}')
@@ -0,0 +1,72 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models import db, User, Job
+
+jobs_bp = Blueprint('jobs', __name__)
+
+def _get_visible_job(job_id):
+    """Obtiene el trabajo si el usuario actual es su creador o es admin"""
+    user_id = int(get_jwt_identity())
+    user = User.query.get(user_id)
+    
+    job = Job.query.get(job_id)
+    if not job:
+        return None, (jsonify({'error': 'Job not found'}), 404)
+    
+    if user.role != 'admin' and job.created_by_id != user_id:
+        return None, (jsonify({'error': 'Access denied'}), 403)
+    
+    return job, None
+
+@jobs_bp.route('', methods=['GET'])
+@jwt_required()
+def get_jobs():
+    """
+    Obtener trabajos recientes (admin ve todos, usuarios solo los suyos)
+    Query params:
+        - status: queued|running|finished|failed (opcional)
+        - limit: número máximo de trabajos (default 50)
+    """
+    user_id = int(get_jwt_identity())
+    user = User.query.get(user_id)
+    status = request.args.get('status')
+    limit = request.args.get('limit', 50, type=int)
+    
+    query = Job.query
+    if user.role != 'admin':
+        query = query.filter_by(created_by_id=user_id)
+    if status:
+        query = query.filter_by(status=status)
+    
+    jobs = query.order_by(Job.id.desc()).limit(limit).all()
+    
+    return jsonify([job.to_dict() for job in jobs]), 200
+
+@jobs_bp.route('/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    """Obtener estado de un trabajo"""
+    job, error = _get_visible_job(job_id)
+    if error:
+        return error
+    
+    return jsonify(job.to_dict()), 200
+
+@jobs_bp.route('/<int:job_id>/result', methods=['GET'])
+@jwt_required()
+def get_job_result(job_id):
+    """
+    Obtener el resultado de un trabajo terminado.
+    Si aún no ha terminado, responde 202 con su estado actual.
+    """
+    job, error = _get_visible_job(job_id)
+    if error:
+        return error
+    
+    if job.status in ('queued', 'running'):
+        return jsonify(job.to_dict()), 202
+    
+    return jsonify({
+        'job': job.to_dict(),
+        'result': job.get_result()
+    }), 200
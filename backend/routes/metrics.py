@@ -0,0 +1,14 @@
+from flask import Blueprint, Response, request, current_app, jsonify
+from metrics import render_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Métricas en formato de texto de Prometheus"""
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return jsonify({'error': 'Invalid metrics token'}), 401
+    
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
@@ -0,0 +1,90 @@
+from functools import wraps
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models import User
+from datetime import datetime, timedelta
+from jobs import enqueue, job_handler
+from outbox import compact, compaction_watermark, read_events
+from replica import read_replica
+
+outbox_bp = Blueprint('outbox', __name__)
+
+def admin_required(fn):
+    """Decorator para verificar que el usuario es admin"""
+    @wraps(fn)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        user_id = int(get_jwt_identity())
+        user = User.query.get(user_id)
+        if not user or user.role != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+@outbox_bp.route('', methods=['GET'])
+@read_replica
+@jwt_required()
+def get_events():
+    """
+    Leer el outbox de cambios por número de secuencia
+    Query params:
+        - after: última secuencia procesada (default 0: desde el principio)
+        - limit: eventos por página (default y máximo OUTBOX_PAGE_SIZE)
+    Respuesta: {
+        "events": [{"seq": 41, "type": "validation", "user_id": 2, "entity_id": 7,
+                    "delta": 15, "created_at": "..."}],
+        "next": 41,         // volver a llamar con after=next
+        "has_more": false
+    }
+
+    El admin recibe los eventos de toda la familia; un usuario, los suyos.
+    Los eventos 'compacted' resumen los anteriores de cada usuario; si
+    `after` es anterior a la última compactación responde 410 y hay que
+    reconstruir desde after=0.
+    """
+    user_id = int(get_jwt_identity())
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    page_size = current_app.config['OUTBOX_PAGE_SIZE']
+    after = request.args.get('after', 0, type=int)
+    limit = min(max(request.args.get('limit', page_size, type=int), 1), page_size)
+
+    if after and after < compaction_watermark():
+        return jsonify({'error': 'Outbox position was compacted, read again from after=0'}), 410
+
+    events = read_events(after, limit, user_id=None if user.role == 'admin' else user.id)
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    return jsonify({
+        'events': [e.to_dict() for e in events],
+        'next': events[-1].id if events else after,
+        'has_more': has_more
+    }), 200
+
+@outbox_bp.route('/compact', methods=['POST'])
+@admin_required
+def compact_events():
+    """
+    Compactar los eventos antiguos de la familia (trabajo en segundo plano)
+    Body (opcional): { "days": 30 }  // por defecto OUTBOX_RETENTION_DAYS
+    """
+    admin_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    days = data.get('days', current_app.config['OUTBOX_RETENTION_DAYS'])
+    if not isinstance(days, int) or days < 1:
+        return jsonify({'error': 'days must be a positive integer'}), 400
+
+    job = enqueue('outbox_compact', {'days': days}, admin_id)
+    return jsonify({
+        'message': 'Outbox compaction queued',
+        'job': job.to_dict()
+    }), 202
+
+@job_handler('outbox_compact')
+def outbox_compact_job(payload, job):
+    """Compacta los eventos de la familia del trabajo más antiguos que payload['days']"""
+    before = datetime.utcnow() - timedelta(days=payload['days'])
+    return {'removed': compact(before), 'before': before.isoformat()}, 200
@@ -2,10 +2,120 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, User, Reward, RewardRedemption
 from datetime import datetime, timedelta
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.orm import joinedload
+from events import emit
+from outbox import record
+from replica import read_replica
 
 rewards_bp = Blueprint('rewards', __name__)
 
+BULK_DECISIONS_LIMIT = 500
+HISTORY_PAGE_LIMIT = 200
+
+# Las reservas se hacen con UPDATE condicionales: la comprobación y el cambio
+# son una sola sentencia, así dos canjes simultáneos de la última unidad no
+# pueden pasar ambos. Orden de bloqueo siempre premio -> usuario -> canje.
+
+def _reserve_stock(reward_id):
+    """Aparta una unidad del premio si está activo y queda stock libre"""
+    return db.session.execute(
+        update(Reward)
+        .where(
+            Reward.id == reward_id,
+            Reward.is_active.is_(True),
+            or_(Reward.stock.is_(None), Reward.stock - Reward.reserved > 0)
+        )
+        .values(reserved=Reward.reserved + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+
+def _reserve_credits(user_id, amount):
+    """Aparta créditos del usuario si los disponibles (score - reservados) alcanzan"""
+    return db.session.execute(
+        update(User)
+        .where(User.id == user_id, User.score - User.reserved_credits >= amount)
+        .values(reserved_credits=User.reserved_credits + amount)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+
+def _close_redemption(redemption_id, status, admin_id, **values):
+    """Pasa un canje de pending a approved/rejected; False si otro admin se adelantó"""
+    return db.session.execute(
+        update(RewardRedemption)
+        .where(RewardRedemption.id == redemption_id, RewardRedemption.status == 'pending')
+        .values(status=status, approved_by_id=admin_id, approved_at=datetime.utcnow(), **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+
+def _amount_by_id(amounts, column):
+    """CASE column WHEN id THEN cantidad ... ELSE 0: una cantidad distinta por fila en un solo UPDATE"""
+    return case(amounts, value=column, else_=0) if amounts else 0
+
+def _encode_history_cursor(redemption):
+    return f'{redemption.redeemed_at.isoformat()}_{redemption.id}'
+
+def _decode_history_cursor(cursor):
+    """'<redeemed_at ISO>_<id>' -> (datetime, id); ValueError si no es válido"""
+    redeemed_at, _, redemption_id = cursor.rpartition('_')
+    return datetime.fromisoformat(redeemed_at), int(redemption_id)
+
+def _redemption_totals(conditions):
+    """
+    Totales de créditos y canjes por usuario, por premio y por estado con un
+    solo GROUP BY (usuario, premio, estado); las agregaciones se suman aquí
+    """
+    rows = db.session.execute(
+        select(
+            RewardRedemption.user_id, User.nick, User.figure,
+            RewardRedemption.reward_id, Reward.name, Reward.icon,
+            RewardRedemption.status,
+            func.count(RewardRedemption.id).label('count'),
+            func.sum(RewardRedemption.credits_spent).label('credits')
+        )
+        .join(User, User.id == RewardRedemption.user_id)
+        .join(Reward, Reward.id == RewardRedemption.reward_id)
+        .where(*conditions)
+        .group_by(
+            RewardRedemption.user_id, User.nick, User.figure,
+            RewardRedemption.reward_id, Reward.name, Reward.icon,
+            RewardRedemption.status
+        )
+    ).all()
+    
+    def bucket(**fields):
+        return {**fields, 'count': 0, 'credits': 0, 'by_status': {}}
+    
+    def add(target, row):
+        target['count'] += row.count
+        target['credits'] += int(row.credits or 0)
+        status = target['by_status'].setdefault(row.status, {'count': 0, 'credits': 0})
+        status['count'] += row.count
+        status['credits'] += int(row.credits or 0)
+    
+    overall = bucket()
+    by_user = {}
+    by_reward = {}
+    for row in rows:
+        add(overall, row)
+        if row.user_id not in by_user:
+            by_user[row.user_id] = bucket(user_id=row.user_id, nick=row.nick, figure=row.figure)
+        add(by_user[row.user_id], row)
+        if row.reward_id not in by_reward:
+            by_reward[row.reward_id] = bucket(reward_id=row.reward_id, name=row.name, icon=row.icon)
+        add(by_reward[row.reward_id], row)
+    
+    def by_credits(item):
+        return -item['credits'], -item['count']
+    
+    return {
+        'count': overall['count'],
+        'credits': overall['credits'],
+        'by_status': overall['by_status'],
+        'by_user': sorted(by_user.values(), key=by_credits),
+        'by_reward': sorted(by_reward.values(), key=by_credits)
+    }
+
 def admin_required(fn):
     """Decorator para verificar que el usuario es administrador"""
     from functools import wraps
@@ -76,6 +186,8 @@ def create_reward():
     )
     
     db.session.add(reward)
+    db.session.flush()
+    record('reward_created', admin_id, reward.id)
     db.session.commit()
     
     return jsonify(reward.to_dict()), 201
@@ -103,6 +215,7 @@ def update_reward(reward_id):
     if 'stock' in data:
         reward.stock = data['stock']
     
+    record('reward_updated', int(get_jwt_identity()), reward.id)
     db.session.commit()
     
     return jsonify(reward.to_dict()), 200
@@ -116,6 +229,7 @@ def delete_reward(reward_id):
         return jsonify({'error': 'Reward not found'}), 404
     
     reward.is_active = False
+    record('reward_deleted', int(get_jwt_identity()), reward.id)
     db.session.commit()
     
     return jsonify({'message': 'Reward deactivated successfully'}), 200
@@ -137,26 +251,20 @@ def redeem_reward(reward_id):
     if not reward.is_active:
         return jsonify({'error': 'Reward is not available'}), 400
     
-    # Verificar stock disponible (considerando solicitudes pendientes)
-    available_stock = reward.get_available_stock()
-    if available_stock is not None and available_stock <= 0:
+    # Reservar una unidad (considerando solicitudes pendientes)
+    if not _reserve_stock(reward_id):
+        db.session.rollback()
         return jsonify({'error': 'Reward out of stock'}), 400
     
-    # Calcular créditos disponibles (restando solicitudes pendientes)
-    pending_redemptions = RewardRedemption.query.filter_by(
-        user_id=user_id,
-        status='pending'
-    ).all()
-    pending_credits = sum(r.credits_spent for r in pending_redemptions)
-    available_credits = user.score - pending_credits
-    
-    # Verificar créditos disponibles
-    if available_credits < reward.credit_cost:
+    # Reservar los créditos (restando solicitudes pendientes)
+    if not _reserve_credits(user_id, reward.credit_cost):
+        db.session.rollback()
+        db.session.refresh(user)
         return jsonify({
             'error': 'Insufficient available credits',
             'total_credits': user.score,
-            'pending_credits': pending_credits,
-            'available_credits': available_credits,
+            'pending_credits': user.reserved_credits,
+            'available_credits': user.get_available_credits(),
             'required': reward.credit_cost
         }), 400
     
@@ -171,12 +279,27 @@ def redeem_reward(reward_id):
     )
     
     db.session.add(redemption)
+    db.session.flush()
+    db.session.refresh(user)
+    
+    # Solo reserva: el saldo no cambia hasta la aprobación
+    record('redemption', user_id, redemption.id)
+    emit('redemption', {
+        'redemption_id': redemption.id,
+        'reward_id': reward_id,
+        'credits_spent': redemption.credits_spent,
+        'user_score': user.score,
+        'user_reserved_credits': user.reserved_credits
+    }, user_id=user_id)
+    
     db.session.commit()
     
     return jsonify({
         'message': 'Redemption request created successfully',
         'redemption': redemption.to_dict(),
-        'user_score': user.score
+        'user_score': user.score,
+        'user_reserved_credits': user.reserved_credits,
+        'available_credits': user.get_available_credits()
     }), 201
 
 @rewards_bp.route('/redemptions/pending', methods=['GET'])
@@ -199,21 +322,44 @@ def approve_redemption(redemption_id):
     if redemption.status != 'pending':
         return jsonify({'error': 'Redemption already processed'}), 400
     
-    # Verificar que el usuario aún tenga créditos suficientes
-    user = User.query.get(redemption.user_id)
-    if user.score < redemption.credits_spent:
+    # Aprobar: la unidad reservada sale del stock (NULL - 1 sigue siendo NULL)
+    db.session.execute(
+        update(Reward)
+        .where(Reward.id == redemption.reward_id)
+        .values(stock=Reward.stock - 1, reserved=Reward.reserved - 1)
+        .execution_options(synchronize_session=False)
+    )
+    
+    # Restar créditos si el usuario aún los tiene (pudo perderlos por penalizaciones)
+    cost = redemption.credits_spent
+    charged = db.session.execute(
+        update(User)
+        .where(User.id == redemption.user_id, User.score >= cost)
+        .values(score=User.score - cost, reserved_credits=User.reserved_credits - cost)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+    if not charged:
+        db.session.rollback()
         return jsonify({'error': 'User no longer has sufficient credits'}), 400
     
-    # Aprobar: restar créditos y actualizar stock
-    user.subtract_credits(redemption.credits_spent)
+    if not _close_redemption(redemption.id, 'approved', admin_id):
+        db.session.rollback()
+        return jsonify({'error': 'Redemption already processed'}), 400
     
+    db.session.refresh(redemption)
+    user = User.query.get(redemption.user_id)
     reward = Reward.query.get(redemption.reward_id)
-    if reward.stock is not None:
-        reward.stock -= 1
-    
-    redemption.status = 'approved'
-    redemption.approved_by_id = admin_id
-    redemption.approved_at = datetime.utcnow()
+    db.session.refresh(user)
+    db.session.refresh(reward)
+    
+    record('redemption_approved', user.id, redemption.id, -redemption.credits_spent)
+    emit('redemption_approved', {
+        'redemption_id': redemption.id,
+        'reward_id': reward.id,
+        'stock': reward.stock,
+        'user_score': user.score,
+        'user_reserved_credits': user.reserved_credits
+    }, user_id=user.id)
     
     db.session.commit()
     
@@ -237,11 +383,37 @@ def reject_redemption(redemption_id):
     if redemption.status != 'pending':
         return jsonify({'error': 'Redemption already processed'}), 400
     
-    # Rechazar (NO se restan créditos)
-    redemption.status = 'rejected'
-    redemption.approved_by_id = admin_id
-    redemption.approved_at = datetime.utcnow()
-    redemption.rejection_reason = data.get('reason', 'No especificado')
+    # Rechazar (NO se restan créditos): se liberan la unidad y los créditos reservados
+    db.session.execute(
+        update(Reward)
+        .where(Reward.id == redemption.reward_id)
+        .values(reserved=Reward.reserved - 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.execute(
+        update(User)
+        .where(User.id == redemption.user_id)
+        .values(reserved_credits=User.reserved_credits - redemption.credits_spent)
+        .execution_options(synchronize_session=False)
+    )
+    if not _close_redemption(
+        redemption.id, 'rejected', admin_id,
+        rejection_reason=data.get('reason', 'No especificado')
+    ):
+        db.session.rollback()
+        return jsonify({'error': 'Redemption already processed'}), 400
+    
+    db.session.refresh(redemption)
+    user = User.query.get(redemption.user_id)
+    db.session.refresh(user)
+    
+    record('redemption_rejected', redemption.user_id, redemption.id)
+    emit('redemption_rejected', {
+        'redemption_id': redemption.id,
+        'reward_id': redemption.reward_id,
+        'user_score': user.score,
+        'user_reserved_credits': user.reserved_credits
+    }, user_id=redemption.user_id)
     
     db.session.commit()
     
@@ -250,6 +422,181 @@ def reject_redemption(redemption_id):
         'redemption': redemption.to_dict()
     }), 200
 
+@rewards_bp.route('/redemptions/bulk', methods=['POST'])
+@admin_required
+def bulk_process_redemptions():
+    """
+    Aprobar/rechazar varios canjes en una sola transacción (solo admin)
+    Body: {
+        "decisions": [
+            {"id": 1, "action": "approve"},
+            {"id": 2, "action": "reject", "reason": "..."}  // reason opcional
+        ]
+    }
+    
+    Cada canje recibe su resultado: approved, rejected, not_found,
+    already_processed o insufficient_credits (el usuario ya no tiene los
+    créditos: se aprueban sus canjes más antiguos mientras alcancen y el
+    resto queda pendiente). Los descuentos se agregan por usuario y por
+    premio y se aplican con un UPDATE por tabla. 409 (sin cambios) si otro
+    admin cerró alguno de los canjes mientras tanto.
+    """
+    admin_id = int(get_jwt_identity())
+    data = request.get_json() or {}
+    decisions = data.get('decisions')
+    
+    if not isinstance(decisions, list) or not decisions:
+        return jsonify({'error': 'decisions must be a non-empty list'}), 400
+    if len(decisions) > BULK_DECISIONS_LIMIT:
+        return jsonify({'error': f'At most {BULK_DECISIONS_LIMIT} decisions per request'}), 400
+    
+    actions = {}
+    reasons = {}
+    for decision in decisions:
+        if (not isinstance(decision, dict) or not isinstance(decision.get('id'), int)
+                or decision.get('action') not in ('approve', 'reject')):
+            return jsonify({'error': 'Each decision needs an integer id and action approve|reject'}), 400
+        if decision['id'] in actions:
+            return jsonify({'error': f'Duplicate redemption id {decision["id"]}'}), 400
+        actions[decision['id']] = decision['action']
+        if decision['action'] == 'reject':
+            reasons[decision['id']] = decision.get('reason') or 'No especificado'
+    
+    redemptions = RewardRedemption.query.filter(RewardRedemption.id.in_(actions.keys())).all()
+    reward_ids = sorted({r.reward_id for r in redemptions})
+    user_ids = sorted({r.user_id for r in redemptions})
+    
+    # Bloquear en el orden de siempre (premio -> usuario -> canje). El estado
+    # se relee con FOR UPDATE: una lectura normal devolvería la foto de la
+    # primera consulta (REPEATABLE READ) y no vería un canje aprobado entretanto
+    if reward_ids:
+        db.session.execute(
+            select(Reward.id).where(Reward.id.in_(reward_ids)).order_by(Reward.id).with_for_update()
+        )
+    scores = dict(db.session.execute(
+        select(User.id, User.score).where(User.id.in_(user_ids)).order_by(User.id).with_for_update()
+    ).all()) if user_ids else {}
+    statuses = dict(db.session.execute(
+        select(RewardRedemption.id, RewardRedemption.status)
+        .where(RewardRedemption.id.in_(actions.keys()))
+        .order_by(RewardRedemption.id)
+        .with_for_update()
+    ).all())
+    
+    results = {redemption_id: 'not_found' for redemption_id in actions}
+    approved, rejected = [], []
+    charges = {}         # user_id -> créditos a restar
+    released = {}        # user_id -> créditos reservados a liberar
+    stock_used = {}      # reward_id -> unidades aprobadas
+    units_released = {}  # reward_id -> unidades reservadas a liberar
+    
+    for redemption in sorted(redemptions, key=lambda r: (r.redeemed_at, r.id)):
+        if statuses.get(redemption.id) != 'pending':
+            results[redemption.id] = 'already_processed'
+            continue
+        
+        cost = redemption.credits_spent
+        if actions[redemption.id] == 'approve':
+            if charges.get(redemption.user_id, 0) + cost > scores[redemption.user_id]:
+                results[redemption.id] = 'insufficient_credits'
+                continue
+            charges[redemption.user_id] = charges.get(redemption.user_id, 0) + cost
+            stock_used[redemption.reward_id] = stock_used.get(redemption.reward_id, 0) + 1
+            approved.append(redemption)
+        else:
+            rejected.append(redemption)
+        
+        released[redemption.user_id] = released.get(redemption.user_id, 0) + cost
+        units_released[redemption.reward_id] = units_released.get(redemption.reward_id, 0) + 1
+        results[redemption.id] = 'approved' if actions[redemption.id] == 'approve' else 'rejected'
+    
+    # Cerrar los canjes solo si siguen pendientes; si alguno ya no lo está,
+    # no se descuenta nada
+    now = datetime.utcnow()
+    closed = 0
+    if approved:
+        closed += db.session.execute(
+            update(RewardRedemption)
+            .where(RewardRedemption.id.in_([r.id for r in approved]), RewardRedemption.status == 'pending')
+            .values(status='approved', approved_by_id=admin_id, approved_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    if rejected:
+        closed += db.session.execute(
+            update(RewardRedemption)
+            .where(RewardRedemption.id.in_([r.id for r in rejected]), RewardRedemption.status == 'pending')
+            .values(
+                status='rejected', approved_by_id=admin_id, approved_at=now,
+                rejection_reason=case({r.id: reasons[r.id] for r in rejected}, value=RewardRedemption.id)
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    if closed != len(approved) + len(rejected):
+        db.session.rollback()
+        return jsonify({'error': 'Some redemptions were processed concurrently, retry'}), 409
+    
+    if units_released:
+        db.session.execute(
+            update(Reward)
+            .where(Reward.id.in_(units_released.keys()))
+            .values(
+                stock=Reward.stock - _amount_by_id(stock_used, Reward.id),
+                reserved=Reward.reserved - _amount_by_id(units_released, Reward.id)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(
+            update(User)
+            .where(User.id.in_(released.keys()))
+            .values(
+                score=User.score - _amount_by_id(charges, User.id),
+                reserved_credits=User.reserved_credits - _amount_by_id(released, User.id)
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    if approved or rejected:
+        users = {row.id: row for row in db.session.execute(
+            select(User.id, User.score, User.reserved_credits).where(User.id.in_(released.keys()))
+        )}
+        stocks = dict(db.session.execute(
+            select(Reward.id, Reward.stock).where(Reward.id.in_(units_released.keys()))
+        ).all())
+        for redemption in approved:
+            user = users[redemption.user_id]
+            record('redemption_approved', redemption.user_id, redemption.id, -redemption.credits_spent)
+            emit('redemption_approved', {
+                'redemption_id': redemption.id,
+                'reward_id': redemption.reward_id,
+                'stock': stocks[redemption.reward_id],
+                'user_score': user.score,
+                'user_reserved_credits': user.reserved_credits
+            }, user_id=redemption.user_id)
+        for redemption in rejected:
+            user = users[redemption.user_id]
+            record('redemption_rejected', redemption.user_id, redemption.id)
+            emit('redemption_rejected', {
+                'redemption_id': redemption.id,
+                'reward_id': redemption.reward_id,
+                'user_score': user.score,
+                'user_reserved_credits': user.reserved_credits
+            }, user_id=redemption.user_id)
+    
+    db.session.commit()
+    
+    counts = {}
+    for outcome in results.values():
+        counts[outcome] = counts.get(outcome, 0) + 1
+    
+    return jsonify({
+        'message': f'{len(approved)} redemptions approved, {len(rejected)} rejected',
+        'counts': counts,
+        'results': [
+            {'id': decision['id'], 'action': decision['action'], 'result': results[decision['id']]}
+            for decision in decisions
+        ]
+    }), 200
+
 @rewards_bp.route('/redemptions', methods=['GET'])
 @jwt_required()
 def get_redemptions():
@@ -267,58 +614,87 @@ def get_redemptions():
     return jsonify([r.to_dict() for r in redemptions]), 200
 
 @rewards_bp.route('/redemptions/history', methods=['GET'])
+@read_replica
 @admin_required
 def get_redemptions_history():
     """
-    Obtener historial completo de transacciones con filtros (solo admin)
+    Obtener historial de transacciones con filtros, paginado (solo admin)
     Query params:
     - user_id: int (opcional) - filtrar por usuario
     - start_date: YYYY-MM-DD (opcional) - fecha inicio, por defecto último mes
     - end_date: YYYY-MM-DD (opcional) - fecha fin, por defecto hoy
+    - limit: canjes por página (default 50, máximo 200)
+    - cursor: next_cursor de la página anterior
+    - totals: true|false - incluir totales del rango (por defecto solo en la primera página)
+    
+    Las páginas van de la más reciente a la más antigua por (redeemed_at, id),
+    así cada página lee solo sus filas del índice. La lista de usuarios para
+    el filtro está en GET /api/users/options.
     """
     # Obtener parámetros de filtro
     user_id_filter = request.args.get('user_id', type=int)
     start_date_str = request.args.get('start_date')
     end_date_str = request.args.get('end_date')
+    limit = min(max(request.args.get('limit', 50, type=int), 1), HISTORY_PAGE_LIMIT)
+    cursor = request.args.get('cursor')
     
     # Fechas por defecto: último mes hasta hoy
-    if end_date_str:
-        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
-    else:
-        end_date = datetime.utcnow()
-    
-    if start_date_str:
-        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').replace(hour=0, minute=0, second=0)
-    else:
-        start_date = end_date - timedelta(days=30)
-    
-    # Construir query
-    query = RewardRedemption.query
-    
-    # Filtro por usuario
+    try:
+        if end_date_str:
+            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
+        else:
+            end_date = datetime.utcnow()
+        
+        if start_date_str:
+            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').replace(hour=0, minute=0, second=0)
+        else:
+            start_date = end_date - timedelta(days=30)
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+    
+    # Filtros comunes a la página y a los totales
+    conditions = [
+        RewardRedemption.redeemed_at >= start_date,
+        RewardRedemption.redeemed_at <= end_date
+    ]
     if user_id_filter:
-        query = query.filter(RewardRedemption.user_id == user_id_filter)
-    
-    # Filtro por rango de fechas
-    query = query.filter(
-        and_(
-            RewardRedemption.redeemed_at >= start_date,
-            RewardRedemption.redeemed_at <= end_date
-        )
-    )
-    
-    # Ordenar por fecha descendente
-    redemptions = query.order_by(RewardRedemption.redeemed_at.desc()).all()
-    
-    # Obtener lista de usuarios para el filtro
-    users = User.query.filter_by(role='user').order_by(User.nick).all()
-    
-    return jsonify({
+        conditions.append(RewardRedemption.user_id == user_id_filter)
+    
+    query = RewardRedemption.query.filter(*conditions)
+    
+    # Continuar justo después de la última fila de la página anterior
+    if cursor:
+        try:
+            cursor_date, cursor_id = _decode_history_cursor(cursor)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        query = query.filter(or_(
+            RewardRedemption.redeemed_at < cursor_date,
+            and_(RewardRedemption.redeemed_at == cursor_date, RewardRedemption.id < cursor_id)
+        ))
+    
+    # Una fila de más para saber si hay página siguiente
+    redemptions = query.options(
+        joinedload(RewardRedemption.reward), joinedload(RewardRedemption.user)
+    ).order_by(
+        RewardRedemption.redeemed_at.desc(), RewardRedemption.id.desc()
+    ).limit(limit + 1).all()
+    
+    has_more = len(redemptions) > limit
+    redemptions = redemptions[:limit]
+    
+    response = {
         'redemptions': [r.to_dict() for r in redemptions],
+        'next_cursor': _encode_history_cursor(redemptions[-1]) if has_more else None,
         'filters': {
             'start_date': start_date.strftime('%Y-%m-%d'),
             'end_date': end_date.strftime('%Y-%m-%d'),
             'user_id': user_id_filter
-        },
-        'users': [{'id': u.id, 'nick': u.nick, 'figure': u.figure} for u in users]
-    }), 200
+        }
+    }
+    
+    include_totals = request.args.get('totals', 'false' if cursor else 'true').lower() in ('1', 'true')
+    if include_totals:
+        response['totals'] = _redemption_totals(conditions)
+    
+    return jsonify(response), 200
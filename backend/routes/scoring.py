@@ -0,0 +1,78 @@
+from functools import wraps
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models import db, current_family_id, Family, User
+import json
+from scoring import DEFAULT_RULES, compile_rules
+from replica import read_replica
+
+scoring_bp = Blueprint('scoring', __name__)
+
+def admin_required(fn):
+    """Decorator para verificar que el usuario es admin"""
+    @wraps(fn)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        user_id = int(get_jwt_identity())
+        user = User.query.get(user_id)
+        if not user or user.role != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+def _rules_response(family):
+    rules = family.get_scoring_rules()
+    return {
+        'rules': dict(DEFAULT_RULES, **(rules or {})),
+        'custom': rules is not None,
+        'version': family.scoring_version
+    }
+
+@scoring_bp.route('', methods=['GET'])
+@read_replica
+@jwt_required()
+def get_scoring_rules():
+    """Reglas de puntuación de la familia (las que faltan toman el valor por defecto)"""
+    family = Family.query.get(current_family_id())
+    if not family:
+        return jsonify({'error': 'Family not found'}), 404
+    return jsonify(_rules_response(family)), 200
+
+@scoring_bp.route('', methods=['PUT'])
+@admin_required
+def update_scoring_rules():
+    """
+    Cambiar las reglas de puntuación de la familia (solo admin)
+    Body: {
+        "rules": {
+            "tiers": {"1": 10, "2": 60, "3": 100},
+            "penalties": {"obligatory": 100, "special": 0, "proposed": 0},
+            "streak_bonus": [{"min_streak": 7, "percent": 150}],
+            "weekend_percent": 120
+        }
+    }
+    "rules": null vuelve a las de por defecto. Solo afectan a las
+    validaciones y cancelaciones posteriores; los créditos ya dados no cambian.
+    """
+    data = request.get_json() or {}
+    if 'rules' not in data:
+        return jsonify({'error': 'rules is required (null to restore the defaults)'}), 400
+
+    rules = data['rules']
+    if rules is not None and not isinstance(rules, dict):
+        return jsonify({'error': 'rules must be an object or null'}), 400
+    try:
+        compile_rules(rules)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    family = Family.query.get(current_family_id())
+    if not family:
+        return jsonify({'error': 'Family not found'}), 404
+
+    family.scoring_rules = json.dumps(rules) if rules is not None else None
+    # Incremento en la base: dos cambios simultáneos no comparten versión
+    family.scoring_version = Family.scoring_version + 1
+    db.session.commit()
+
+    return jsonify(_rules_response(family)), 200
@@ -0,0 +1,196 @@
+from functools import wraps
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models import db, User, Task, StatsUserDaily, StatsTaskWeekly
+from datetime import datetime, timedelta
+from collections import Counter
+from sqlalchemy import select
+from jobs import enqueue, job_handler
+from replica import read_replica
+from stats import rebuild, week_start
+
+stats_bp = Blueprint('stats', __name__)
+
+# Rango por defecto: las últimas 12 semanas
+DEFAULT_RANGE_DAYS = 84
+
+def admin_required(fn):
+    """Decorator para verificar que el usuario es admin"""
+    @wraps(fn)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        user_id = int(get_jwt_identity())
+        user = User.query.get(user_id)
+        if not user or user.role != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+def _date_range(args):
+    """(start, end) de start_date/end_date (YYYY-MM-DD); ValueError si no son válidas"""
+    end = datetime.strptime(args['end_date'], '%Y-%m-%d').date() if args.get('end_date') else datetime.now().date()
+    if args.get('start_date'):
+        start = datetime.strptime(args['start_date'], '%Y-%m-%d').date()
+    else:
+        start = end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise ValueError('start_date after end_date')
+    return start, end
+
+def _with_rate(counts):
+    """Contadores + completion_rate (completadas / asignadas)"""
+    data = dict(counts)
+    data['completion_rate'] = round(counts['completed'] / counts['assigned'], 3) if counts['assigned'] else None
+    return data
+
+def _summarize(rows, key, columns, period):
+    """Filas de resumen -> {clave: (totales, {periodo: contadores})}"""
+    summary = {}
+    for row in rows:
+        totals, series = summary.setdefault(getattr(row, key), (Counter(), {}))
+        bucket = series.setdefault(period(row), Counter())
+        for name in columns:
+            totals[name] += getattr(row, name)
+            bucket[name] += getattr(row, name)
+    return summary
+
+def _complete(counts, columns):
+    return {name: counts.get(name, 0) for name in columns}
+
+@stats_bp.route('/users', methods=['GET'])
+@read_replica
+@jwt_required()
+def get_user_stats():
+    """
+    Estadísticas por usuario: tasa de completado, puntuaciones de validación
+    y créditos ganados frente a gastados
+    Query params:
+        - start_date, end_date: YYYY-MM-DD (por defecto las últimas 12 semanas)
+        - user_id: filtrar por usuario (admin; un usuario solo ve las suyas)
+        - group: week|day - agrupación de la serie (default week)
+
+    Suma filas de stats_user_daily (una por usuario y día), no las tablas de
+    tareas. Los contadores de tareas van por día de la asignación; los
+    créditos, por día en que se movieron.
+    """
+    user_id = int(get_jwt_identity())
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    try:
+        start, end = _date_range(request.args)
+    except ValueError:
+        return jsonify({'error': 'Invalid date range. Use YYYY-MM-DD'}), 400
+
+    group = request.args.get('group', 'week')
+    if group not in ('week', 'day'):
+        return jsonify({'error': 'group must be week or day'}), 400
+
+    user_filter = request.args.get('user_id', type=int) if user.role == 'admin' else user.id
+
+    columns = StatsUserDaily.COLUMNS
+    query = select(StatsUserDaily.user_id, StatsUserDaily.day, *[getattr(StatsUserDaily, c) for c in columns]).where(
+        StatsUserDaily.day.between(start, end)
+    )
+    if user_filter:
+        query = query.where(StatsUserDaily.user_id == user_filter)
+
+    period = (lambda row: week_start(row.day)) if group == 'week' else (lambda row: row.day)
+    summary = _summarize(db.session.execute(query.order_by(StatsUserDaily.day)), 'user_id', columns, period)
+
+    users = {u.id: u for u in db.session.execute(
+        select(User.id, User.nick, User.figure).where(User.id.in_(summary.keys()))
+    )}
+
+    return jsonify({
+        'start_date': start.isoformat(),
+        'end_date': end.isoformat(),
+        'group': group,
+        'users': [
+            {
+                'user_id': uid,
+                'nick': users[uid].nick if uid in users else None,
+                'figure': users[uid].figure if uid in users else None,
+                'totals': _with_rate(_complete(totals, columns)),
+                'series': [
+                    dict(_with_rate(_complete(counts, columns)), period=key.isoformat())
+                    for key, counts in series.items()
+                ]
+            }
+            for uid, (totals, series) in sorted(summary.items())
+        ]
+    }), 200
+
+@stats_bp.route('/tasks', methods=['GET'])
+@read_replica
+@admin_required
+def get_task_stats():
+    """
+    Estadísticas semanales por tarea (solo admin)
+    Query params:
+        - start_date, end_date: YYYY-MM-DD (por defecto las últimas 12 semanas;
+          se amplían a semanas completas de lunes a domingo)
+    """
+    try:
+        start, end = _date_range(request.args)
+    except ValueError:
+        return jsonify({'error': 'Invalid date range. Use YYYY-MM-DD'}), 400
+    start, end = week_start(start), week_start(end) + timedelta(days=6)
+
+    columns = StatsTaskWeekly.COLUMNS
+    rows = db.session.execute(
+        select(StatsTaskWeekly.task_id, StatsTaskWeekly.week, *[getattr(StatsTaskWeekly, c) for c in columns])
+        .where(StatsTaskWeekly.week.between(start, end))
+        .order_by(StatsTaskWeekly.week)
+    )
+    summary = _summarize(rows, 'task_id', columns, lambda row: row.week)
+
+    titles = dict(db.session.execute(
+        select(Task.id, Task.title).where(Task.id.in_(summary.keys()))
+    ).all())
+
+    return jsonify({
+        'start_date': start.isoformat(),
+        'end_date': end.isoformat(),
+        'tasks': [
+            {
+                'task_id': task_id,
+                'title': titles.get(task_id),
+                'totals': _with_rate(_complete(totals, columns)),
+                'series': [
+                    dict(_with_rate(_complete(counts, columns)), week=week.isoformat())
+                    for week, counts in series.items()
+                ]
+            }
+            for task_id, (totals, series) in sorted(summary.items())
+        ]
+    }), 200
+
+@stats_bp.route('/rebuild', methods=['POST'])
+@admin_required
+def rebuild_stats():
+    """
+    Recalcular los resúmenes de un rango desde las tablas de origen (trabajo en segundo plano)
+    Body: { "start_date": "2026-01-01", "end_date": "2026-10-19" }
+    """
+    admin_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    try:
+        start, end = _date_range(data)
+    except ValueError:
+        return jsonify({'error': 'Invalid date range. Use YYYY-MM-DD'}), 400
+
+    job = enqueue('stats_rebuild', {'start_date': start.isoformat(), 'end_date': end.isoformat()}, admin_id)
+    return jsonify({
+        'message': 'Stats rebuild queued',
+        'job': job.to_dict()
+    }), 202
+
+@job_handler('stats_rebuild')
+def stats_rebuild_job(payload, job):
+    """Recalcula los resúmenes de la familia del trabajo"""
+    start, end = _date_range(payload)
+    user_days, task_weeks = rebuild(start, end)
+    db.session.commit()
+    return {'user_days': user_days, 'task_weeks': task_weeks}, 200
@@ -0,0 +1,132 @@
+import base64
+import binascii
+import json
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models import User, TaskAssignment, TaskCompletion, Reward, RewardRedemption, Bonus, SyncTombstone
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload
+from replica import read_replica
+
+sync_bp = Blueprint('sync', __name__)
+
+# nombre en el token/respuesta -> (modelo, relaciones que usa to_dict)
+SYNC_TABLES = {
+    'task_assignments': (TaskAssignment, ('task', 'user', 'completion')),
+    'task_completions': (TaskCompletion, ('task', 'user')),
+    'rewards': (Reward, ()),
+    'reward_redemptions': (RewardRedemption, ('reward', 'user')),
+    'bonuses': (Bonus, ('user', 'assigned_by')),
+}
+TOMBSTONES = 'deleted'
+
+# Posición inicial: sin token se envía todo (primera sincronización)
+_BEGINNING = (datetime(1970, 1, 1), 0)
+
+def _encode_token(issued_at, positions):
+    data = {
+        'at': issued_at.isoformat(),
+        'pos': {name: [ts.isoformat(), row_id] for name, (ts, row_id) in positions.items()}
+    }
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode().rstrip('=')
+
+def _decode_token(token):
+    """Token -> (emitido, {tabla: (updated_at, id)}); ValueError si no es válido"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        positions = {name: (datetime.fromisoformat(ts), int(row_id)) for name, (ts, row_id) in data['pos'].items()}
+        return datetime.fromisoformat(data['at']), positions
+    except (binascii.Error, KeyError, TypeError, AttributeError, json.JSONDecodeError) as e:
+        raise ValueError(str(e))
+
+def _after(column, id_column, position):
+    """Filas posteriores a (timestamp, id): paginación por clave sin huecos ni repeticiones"""
+    ts, row_id = position
+    return or_(column > ts, and_(column == ts, id_column > row_id))
+
+def _changed_rows(model, relations, position, user, limit):
+    query = model.query.filter(_after(model.updated_at, model.id, position))
+    if user.role != 'admin' and model is not Reward:
+        query = query.filter(model.user_id == user.id)
+    query = query.options(*[joinedload(getattr(model, name)) for name in relations])
+    return query.order_by(model.updated_at, model.id).limit(limit + 1).all()
+
+def _deleted_rows(position, user, limit):
+    query = SyncTombstone.query.filter(_after(SyncTombstone.deleted_at, SyncTombstone.id, position))
+    if user.role != 'admin':
+        query = query.filter(or_(SyncTombstone.user_id == user.id, SyncTombstone.user_id.is_(None)))
+    return query.order_by(SyncTombstone.deleted_at, SyncTombstone.id).limit(limit + 1).all()
+
+@sync_bp.route('', methods=['GET'])
+@read_replica
+@jwt_required()
+def get_changes():
+    """
+    Cambios desde la última sincronización (tablets sin conexión estable)
+    Query params:
+        - since: token `next` de la respuesta anterior (sin él se envía todo)
+    Respuesta: {
+        "changes": {"task_assignments": [...], "task_completions": [...], "rewards": [...],
+                    "reward_redemptions": [...], "bonuses": [...]},
+        "deleted": [{"table": "task_assignments", "id": 7, "deleted_at": "..."}],
+        "next": "<token>",
+        "has_more": false  // true: volver a llamar en seguida con since=next
+    }
+
+    Los usuarios reciben sus propias filas (y el catálogo de premios); el admin,
+    las de toda la familia. El token guarda, por tabla, el último (updated_at, id)
+    enviado. Al ponerse al día se retrocede SYNC_SAFETY_SECONDS para recoger
+    escrituras que confirmaron tarde: alguna fila puede repetirse, así que el
+    cliente debe aplicar los cambios por id. Un token más antiguo que
+    SYNC_TOMBSTONE_DAYS responde 410: hay que sincronizar desde cero.
+    """
+    user_id = int(get_jwt_identity())
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    now = datetime.utcnow()
+    limit = current_app.config['SYNC_PAGE_SIZE']
+    caught_up = (now - timedelta(seconds=current_app.config['SYNC_SAFETY_SECONDS']), 0)
+
+    token = request.args.get('since')
+    if token:
+        try:
+            issued_at, positions = _decode_token(token)
+        except ValueError:
+            return jsonify({'error': 'Invalid sync token'}), 400
+        # Las lápidas más antiguas ya se han purgado: faltarían borrados
+        if issued_at < now - timedelta(days=current_app.config['SYNC_TOMBSTONE_DAYS']):
+            return jsonify({'error': 'Sync token expired, sync again without since'}), 410
+    else:
+        # Primera sincronización: todas las filas y ningún borrado anterior
+        positions = {TOMBSTONES: caught_up}
+
+    changes = {}
+    next_positions = {}
+    has_more = False
+    for name, (model, relations) in SYNC_TABLES.items():
+        rows = _changed_rows(model, relations, positions.get(name, _BEGINNING), user, limit)
+        if len(rows) > limit:
+            rows = rows[:limit]
+            has_more = True
+            next_positions[name] = (rows[-1].updated_at, rows[-1].id)
+        else:
+            next_positions[name] = caught_up
+        changes[name] = [row.to_dict() for row in rows]
+
+    tombstones = _deleted_rows(positions.get(TOMBSTONES, _BEGINNING), user, limit)
+    if len(tombstones) > limit:
+        tombstones = tombstones[:limit]
+        has_more = True
+        next_positions[TOMBSTONES] = (tombstones[-1].deleted_at, tombstones[-1].id)
+    else:
+        next_positions[TOMBSTONES] = caught_up
+
+    return jsonify({
+        'changes': changes,
+        'deleted': [t.to_dict() for t in tombstones],
+        'next': _encode_token(now, next_positions),
+        'has_more': has_more
+    }), 200
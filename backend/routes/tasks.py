@@ -1,12 +1,22 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, User, Task, TaskAssignment, TaskCompletion, TaskProposal, TaskType, TaskFrequency, ProposalStatus, Bonus
+from models import db, current_family_id, User, Task, TaskAssignment, TaskCompletion, TaskProposal, TaskType, TaskFrequency, ProposalStatus, Bonus
+from jobs import enqueue, job_handler
+from events import emit
+from outbox import record
+from archive import with_archive
+from streaks import advance_streak, current_streaks, keeps_streak, recompute_streak, rebuild as rebuild_streaks
+from scoring import rules_for
+from replica import read_replica
 from datetime import datetime, date, timedelta
 from sqlalchemy import and_
 from calendar import monthrange
+from collections import Counter
 
 tasks_bp = Blueprint('tasks', __name__)
 
+BULK_VALIDATIONS_LIMIT = 500
+
 def admin_required(fn):
     """Decorator para verificar que el usuario es administrador"""
     from functools import wraps
@@ -77,6 +87,8 @@ def create_task():
     )
     
     db.session.add(task)
+    db.session.flush()
+    record('task_created', user_id, task.id)
     db.session.commit()
     
     return jsonify(task.to_dict()), 201
@@ -104,6 +116,7 @@ def update_task(task_id):
     if 'status' in data:
         task.status = data['status']
     
+    record('task_updated', int(get_jwt_identity()), task.id)
     db.session.commit()
     
     return jsonify(task.to_dict()), 200
@@ -117,6 +130,7 @@ def delete_task(task_id):
         return jsonify({'error': 'Task not found'}), 404
     
     task.status = 'archived'
+    record('task_deleted', int(get_jwt_identity()), task.id)
     db.session.commit()
     
     return jsonify({'message': 'Task archived successfully'}), 200
@@ -168,86 +182,36 @@ def assign_task():
     )
     
     db.session.add(assignment)
+    db.session.flush()
+    
+    record('assignment', assignment.user_id, assignment.id)
+    emit('assignment', {
+        'assignment_id': assignment.id,
+        'task_id': assignment.task_id,
+        'assigned_date': assigned_date.isoformat()
+    }, user_id=assignment.user_id)
+    
     db.session.commit()
     
     return jsonify(assignment.to_dict()), 201
 
-@tasks_bp.route('/assign/bulk', methods=['POST'])
-@admin_required
-def bulk_assign_task():
+def _expand_bulk_dates(frequency, data, start_date, end_date):
     """
-    Asignar tarea a usuario(s) con intervalo de fechas
-    Body: {
-        "task_id": 1,
-        "user_ids": [2, 3],  // Lista de usuarios
-        "start_date": "2025-12-01",
-        "end_date": "2025-12-31",
-        "frequency": "daily|weekly|monthly",  // Frecuencia de asignación
-        "weekdays": [0, 1, 2, 3, 4],  // Para daily: días de la semana (0=Lun, 6=Dom)
-        "times_per_day": 1,  // Para daily: cuántas veces al día
-        "weeks": [1, 2, 3, 4],  // Para weekly: qué semanas del mes
-        "months": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]  // Para monthly: qué meses
-    }
+    Expande el patrón de asignación masiva en la lista de fechas resultante.
+    Las fechas pueden repetirse (times_per_day en frecuencia diaria).
+    Retorna None si la frecuencia no es válida.
     """
-    data = request.get_json()
-    admin_id = int(get_jwt_identity())
-    
-    required_fields = ['task_id', 'user_ids', 'start_date', 'end_date', 'frequency']
-    if not all(field in data for field in required_fields):
-        return jsonify({'error': 'Missing required fields'}), 400
-    
-    task = Task.query.get(data['task_id'])
-    if not task:
-        return jsonify({'error': 'Task not found'}), 404
-    
-    # Verificar usuarios
-    user_ids = data['user_ids']
-    users = User.query.filter(User.id.in_(user_ids)).all()
-    if len(users) != len(user_ids):
-        return jsonify({'error': 'One or more users not found'}), 404
-    
-    # Convertir fechas
-    start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
-    end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
-    
-    if start_date > end_date:
-        return jsonify({'error': 'start_date must be before end_date'}), 400
-    
-    frequency = data['frequency']
-    assignments_created = []
+    dates = []
+    current_date = start_date
     
-    # Generar asignaciones según frecuencia
     if frequency == 'daily':
         weekdays = data.get('weekdays', [0, 1, 2, 3, 4, 5, 6])  # Por defecto todos los días
         times_per_day = data.get('times_per_day', 1)
         
-        current_date = start_date
         while current_date <= end_date:
             # Verificar si el día de la semana está en la lista
             if current_date.weekday() in weekdays:
-                # Asignar N veces por día a cada usuario
-                for user_id in user_ids:
-                    for _ in range(times_per_day):
-                        # Verificar si ya existe
-                        existing = TaskAssignment.query.filter_by(
-                            task_id=task.id,
-                            user_id=user_id,
-                            assigned_date=current_date
-                        ).count()
-                        
-                        # Permitir múltiples asignaciones el mismo día
-                        assignment = TaskAssignment(
-                            task_id=task.id,
-                            user_id=user_id,
-                            assigned_date=current_date,
-                            assigned_by_id=admin_id
-                        )
-                        db.session.add(assignment)
-                        assignments_created.append({
-                            'user_id': user_id,
-                            'date': current_date.isoformat()
-                        })
-            
+                dates.extend([current_date] * times_per_day)
             current_date += timedelta(days=1)
     
     elif frequency == 'weekly':
@@ -255,33 +219,11 @@ def bulk_assign_task():
         weeks = data.get('weeks', [1, 2, 3, 4])  # Por defecto todas las semanas
         weekday = data.get('weekday', 0)  # Día de la semana (0=Lun)
         
-        current_date = start_date
         while current_date <= end_date:
             # Calcular qué semana del mes es
             week_of_month = (current_date.day - 1) // 7 + 1
-            
             if current_date.weekday() == weekday and week_of_month in weeks:
-                for user_id in user_ids:
-                    # Verificar si ya existe
-                    existing = TaskAssignment.query.filter_by(
-                        task_id=task.id,
-                        user_id=user_id,
-                        assigned_date=current_date
-                    ).first()
-                    
-                    if not existing:
-                        assignment = TaskAssignment(
-                            task_id=task.id,
-                            user_id=user_id,
-                            assigned_date=current_date,
-                            assigned_by_id=admin_id
-                        )
-                        db.session.add(assignment)
-                        assignments_created.append({
-                            'user_id': user_id,
-                            'date': current_date.isoformat()
-                        })
-            
+                dates.append(current_date)
             current_date += timedelta(days=1)
     
     elif frequency == 'monthly':
@@ -289,41 +231,208 @@ def bulk_assign_task():
         months = data.get('months', list(range(1, 13)))  # Por defecto todos los meses
         day_of_month = data.get('day_of_month', 1)  # Día del mes (1-31)
         
-        current_date = start_date
         while current_date <= end_date:
             if current_date.month in months and current_date.day == day_of_month:
-                for user_id in user_ids:
-                    # Verificar si ya existe
-                    existing = TaskAssignment.query.filter_by(
-                        task_id=task.id,
-                        user_id=user_id,
-                        assigned_date=current_date
-                    ).first()
-                    
-                    if not existing:
-                        assignment = TaskAssignment(
-                            task_id=task.id,
-                            user_id=user_id,
-                            assigned_date=current_date,
-                            assigned_by_id=admin_id
-                        )
-                        db.session.add(assignment)
-                        assignments_created.append({
-                            'user_id': user_id,
-                            'date': current_date.isoformat()
-                        })
-            
+                dates.append(current_date)
             current_date += timedelta(days=1)
     
     else:
-        return jsonify({'error': 'Invalid frequency'}), 400
+        return None
+    
+    return dates
+
+def _encode_date_runs(dates):
+    """
+    Codifica una lista ordenada de fechas como rangos de días consecutivos:
+    [["2025-12-01", "2025-12-05", 1], ...] donde el tercer valor indica
+    cuántas asignaciones hay por día dentro del rango.
+    """
+    runs = []
+    per_day_counts = Counter(dates)
+    for day in sorted(per_day_counts):
+        per_day = per_day_counts[day]
+        if runs and runs[-1][1] == day - timedelta(days=1) and runs[-1][2] == per_day:
+            runs[-1][1] = day
+        else:
+            runs.append([day, day, per_day])
+    return [[first.isoformat(), last.isoformat(), per_day] for first, last, per_day in runs]
+
+def _bulk_assign(data, admin_id, dry_run=False):
+    """
+    Lógica de la asignación masiva, compartida por el endpoint y el worker.
+    Retorna (respuesta, status_code).
+    """
+    task = Task.query.get(data['task_id'])
+    if not task:
+        return {'error': 'Task not found'}, 404
+    
+    # Verificar usuarios
+    user_ids = data['user_ids']
+    users = User.query.filter(User.id.in_(user_ids)).all()
+    if len(users) != len(user_ids):
+        return {'error': 'One or more users not found'}, 404
+    
+    # Convertir fechas
+    try:
+        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+        end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
+    except ValueError:
+        return {'error': 'Invalid date format. Use YYYY-MM-DD'}, 400
+    
+    if start_date > end_date:
+        return {'error': 'start_date must be before end_date'}, 400
+    
+    frequency = data['frequency']
+    dates = _expand_bulk_dates(frequency, data, start_date, end_date)
+    if dates is None:
+        return {'error': 'Invalid frequency'}, 400
+    
+    # En daily se permiten múltiples asignaciones el mismo día; en weekly/monthly
+    # se omiten las fechas que ya estaban asignadas
+    skip_existing = data.get('skip_existing', frequency != 'daily')
+    
+    # Asignaciones existentes en el rango (una sola consulta para todos los usuarios)
+    existing_rows = db.session.query(
+        TaskAssignment.user_id,
+        TaskAssignment.assigned_date
+    ).filter(
+        TaskAssignment.task_id == task.id,
+        TaskAssignment.user_id.in_(user_ids),
+        TaskAssignment.assigned_date >= start_date,
+        TaskAssignment.assigned_date <= end_date
+    ).distinct().all()
+    existing = set(existing_rows)
+    
+    requested_count = 0
+    created_count = 0
+    conflict_count = 0
+    per_user = {}
+    
+    for user_id in user_ids:
+        to_create = []
+        conflicts = []
+        for current_date in dates:
+            requested_count += 1
+            if (user_id, current_date) in existing:
+                conflicts.append(current_date)
+                if skip_existing:
+                    continue
+            to_create.append(current_date)
+        
+        if not dry_run:
+            db.session.add_all([
+                TaskAssignment(
+                    task_id=task.id,
+                    user_id=user_id,
+                    assigned_date=current_date,
+                    assigned_by_id=admin_id
+                )
+                for current_date in to_create
+            ])
+        
+        if not dry_run and to_create:
+            record('bulk_assignment', user_id, task.id)
+            emit('assignment', {
+                'task_id': task.id,
+                'created': len(to_create),
+                'start_date': min(to_create).isoformat(),
+                'end_date': max(to_create).isoformat()
+            }, user_id=user_id)
+        
+        created_count += len(to_create)
+        conflict_count += len(conflicts)
+        per_user[str(user_id)] = {
+            'created': len(to_create),
+            'conflicts': len(conflicts),
+            'created_ranges': _encode_date_runs(to_create),
+            'conflict_ranges': _encode_date_runs(conflicts)
+        }
+    
+    summary = {
+        'dry_run': dry_run,
+        'skip_existing': skip_existing,
+        'counts': {
+            'requested': requested_count,
+            'created': created_count,
+            'conflicts': conflict_count,
+            'skipped': requested_count - created_count
+        },
+        'users': per_user
+    }
+    
+    if dry_run:
+        summary['message'] = f'{created_count} assignments would be created ({conflict_count} conflicts)'
+        return summary, 200
     
     db.session.commit()
     
-    return jsonify({
-        'message': f'{len(assignments_created)} assignments created successfully',
-        'assignments': assignments_created
-    }), 201
+    summary['message'] = f'{created_count} assignments created successfully'
+    return summary, 201
+
+@tasks_bp.route('/assign/bulk', methods=['POST'])
+@admin_required
+def bulk_assign_task():
+    """
+    Asignar tarea a usuario(s) con intervalo de fechas
+    Body: {
+        "task_id": 1,
+        "user_ids": [2, 3],  // Lista de usuarios
+        "start_date": "2025-12-01",
+        "end_date": "2025-12-31",
+        "frequency": "daily|weekly|monthly",  // Frecuencia de asignación
+        "weekdays": [0, 1, 2, 3, 4],  // Para daily: días de la semana (0=Lun, 6=Dom)
+        "times_per_day": 1,  // Para daily: cuántas veces al día
+        "weeks": [1, 2, 3, 4],  // Para weekly: qué semanas del mes
+        "months": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12],  // Para monthly: qué meses
+        "skip_existing": true,  // Opcional: omitir fechas ya asignadas (por defecto false en daily)
+        "dry_run": false  // Opcional: solo calcular el resultado sin escribir nada
+    }
+    Query params:
+        - dry_run: true para previsualizar (equivalente a "dry_run" en el body)
+    
+    La respuesta es compacta: contadores totales y, por usuario, rangos de
+    fechas (creadas y en conflicto con asignaciones existentes).
+    
+    Para rangos grandes (o con "async": true) la operación se encola como
+    trabajo en segundo plano y se responde 202 con el id del trabajo
+    (ver /api/jobs/<id>).
+    """
+    data = request.get_json()
+    admin_id = int(get_jwt_identity())
+    
+    required_fields = ['task_id', 'user_ids', 'start_date', 'end_date', 'frequency']
+    if not all(field in data for field in required_fields):
+        return jsonify({'error': 'Missing required fields'}), 400
+    if not isinstance(data.get('skip_existing', False), bool):
+        return jsonify({'error': 'skip_existing must be true or false'}), 400
+    
+    dry_run = bool(data.get('dry_run')) or request.args.get('dry_run', '').lower() in ('1', 'true')
+    run_async = bool(data.get('async')) or request.args.get('async', '').lower() in ('1', 'true')
+    
+    if not dry_run and not run_async:
+        # Estimación barata (sin consultas) del número de asignaciones a crear
+        try:
+            start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        estimated = ((end_date - start_date).days + 1) * len(data['user_ids']) * data.get('times_per_day', 1)
+        run_async = estimated > current_app.config.get('BULK_ASSIGN_ASYNC_THRESHOLD', 2000)
+    
+    if run_async and not dry_run:
+        job = enqueue('bulk_assign', {'data': data, 'admin_id': admin_id}, admin_id)
+        return jsonify({
+            'message': 'Bulk assignment queued',
+            'job': job.to_dict()
+        }), 202
+    
+    result, status_code = _bulk_assign(data, admin_id, dry_run)
+    return jsonify(result), status_code
+
+@job_handler('bulk_assign')
+def bulk_assign_job(payload, job):
+    """Procesa una asignación masiva encolada"""
+    return _bulk_assign(payload['data'], payload['admin_id'])
 
 @tasks_bp.route('/assignments/<int:assignment_id>/complete', methods=['POST'])
 @jwt_required()
@@ -359,8 +468,18 @@ def complete_task(assignment_id):
     )
     
     assignment.is_completed = True
+    advance_streak(assignment, completed=True)
     
     db.session.add(completion)
+    db.session.flush()
+    
+    record('completion', assignment.user_id, completion.id)
+    emit('completion', {
+        'assignment_id': assignment.id,
+        'completion_id': completion.id,
+        'task_id': assignment.task_id
+    }, user_id=assignment.user_id)
+    
     db.session.commit()
     
     return jsonify(completion.to_dict()), 201
@@ -370,7 +489,8 @@ def complete_task(assignment_id):
 def cancel_task(assignment_id):
     """
     Cancelar/no completar una tarea
-    Si es obligatoria, se resta el base_value de los créditos del usuario
+    Se resta la penalización de las reglas de la familia (por defecto el
+    base_value entero si es obligatoria)
     Body (opcional): {
         "cancellation_reason": "Motivo de cancelación..."
     }
@@ -396,15 +516,25 @@ def cancel_task(assignment_id):
     # Marcar como cancelada
     assignment.is_cancelled = True
     assignment.cancelled_at = datetime.utcnow()
+    advance_streak(assignment, completed=False)
     
-    # Si es obligatoria, restar al usuario (nadie suma)
-    user = User.query.get(user_id)
+    # Si es obligatoria, restar al usuario asignado (nadie suma), también
+    # cuando cancela un admin
+    user = User.query.get(assignment.user_id)
     penalty_applied = 0
     
-    if assignment.task.task_type == TaskType.OBLIGATORY:
-        penalty = assignment.task.base_value
+    penalty = rules_for(current_family_id()).penalty(assignment.task.task_type, assignment.task.base_value)
+    if penalty:
         user.subtract_credits(penalty)
         penalty_applied = penalty
+    assignment.penalty_applied = penalty_applied
+    
+    record('cancellation', user.id, assignment.id, -penalty_applied)
+    emit('cancellation', {
+        'assignment_id': assignment.id,
+        'penalty_applied': penalty_applied,
+        'user_score': user.score
+    }, user_id=assignment.user_id)
     
     db.session.commit()
     
@@ -451,15 +581,23 @@ def validate_task(completion_id):
     completion.validated_at = datetime.utcnow()
     completion.validation_notes = data.get('validation_notes', '')
     
-    # Calcular créditos según validación
-    credits = completion.calculate_credits(task.base_value)
-    
-    completion.credits_awarded = credits
-    
     # Actualizar assignment
     assignment = TaskAssignment.query.get(completion.assignment_id)
     assignment.is_validated = True
     
+    # Una validación baja corta la racha que la completion ya había sumado
+    if not keeps_streak(score):
+        recompute_streak(assignment.user_id, assignment.task_id)
+    
+    # Calcular créditos con las reglas de la familia (compiladas y en caché)
+    rules = rules_for(current_family_id())
+    streak = 0
+    if rules.uses_streak:
+        streak = current_streaks([(assignment.user_id, task.id)]).get((assignment.user_id, task.id), 0)
+    credits = rules.credits(task.base_value, score, streak, assignment.assigned_date)
+    
+    completion.credits_awarded = credits
+    
     # Obtener usuario y administrador
     user = User.query.get(completion.user_id)
     admin = User.query.get(admin_id)
@@ -467,6 +605,15 @@ def validate_task(completion_id):
     # Los créditos se SUMAN al USUARIO que completó la tarea
     user.add_credits(credits)
     
+    record('validation', user.id, completion.id, credits)
+    emit('validation', {
+        'assignment_id': assignment.id,
+        'completion_id': completion.id,
+        'validation_score': score,
+        'credits_awarded': credits,
+        'user_score': user.score
+    }, user_id=user.id)
+    
     db.session.commit()
     
     return jsonify({
@@ -475,6 +622,97 @@ def validate_task(completion_id):
         'admin_score': admin.score
     }), 200
 
+@tasks_bp.route('/completions/validate/bulk', methods=['POST'])
+@admin_required
+def bulk_validate_tasks():
+    """
+    Validar varias tareas completadas en una sola transacción (solo admin)
+    Body: {
+        "validations": [
+            {"id": 7, "validation_score": 3},
+            {"id": 8, "validation_score": 2, "validation_notes": "..."}
+        ]
+    }
+    
+    Cada completion recibe su resultado: validated, not_found o
+    already_validated. Las reglas de puntuación se compilan una vez para
+    todo el lote y las rachas se leen con una sola consulta.
+    """
+    admin_id = int(get_jwt_identity())
+    data = request.get_json() or {}
+    validations = data.get('validations')
+    
+    if not isinstance(validations, list) or not validations:
+        return jsonify({'error': 'validations must be a non-empty list'}), 400
+    if len(validations) > BULK_VALIDATIONS_LIMIT:
+        return jsonify({'error': f'At most {BULK_VALIDATIONS_LIMIT} validations per request'}), 400
+    
+    requested = {}
+    for item in validations:
+        if (not isinstance(item, dict) or not isinstance(item.get('id'), int)
+                or item.get('validation_score') not in [1, 2, 3]):
+            return jsonify({'error': 'Each validation needs an integer id and validation_score 1, 2 or 3'}), 400
+        if item['id'] in requested:
+            return jsonify({'error': f'Duplicate completion id {item["id"]}'}), 400
+        requested[item['id']] = item
+    
+    # Bloqueadas hasta el commit: otra validación simultánea espera y las ve validadas
+    completions = TaskCompletion.query.filter(
+        TaskCompletion.id.in_(requested.keys())
+    ).order_by(TaskCompletion.id).with_for_update().all()
+    results = {completion_id: 'not_found' for completion_id in requested}
+    pending = []
+    for completion in completions:
+        if completion.validation_score:
+            results[completion.id] = 'already_validated'
+        else:
+            pending.append(completion)
+    
+    now = datetime.utcnow()
+    for completion in pending:
+        item = requested[completion.id]
+        completion.validation_score = item['validation_score']
+        completion.validated_by_id = admin_id
+        completion.validated_at = now
+        completion.validation_notes = item.get('validation_notes', '')
+        completion.assignment.is_validated = True
+        if not keeps_streak(item['validation_score']):
+            recompute_streak(completion.user_id, completion.task_id)
+    
+    rules = rules_for(current_family_id())
+    pairs = [(c.user_id, c.task_id) for c in pending]
+    streaks = current_streaks(pairs) if rules.uses_streak else {}
+    users = {u.id: u for u in User.query.filter(User.id.in_({c.user_id for c in pending}))} if pending else {}
+    
+    for completion in pending:
+        credits = rules.credits(
+            completion.task.base_value,
+            completion.validation_score,
+            streaks.get((completion.user_id, completion.task_id), 0),
+            completion.assignment.assigned_date
+        )
+        completion.credits_awarded = credits
+        user = users[completion.user_id]
+        user.add_credits(credits)
+        results[completion.id] = 'validated'
+        
+        record('validation', user.id, completion.id, credits)
+        emit('validation', {
+            'assignment_id': completion.assignment_id,
+            'completion_id': completion.id,
+            'validation_score': completion.validation_score,
+            'credits_awarded': credits,
+            'user_score': user.score
+        }, user_id=user.id)
+    
+    db.session.commit()
+    
+    return jsonify({
+        'results': [{'id': completion_id, 'result': result} for completion_id, result in results.items()],
+        'validated': len(pending),
+        'user_scores': {user_id: user.score for user_id, user in users.items()}
+    }), 200
+
 @tasks_bp.route('/assignments/<int:assignment_id>/reset', methods=['POST'])
 @admin_required
 def reset_task_assignment(assignment_id):
@@ -485,31 +723,47 @@ def reset_task_assignment(assignment_id):
     if not assignment:
         return jsonify({'error': 'Assignment not found'}), 404
     
+    pending_validation_removed = False
+    delta = 0
+    
     # Si está completada, eliminar el completion y revertir créditos
     if assignment.is_completed:
         completion = TaskCompletion.query.filter_by(assignment_id=assignment_id).first()
         if completion:
+            pending_validation_removed = completion.validation_score is None
             # Si fue validada, revertir créditos del usuario que completó la tarea
             if completion.credits_awarded and completion.credits_awarded > 0:
                 # Restar del usuario que completó la tarea
                 user = User.query.get(assignment.user_id)
                 if user:
                     user.subtract_credits(completion.credits_awarded)
+                    delta -= completion.credits_awarded
             
             db.session.delete(completion)
         
         assignment.is_completed = False
         assignment.is_validated = False
     
-    # Si está cancelada, revertir penalización si era obligatoria
+    # Si está cancelada, devolver la penalización que se aplicó
     if assignment.is_cancelled:
-        task = Task.query.get(assignment.task_id)
-        if task.task_type == TaskType.OBLIGATORY:
+        if assignment.penalty_applied:
             user = User.query.get(assignment.user_id)
-            user.add_credits(task.base_value)  # Devolver los créditos restados
+            user.add_credits(assignment.penalty_applied)  # Devolver los créditos restados
+            delta += assignment.penalty_applied
         
         assignment.is_cancelled = False
         assignment.cancelled_at = None
+        assignment.penalty_applied = 0
+    
+    recompute_streak(assignment.user_id, assignment.task_id)
+    
+    owner = User.query.get(assignment.user_id)
+    record('reset', assignment.user_id, assignment.id, delta)
+    emit('reset', {
+        'assignment_id': assignment.id,
+        'pending_validation_removed': pending_validation_removed,
+        'user_score': owner.score if owner else None
+    }, user_id=assignment.user_id)
     
     db.session.commit()
     
@@ -518,6 +772,27 @@ def reset_task_assignment(assignment_id):
         'assignment': assignment.to_dict()
     }), 200
 
+@tasks_bp.route('/streaks/rebuild', methods=['POST'])
+@admin_required
+def rebuild_task_streaks():
+    """
+    Recalcular todas las rachas de la familia desde el historial (trabajo en segundo plano)
+    Solo hace falta tras escrituras hechas por fuera de la API.
+    """
+    admin_id = int(get_jwt_identity())
+    job = enqueue('streaks_rebuild', {}, admin_id)
+    return jsonify({
+        'message': 'Streaks rebuild queued',
+        'job': job.to_dict()
+    }), 202
+
+@job_handler('streaks_rebuild')
+def streaks_rebuild_job(payload, job):
+    """Recalcula las rachas de la familia del trabajo"""
+    streaks = rebuild_streaks()
+    db.session.commit()
+    return {'streaks': streaks}, 200
+
 @tasks_bp.route('/completions/pending-validation', methods=['GET'])
 @admin_required
 def get_pending_validations():
@@ -604,15 +879,24 @@ def admin_cancel_task(assignment_id):
     # Marcar como cancelada
     assignment.is_cancelled = True
     assignment.cancelled_at = datetime.utcnow()
+    advance_streak(assignment, completed=False)
     
     # Si es obligatoria, restar al usuario (nadie suma)
     user = User.query.get(assignment.user_id)
     penalty_applied = 0
     
-    if assignment.task.task_type == TaskType.OBLIGATORY:
-        penalty = assignment.task.base_value
+    penalty = rules_for(current_family_id()).penalty(assignment.task.task_type, assignment.task.base_value)
+    if penalty:
         user.subtract_credits(penalty)
         penalty_applied = penalty
+    assignment.penalty_applied = penalty_applied
+    
+    record('cancellation', user.id, assignment.id, -penalty_applied)
+    emit('cancellation', {
+        'assignment_id': assignment.id,
+        'penalty_applied': penalty_applied,
+        'user_score': user.score
+    }, user_id=assignment.user_id)
     
     db.session.commit()
     
@@ -669,6 +953,8 @@ def create_proposal():
     )
     
     db.session.add(proposal)
+    db.session.flush()
+    record('proposal_created', user_id, proposal.id)
     db.session.commit()
     
     return jsonify(proposal.to_dict()), 201
@@ -729,12 +1015,15 @@ def review_proposal(proposal_id):
         db.session.flush()  # Para obtener el ID
         
         proposal.created_task_id = task.id
+        record('task_created', admin_id, task.id)
     
+    record('proposal_reviewed', proposal.user_id, proposal.id)
     db.session.commit()
     
     return jsonify(proposal.to_dict()), 200
 
 @tasks_bp.route('/assignments', methods=['GET'])
+@read_replica
 @admin_required
 def get_all_assignments():
     """
@@ -752,31 +1041,32 @@ def get_all_assignments():
     end_date = request.args.get('end_date')
     status = request.args.get('status')
     
-    query = TaskAssignment.query
-    
-    if user_id:
-        query = query.filter_by(user_id=user_id)
-    
-    if task_id:
-        query = query.filter_by(task_id=task_id)
-    
-    if start_date:
-        start = datetime.strptime(start_date, '%Y-%m-%d').date()
-        query = query.filter(TaskAssignment.assigned_date >= start)
-    
-    if end_date:
-        end = datetime.strptime(end_date, '%Y-%m-%d').date()
-        query = query.filter(TaskAssignment.assigned_date <= end)
-    
-    if status:
+    start = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else None
+    end = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else None
+    
+    def filters(model):
+        conditions = []
+        if user_id:
+            conditions.append(model.user_id == user_id)
+        if task_id:
+            conditions.append(model.task_id == task_id)
+        if start:
+            conditions.append(model.assigned_date >= start)
+        if end:
+            conditions.append(model.assigned_date <= end)
         if status == 'completed':
-            query = query.filter_by(is_completed=True)
+            conditions.append(model.is_completed.is_(True))
         elif status == 'cancelled':
-            query = query.filter_by(is_cancelled=True)
+            conditions.append(model.is_cancelled.is_(True))
         elif status == 'pending':
-            query = query.filter_by(is_completed=False, is_cancelled=False)
+            conditions.extend([model.is_completed.is_(False), model.is_cancelled.is_(False)])
+        return conditions
     
-    assignments = query.order_by(TaskAssignment.assigned_date.desc()).all()
+    # Las pendientes nunca se archivan
+    if status == 'pending':
+        assignments = TaskAssignment.query.filter(*filters(TaskAssignment)).order_by(TaskAssignment.assigned_date.desc()).all()
+    else:
+        assignments = with_archive(TaskAssignment, filters, 'assigned_date', since=start, descending=True)
     
     return jsonify([a.to_dict() for a in assignments]), 200
 
@@ -800,6 +1090,9 @@ def delete_assignment(assignment_id):
         db.session.delete(completion)
     
     db.session.delete(assignment)
+    # Las canceladas y las pendientes de días pasados cortan la racha
+    recompute_streak(assignment.user_id, assignment.task_id)
+    record('assignment_deleted', assignment.user_id, assignment.id)
     db.session.commit()
     
     return jsonify({'message': 'Assignment deleted successfully'}), 200
@@ -829,6 +1122,11 @@ def update_assignment(assignment_id):
         except ValueError:
             return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
     
+    # Una cancelada (o pendiente de un día pasado) que cambia de fecha corta
+    # la racha en otro punto
+    recompute_streak(assignment.user_id, assignment.task_id)
+    
+    record('assignment_updated', assignment.user_id, assignment.id)
     db.session.commit()
     
     return jsonify(assignment.to_dict()), 200
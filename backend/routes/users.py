@@ -1,6 +1,13 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, User
+from models import db, current_family_id, User
+from sqlalchemy import select
+from jobs import enqueue, job_handler
+from events import emit
+from outbox import record
+from archive import with_archive
+from leaderboard import METRICS, standings
+from replica import read_replica
 from functools import wraps
 
 users_bp = Blueprint('users', __name__)
@@ -33,6 +40,85 @@ def get_users():
     users = User.query.all()
     return jsonify([user.to_dict() for user in users]), 200
 
+@users_bp.route('/options', methods=['GET'])
+@read_replica
+@admin_required
+def get_user_options():
+    """
+    Lista ligera de usuarios para desplegables y filtros (solo admin)
+    Query params:
+        - role: user|admin (default user)
+    
+    Responde con ETag: el navegador guarda la lista y al revalidarla recibe
+    304 sin cuerpo si no ha cambiado (un usuario nuevo se ve al momento).
+    """
+    role = request.args.get('role', 'user')
+    rows = db.session.execute(
+        select(User.id, User.nick, User.figure, User.is_active)
+        .where(User.role == role)
+        .order_by(User.nick)
+    ).all()
+    
+    response = jsonify([
+        {'id': row.id, 'nick': row.nick, 'figure': row.figure, 'is_active': row.is_active}
+        for row in rows
+    ])
+    response.add_etag()
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@users_bp.route('/leaderboard', methods=['GET'])
+@read_replica
+@jwt_required()
+def get_leaderboard():
+    """
+    Clasificación de los hijos activos de la familia
+    Query params:
+        - by: score|weekly|streak - créditos actuales, ganados en los últimos 7 días
+              o racha actual más larga (default score)
+        - limit: número de puestos (default 10, máximo 100)
+        - user_id: usuario del que se devuelve la posición (admin; por defecto el actual)
+    Respuesta: {
+        "by": "score", "total": 4, "week_start": "...", "week_end": "...",
+        "leaders": [{"rank": 1, "user_id": 2, "nick": "...", "figure": "...", "value": 120}],
+        "me": {"user_id": 2, "rank": 1, "value": 120}    // null si no está en la clasificación
+    }
+    Se sirve de una clasificación en memoria que se actualiza con el outbox
+    (ver backend/leaderboard), no de una consulta por petición.
+    """
+    current_id = int(get_jwt_identity())
+    current_user = User.query.get(current_id)
+    if not current_user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    metric = request.args.get('by', 'score')
+    if metric not in METRICS:
+        return jsonify({'error': f'by must be one of: {", ".join(METRICS)}'}), 400
+    
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    target_id = request.args.get('user_id', type=int) if current_user.role == 'admin' else current_id
+    
+    board, leaders, position = standings(current_family_id(), metric, limit, target_id or current_id)
+    
+    return jsonify({
+        'by': metric,
+        'total': len(board.members),
+        'week_start': board.week_start().isoformat(),
+        'week_end': board.day.isoformat(),
+        'leaders': [
+            {
+                'rank': rank,
+                'user_id': uid,
+                'nick': board.members[uid][0],
+                'figure': board.members[uid][1],
+                'value': value
+            }
+            for rank, uid, value in leaders
+        ],
+        'me': {'user_id': target_id or current_id, 'rank': position[0], 'value': position[1]} if position else None
+    }), 200
+
 @users_bp.route('/<int:user_id>', methods=['GET'])
 @jwt_required()
 def get_user(user_id):
@@ -92,6 +178,8 @@ def create_user():
     user.set_access_code(data['icon_codes'])
     
     db.session.add(user)
+    db.session.flush()
+    record('user_updated', user.id, user.id)
     db.session.commit()
     
     return jsonify(user.to_dict()), 201
@@ -137,6 +225,7 @@ def update_user(user_id):
     if 'is_active' in data:
         user.is_active = data['is_active']
     
+    record('user_updated', user.id, user.id)
     db.session.commit()
     
     return jsonify(user.to_dict()), 200
@@ -150,6 +239,7 @@ def delete_user(user_id):
         return jsonify({'error': 'User not found'}), 404
     
     user.is_active = False
+    record('user_updated', user.id, user.id)
     db.session.commit()
     
     return jsonify({'message': 'User deactivated successfully'}), 200
@@ -163,6 +253,7 @@ def toggle_user_active(user_id):
         return jsonify({'error': 'User not found'}), 404
     
     user.is_active = not user.is_active
+    record('user_updated', user.id, user.id)
     db.session.commit()
     
     status = 'activado' if user.is_active else 'desactivado'
@@ -171,7 +262,30 @@ def toggle_user_active(user_id):
         'is_active': user.is_active
     }), 200
 
+def _build_user_history(user):
+    """Construye el historial completo de un usuario (compartido con el worker)"""
+    from models import TaskCompletion, RewardRedemption, Bonus
+    
+    # Tareas completadas (también las archivadas)
+    completions = with_archive(
+        TaskCompletion, lambda model: [model.user_id == user.id], 'completed_at', descending=True
+    )
+    
+    # Premios canjeados
+    redemptions = RewardRedemption.query.filter_by(user_id=user.id).order_by(RewardRedemption.redeemed_at.desc()).all()
+    
+    # Bonuses recibidos
+    bonuses = Bonus.query.filter_by(user_id=user.id).order_by(Bonus.created_at.desc()).all()
+    
+    return {
+        'user': user.to_dict(),
+        'task_completions': [c.to_dict() for c in completions],
+        'reward_redemptions': [r.to_dict() for r in redemptions],
+        'bonuses': [b.to_dict() for b in bonuses]
+    }
+
 @users_bp.route('/<int:user_id>/history', methods=['GET'])
+@read_replica
 @jwt_required()
 def get_user_history(user_id):
     """
@@ -180,6 +294,8 @@ def get_user_history(user_id):
     - Validaciones
     - Créditos ganados/perdidos
     - Premios canjeados
+    Query params:
+        - async: true para generarlo en segundo plano (responde 202 con el trabajo)
     """
     current_user_id = int(get_jwt_identity())
     current_user = User.query.get(current_user_id)
@@ -192,25 +308,26 @@ def get_user_history(user_id):
     if not user:
         return jsonify({'error': 'User not found'}), 404
     
-    from models import TaskCompletion, RewardRedemption, Bonus
-    
-    # Tareas completadas
-    completions = TaskCompletion.query.filter_by(user_id=user_id).order_by(TaskCompletion.completed_at.desc()).all()
-    
-    # Premios canjeados
-    redemptions = RewardRedemption.query.filter_by(user_id=user_id).order_by(RewardRedemption.redeemed_at.desc()).all()
+    if request.args.get('async', '').lower() in ('1', 'true'):
+        job = enqueue('user_history', {'user_id': user_id}, current_user_id)
+        return jsonify({
+            'message': 'History export queued',
+            'job': job.to_dict()
+        }), 202
     
-    # Bonuses recibidos
-    bonuses = Bonus.query.filter_by(user_id=user_id).order_by(Bonus.created_at.desc()).all()
+    return jsonify(_build_user_history(user)), 200
+
+@job_handler('user_history')
+def user_history_job(payload, job):
+    """Genera en segundo plano el historial completo de un usuario"""
+    user = User.query.get(payload['user_id'])
+    if not user:
+        return {'error': 'User not found'}, 404
     
-    return jsonify({
-        'user': user.to_dict(),
-        'task_completions': [c.to_dict() for c in completions],
-        'reward_redemptions': [r.to_dict() for r in redemptions],
-        'bonuses': [b.to_dict() for b in bonuses]
-    }), 200
+    return _build_user_history(user), 200
 
 @users_bp.route('/all-history', methods=['GET'])
+@read_replica
 @admin_required
 def get_all_users_history():
     """
@@ -233,10 +350,14 @@ def get_all_users_history():
             start_datetime = datetime.combine(target_date, datetime.min.time())
             end_datetime = datetime.combine(target_date, datetime.max.time())
             
-            completions = TaskCompletion.query.filter(
-                TaskCompletion.completed_at >= start_datetime,
-                TaskCompletion.completed_at <= end_datetime
-            ).order_by(TaskCompletion.completed_at.desc()).limit(limit).all()
+            completions = with_archive(
+                TaskCompletion,
+                lambda model: [model.completed_at >= start_datetime, model.completed_at <= end_datetime],
+                'completed_at',
+                since=start_datetime,
+                descending=True,
+                limit=limit
+            )
             
             redemptions = RewardRedemption.query.filter(
                 RewardRedemption.redeemed_at >= start_datetime,
@@ -251,7 +372,7 @@ def get_all_users_history():
             return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
     else:
         # Sin filtro de fecha, obtener los más recientes
-        completions = TaskCompletion.query.order_by(TaskCompletion.completed_at.desc()).limit(limit).all()
+        completions = with_archive(TaskCompletion, lambda model: [], 'completed_at', descending=True, limit=limit)
         redemptions = RewardRedemption.query.order_by(RewardRedemption.redeemed_at.desc()).limit(limit).all()
         bonuses = Bonus.query.order_by(Bonus.created_at.desc()).limit(limit).all()
     
@@ -308,6 +429,15 @@ def assign_bonus_credits(user_id):
         user.subtract_credits(abs(credits))
     
     db.session.add(bonus)
+    db.session.flush()
+    
+    record('bonus', user_id, bonus.id, credits)
+    emit('bonus', {
+        'bonus_id': bonus.id,
+        'credits': credits,
+        'user_score': user.score
+    }, user_id=user_id)
+    
     db.session.commit()
     
     return jsonify({
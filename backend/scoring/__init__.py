@@ -0,0 +1,139 @@
+"""
+Reglas de puntuación por familia.
+
+Las reglas se guardan como JSON en families.scoring_rules (NULL = las de
+siempre) con un número de versión que sube en cada cambio:
+
+    {
+        "tiers": {"1": 10, "2": 60, "3": 100},       // % del base_value por puntuación
+        "penalties": {"obligatory": 100, "special": 0, "proposed": 0},  // % al cancelar
+        "streak_bonus": [{"min_streak": 7, "percent": 150}],  // % según la racha
+        "weekend_percent": 100                         // % si la asignación cae en sábado o domingo
+    }
+
+`compile_rules()` las valida y las convierte en tablas (puntuación, tipo de
+tarea, racha y día de la semana -> porcentaje), así cada validación o
+cancelación es una multiplicación sin volver a leer el JSON. `rules_for()`
+guarda las compiladas por (familia, versión) en memoria del proceso: la
+validación individual, la masiva y las cancelaciones usan las mismas. La
+caché se comparte entre hilos (o greenlets): se toca con `_compiled_lock`
+y las consultas a la base van fuera de él.
+"""
+import json
+import threading
+from sqlalchemy import select
+from models import db, Family, TaskType
+
+DEFAULT_RULES = {
+    'tiers': {'1': 10, '2': 60, '3': 100},
+    'penalties': {TaskType.OBLIGATORY.value: 100, TaskType.SPECIAL.value: 0, TaskType.PROPOSED.value: 0},
+    'streak_bonus': [],
+    'weekend_percent': 100,
+}
+
+SCORES = (1, 2, 3)
+
+WEEKEND = (5, 6)
+
+# Límites para que un error al escribir las reglas no dispare los créditos
+MAX_PERCENT = 1000
+MAX_STREAK = 365
+
+def _percent(value, name):
+    if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= MAX_PERCENT:
+        raise ValueError(f'{name} must be an integer percent between 0 and {MAX_PERCENT}')
+    return value
+
+class ScoringRules:
+    """Reglas compiladas: tablas de porcentajes indexadas por puntuación, racha y día"""
+
+    def __init__(self, tiers, penalties, streak_table, weekday_table):
+        self._tiers = tiers                # puntuación (0-3) -> %
+        self._penalties = penalties        # TaskType -> %
+        self._streaks = streak_table       # racha (hasta el último umbral) -> %
+        self._weekdays = weekday_table     # weekday() -> %
+        self.uses_streak = any(p != 100 for p in streak_table)
+
+    def credits(self, base_value, score, streak=0, day=None):
+        """Créditos de una validación (streak: racha con esta tarea; day: fecha de la asignación)"""
+        streak_percent = self._streaks[min(streak, len(self._streaks) - 1)]
+        day_percent = self._weekdays[day.weekday()] if day else 100
+        return base_value * self._tiers[score] * streak_percent * day_percent // 1000000
+
+    def penalty(self, task_type, base_value):
+        """Créditos que se restan al cancelar una tarea de este tipo"""
+        return base_value * self._penalties.get(TaskType(task_type), 0) // 100
+
+def compile_rules(rules):
+    """
+    Valida unas reglas (dict; None = DEFAULT_RULES; las claves que falten
+    toman el valor por defecto) y las compila. ValueError si no son válidas.
+    """
+    merged = dict(DEFAULT_RULES, **(rules or {}))
+    unknown = set(merged) - set(DEFAULT_RULES)
+    if unknown:
+        raise ValueError(f'Unknown rules: {", ".join(sorted(unknown))}')
+
+    tiers = merged['tiers']
+    if not isinstance(tiers, dict) or sorted(tiers) != [str(s) for s in SCORES]:
+        raise ValueError('tiers must have a percent for scores 1, 2 and 3')
+    tier_table = (0,) + tuple(_percent(tiers[str(s)], f'tiers.{s}') for s in SCORES)
+
+    penalties = merged['penalties']
+    if not isinstance(penalties, dict):
+        raise ValueError('penalties must map task types to percents')
+    task_types = {t.value: t for t in TaskType}
+    penalty_table = {}
+    for name, value in penalties.items():
+        if name not in task_types:
+            raise ValueError(f'penalties: unknown task type {name}')
+        penalty_table[task_types[name]] = _percent(value, f'penalties.{name}')
+
+    bonus = merged['streak_bonus']
+    if not isinstance(bonus, list):
+        raise ValueError('streak_bonus must be a list of {min_streak, percent}')
+    thresholds = {}
+    for step in bonus:
+        min_streak = step.get('min_streak') if isinstance(step, dict) else None
+        if not isinstance(min_streak, int) or not 1 <= min_streak <= MAX_STREAK:
+            raise ValueError(f'streak_bonus.min_streak must be between 1 and {MAX_STREAK}')
+        thresholds[min_streak] = _percent(step.get('percent'), 'streak_bonus.percent')
+    # Tabla racha -> %: cada posición toma el umbral más alto que alcanza
+    streak_table = [100] * (max(thresholds, default=0) + 1)
+    for min_streak in sorted(thresholds):
+        for length in range(min_streak, len(streak_table)):
+            streak_table[length] = thresholds[min_streak]
+
+    weekend = _percent(merged['weekend_percent'], 'weekend_percent')
+    weekday_table = tuple(weekend if day in WEEKEND else 100 for day in range(7))
+
+    return ScoringRules(tier_table, penalty_table, tuple(streak_table), weekday_table)
+
+DEFAULT_COMPILED = compile_rules(None)
+
+# (family_id, versión) -> ScoringRules
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+def rules_for(family_id):
+    """Reglas compiladas de la familia (None: las de por defecto)"""
+    if family_id is None:
+        return DEFAULT_COMPILED
+
+    version = db.session.execute(select(Family.scoring_version).where(Family.id == family_id)).scalar()
+    key = (family_id, version)
+    with _compiled_lock:
+        rules = _compiled.get(key)
+    if rules is not None:
+        return rules
+
+    raw = db.session.execute(select(Family.scoring_rules).where(Family.id == family_id)).scalar()
+    rules = compile_rules(json.loads(raw) if raw else None)
+    with _compiled_lock:
+        # Solo se guarda la versión vigente de cada familia
+        versions = [k for k in _compiled if k[0] == family_id]
+        if all(old < key for old in versions):
+            for old in versions:
+                del _compiled[old]
+            _compiled[key] = rules
+    return rules
@@ -0,0 +1,273 @@
+"""
+Resúmenes para las estadísticas (/api/stats).
+
+stats_user_daily (usuario, día) y stats_task_weekly (tarea, semana) se
+mantienen en la misma transacción que cada escritura, con un listener
+before_flush que suma la diferencia:
+
+- Contadores de tareas (asignadas, completadas, canceladas, validadas y
+  puntuaciones) a partir de los cambios en TaskAssignment y TaskCompletion,
+  en el día de la asignación. Cubre cualquier escritura ORM, también las
+  asignaciones masivas, los cambios de fecha y los borrados.
+- Flujo de créditos, en el día UTC en que se mueve, de las mismas filas que
+  lee `rebuild()`: ganados de TaskCompletion (credits_awarded en el día de
+  validated_at) y penalizaciones de TaskAssignment (penalty_applied en el
+  día de cancelled_at). Un reset quita el flujo del día original, igual que
+  al recalcular, en vez de restarlo el día del reset. Bonus y gastados salen
+  de los eventos 'bonus' y 'redemption_approved' del outbox: los canjes
+  masivos se cierran con UPDATE fuera del ORM.
+
+Los UPDATE masivos (fuera del ORM) no pasan por aquí: `rebuild()` recalcula
+un rango desde las tablas de origen, incluido el archivo (worker: trabajo 'stats_rebuild', o
+python rebuild_stats.py).
+"""
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+from models import (
+    db, current_family_id, ArchivedAssignment, ArchivedCompletion, Bonus, OutboxEvent, RewardRedemption, StatsTaskWeekly, StatsUserDaily,
+    TaskAssignment, TaskCompletion
+)
+
+ASSIGNMENT_FIELDS = (
+    'family_id', 'user_id', 'task_id', 'assigned_date', 'is_completed', 'is_cancelled',
+    'cancelled_at', 'penalty_applied'
+)
+COMPLETION_FIELDS = ('family_id', 'user_id', 'validation_score', 'validated_at', 'credits_awarded')
+
+# Tablas de origen para rebuild(): las vivas y el archivo (archive/)
+SOURCES = (
+    (TaskAssignment, TaskCompletion),
+    (ArchivedAssignment, ArchivedCompletion),
+)
+
+USER_DAY_KEY = ('family_id', 'user_id', 'day')
+TASK_WEEK_KEY = ('family_id', 'task_id', 'week')
+
+def week_start(day):
+    """Lunes de la semana de `day`"""
+    return day - timedelta(days=day.weekday())
+
+def _assignment_counts(values):
+    completed = bool(values['is_completed'])
+    return {
+        'assigned': 1,
+        'completed': int(completed),
+        'cancelled': int(bool(values['is_cancelled']) and not completed)
+    }
+
+def _completion_counts(values):
+    score = values['validation_score']
+    if score is None:
+        return {}
+    counts = {'validated': 1, 'credits_awarded': values['credits_awarded'] or 0}
+    if score in (1, 2, 3):
+        counts[f'score_{score}'] = 1
+    return counts
+
+def _penalty_flow(values):
+    """(family_id, user_id, task_id, día, columnas) de la penalización de una asignación"""
+    day = values['cancelled_at'].date() if values['is_cancelled'] and values['cancelled_at'] else None
+    return values['family_id'], values['user_id'], None, day, {'credits_penalty': values['penalty_applied'] or 0}
+
+def _earned_flow(values):
+    """(family_id, user_id, task_id, día, columnas) de los créditos de una validación"""
+    day = values['validated_at'].date() if values['validated_at'] else None
+    return values['family_id'], values['user_id'], None, day, {'credits_earned': values['credits_awarded'] or 0}
+
+def _credit_flow(event_type, delta):
+    """Evento del outbox -> columnas de flujo de créditos (bonus y canjes)"""
+    if event_type == 'bonus':
+        return {'credits_bonus': delta}
+    if event_type == 'redemption_approved':
+        return {'credits_spent': -delta}
+    return {}
+
+class Rollup:
+    """Diferencias acumuladas por fila de resumen antes de escribirlas"""
+
+    def __init__(self):
+        self.user_days = defaultdict(Counter)
+        self.task_weeks = defaultdict(Counter)
+
+    def add(self, family_id, user_id, task_id, day, counts, times=1):
+        if not counts or day is None:
+            return
+        family_id = family_id or current_family_id()
+        for name, value in counts.items():
+            if name in StatsUserDaily.COLUMNS and user_id is not None:
+                self.user_days[(family_id, user_id, day)][name] += value * times
+            if name in StatsTaskWeekly.COLUMNS and task_id is not None:
+                self.task_weeks[(family_id, task_id, week_start(day))][name] += value * times
+
+    def write(self, session):
+        _increment(session, StatsUserDaily, USER_DAY_KEY, self.user_days)
+        _increment(session, StatsTaskWeekly, TASK_WEEK_KEY, self.task_weeks)
+
+def _increment(session, model, key_names, changes):
+    """Suma las diferencias con un único upsert (executemany) por tabla"""
+    rows = [
+        dict(zip(key_names, key), **{name: counts.get(name, 0) for name in model.COLUMNS})
+        for key, counts in changes.items() if any(counts.values())
+    ]
+    if not rows:
+        return
+
+    connection = session.connection(bind_arguments={'mapper': inspect(model)})
+    table = model.__table__
+    if connection.dialect.name in ('mysql', 'mariadb'):
+        stmt = mysql.insert(table)
+        stmt = stmt.on_duplicate_key_update({name: table.c[name] + stmt.inserted[name] for name in model.COLUMNS})
+    else:
+        stmt = (postgresql.insert if connection.dialect.name == 'postgresql' else sqlite.insert)(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_names),
+            set_={name: table.c[name] + stmt.excluded[name] for name in model.COLUMNS}
+        )
+    connection.execute(stmt, rows)
+
+def _before_and_after(obj, fields):
+    """Valores de los campos antes y después de los cambios pendientes del objeto"""
+    state = inspect(obj)
+    before, after = {}, {}
+    for name in fields:
+        if state.persistent and name not in state.dict:
+            getattr(obj, name)  # atributo expirado: cargarlo
+        history = state.attrs[name].history
+        after[name] = (history.added or history.unchanged or [None])[0]
+        before[name] = (history.deleted or history.unchanged or [after[name]])[0]
+    return before, after
+
+def _has_changes(obj, fields):
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in fields)
+
+def _assignment_key(values):
+    return values['family_id'], values['user_id'], values['task_id'], values['assigned_date']
+
+def _changed(session):
+    for obj in session.new:
+        yield obj, True, False
+    for obj in session.dirty:
+        yield obj, False, False
+    for obj in session.deleted:
+        yield obj, False, True
+
+@event.listens_for(Session, 'before_flush')
+def _update_rollups(session, flush_context, instances):
+    rollup = Rollup()
+    with session.no_autoflush:
+        for obj, is_new, is_deleted in _changed(session):
+            if isinstance(obj, TaskAssignment):
+                if not (is_new or is_deleted or _has_changes(obj, ASSIGNMENT_FIELDS)):
+                    continue
+                before, after = _before_and_after(obj, ASSIGNMENT_FIELDS)
+                if not is_new:
+                    rollup.add(*_assignment_key(before), _assignment_counts(before), times=-1)
+                    rollup.add(*_penalty_flow(before), times=-1)
+                if not is_deleted:
+                    rollup.add(*_assignment_key(after), _assignment_counts(after))
+                    rollup.add(*_penalty_flow(after))
+
+            elif isinstance(obj, TaskCompletion):
+                if not (is_new or is_deleted or _has_changes(obj, COMPLETION_FIELDS)):
+                    continue
+                assignment = obj.assignment or session.get(TaskAssignment, obj.assignment_id)
+                if assignment is None:
+                    continue
+                key = (assignment.family_id, assignment.user_id, assignment.task_id, assignment.assigned_date)
+                before, after = _before_and_after(obj, COMPLETION_FIELDS)
+                if not is_new:
+                    rollup.add(*key, _completion_counts(before), times=-1)
+                    rollup.add(*_earned_flow(before), times=-1)
+                if not is_deleted:
+                    rollup.add(*key, _completion_counts(after))
+                    rollup.add(*_earned_flow(after))
+
+            elif isinstance(obj, OutboxEvent) and is_new:
+                flow = _credit_flow(obj.event_type, obj.delta or 0)
+                rollup.add(obj.family_id, obj.user_id, None, datetime.utcnow().date(), flow)
+
+    rollup.write(session)
+
+def _as_date(value):
+    # func.date() devuelve texto en SQLite
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+def _daily_sum(family_id, user_id, moment, amount, start, end):
+    """SUM(amount) por familia, usuario y día de `moment` dentro de start..end"""
+    day = func.date(moment)
+    return select(family_id, user_id, day, func.sum(amount)).where(
+        moment >= datetime.combine(start, datetime.min.time()),
+        moment < datetime.combine(end + timedelta(days=1), datetime.min.time())
+    ).group_by(family_id, user_id, day)
+
+def rebuild(start, end):
+    """
+    Recalcula los resúmenes de start..end (ampliado a semanas completas) desde
+    las tablas de origen. Sin familia en el contexto recorre todas las del
+    shard. No hace commit. Retorna (filas usuario-día, filas tarea-semana).
+    """
+    start, end = week_start(start), week_start(end) + timedelta(days=6)
+    session = db.session
+
+    session.execute(
+        delete(StatsUserDaily).where(StatsUserDaily.day.between(start, end))
+        .execution_options(synchronize_session=False)
+    )
+    session.execute(
+        delete(StatsTaskWeekly).where(StatsTaskWeekly.week.between(start, end))
+        .execution_options(synchronize_session=False)
+    )
+
+    rollup = Rollup()
+
+    # Tareas (vivas y archivadas), agrupadas por todo lo que decide sus contadores
+    for assignment, completion in SOURCES:
+        grouping = (
+            assignment.family_id, assignment.user_id, assignment.task_id, assignment.assigned_date,
+            assignment.is_completed, assignment.is_cancelled,
+            completion.validation_score, completion.credits_awarded
+        )
+        for row in session.execute(
+            select(*grouping, func.count(assignment.id).label('times'))
+            .outerjoin(completion, completion.assignment_id == assignment.id)
+            .where(assignment.assigned_date.between(start, end))
+            .group_by(*grouping)
+        ):
+            values = row._mapping
+            key = _assignment_key(values)
+            rollup.add(*key, _assignment_counts(values), times=row.times)
+            rollup.add(*key, _completion_counts(values), times=row.times)
+
+    # Flujo de créditos por día en que se movieron
+    flows = [
+        flow
+        for assignment, completion in SOURCES
+        for flow in (
+            ('credits_earned', _daily_sum(
+                completion.family_id, completion.user_id, completion.validated_at,
+                completion.credits_awarded, start, end
+            )),
+            ('credits_penalty', _daily_sum(
+                assignment.family_id, assignment.user_id, assignment.cancelled_at,
+                assignment.penalty_applied, start, end
+            ).where(assignment.is_cancelled.is_(True))),
+        )
+    ] + [
+        ('credits_bonus', _daily_sum(
+            Bonus.family_id, Bonus.user_id, Bonus.created_at, Bonus.credits, start, end
+        )),
+        ('credits_spent', _daily_sum(
+            RewardRedemption.family_id, RewardRedemption.user_id, RewardRedemption.approved_at,
+            RewardRedemption.credits_spent, start, end
+        ).where(RewardRedemption.status == 'approved')),
+    ]
+    for column, query in flows:
+        for family_id, user_id, day, total in session.execute(query):
+            rollup.add(family_id, user_id, None, _as_date(day), {column: int(total or 0)})
+
+    rollup.write(session)
+    return len(rollup.user_days), len(rollup.task_weeks)
@@ -0,0 +1,193 @@
+"""
+Rachas por (usuario, tarea) en task_streaks.
+
+Las asignaciones de un usuario en una tarea, en orden de fecha, forman la
+racha: cada una completada suma 1 y cada cancelada (o validada con menos de
+STREAK_MIN_SCORE) la corta. Las pendientes de hoy en adelante no cuentan ni
+cortan; las de días anteriores que siguen sin resolver cortan (el día se
+saltó). `longest` es la racha más larga alcanzada.
+
+Las rutas de tareas mantienen la fila al día:
+- completar / cancelar: `advance_streak()`, O(1) cuando la asignación es posterior
+  a la última resuelta (el caso normal: la tarea de hoy).
+- validar con puntuación baja, resetear, cambios de asignaciones antiguas:
+  `recompute_streak()` recorre solo las asignaciones de ese usuario y tarea.
+
+Un día sin resolver corta la racha solo con el paso del tiempo, sin que
+ninguna ruta escriba la fila, así que `current` puede quedarse atrás. Quien
+lee la racha actual usa `current_on(hoy)`, que vale 0 si después de
+`last_date` queda alguna asignación pendiente de un día anterior a hoy.
+
+`rebuild()` recalcula todas las rachas en una sola pasada ordenada por
+usuario, tarea y fecha (python rebuild_streaks.py o trabajo 'streaks_rebuild').
+Incluye las asignaciones archivadas.
+"""
+from datetime import datetime
+from itertools import groupby
+from sqlalchemy import case, delete, insert, select, union_all
+from models import db, ArchivedAssignment, ArchivedCompletion, TaskAssignment, TaskCompletion, TaskStreak
+
+# Puntuación mínima de validación para que una tarea completada cuente
+STREAK_MIN_SCORE = 2
+
+SOURCES = (
+    (TaskAssignment, TaskCompletion),
+    (ArchivedAssignment, ArchivedCompletion),
+)
+
+def keeps_streak(validation_score):
+    """¿Una tarea completada con esta validación (None: sin validar) mantiene la racha?"""
+    return validation_score is None or validation_score >= STREAK_MIN_SCORE
+
+def _outcome(is_completed, is_cancelled, validation_score, assigned_date, today):
+    """True: suma; False: corta (también pendiente de un día pasado); None: pendiente"""
+    if is_completed:
+        return keeps_streak(validation_score)
+    if is_cancelled or assigned_date < today:
+        return False
+    return None
+
+def _pending():
+    """Condiciones de una asignación sin completar ni cancelar"""
+    return (TaskAssignment.is_completed.is_(False), TaskAssignment.is_cancelled.is_(False))
+
+def current_on(today):
+    """
+    Expresión SQL de la racha actual de TaskStreak a fecha `today`: 0 si
+    quedó alguna asignación sin resolver entre last_date y ayer. Las
+    pendientes no se archivan, basta con mirar task_assignments.
+    """
+    missed = select(TaskAssignment.id).where(
+        TaskAssignment.family_id == TaskStreak.family_id,
+        TaskAssignment.user_id == TaskStreak.user_id,
+        TaskAssignment.task_id == TaskStreak.task_id,
+        TaskAssignment.assigned_date > TaskStreak.last_date,
+        TaskAssignment.assigned_date < today,
+        *_pending()
+    ).exists()
+    return case((missed, 0), else_=TaskStreak.current)
+
+def with_current(rows):
+    """to_dict() de filas (TaskStreak, current_on(...)) con la racha actual leída"""
+    return [dict(streak.to_dict(), current=current) for streak, current in rows]
+
+def _walk(rows):
+    """(current, longest, last_date) de filas (fecha, resultado) en orden de fecha"""
+    current = longest = 0
+    last_date = None
+    for day, outcome in rows:
+        if outcome is None:
+            continue
+        current = current + 1 if outcome else 0
+        longest = max(longest, current)
+        last_date = day
+    return current, longest, last_date
+
+def _history(condition=None):
+    """
+    Asignaciones vivas y archivadas (family_id, user_id, task_id,
+    assigned_date, is_completed, is_cancelled, validation_score) en orden
+    de familia, usuario, tarea y fecha. condition(modelo) filtra cada tabla.
+    """
+    history = union_all(*[
+        select(
+            assignment.family_id, assignment.user_id, assignment.task_id, assignment.assigned_date,
+            assignment.is_completed, assignment.is_cancelled, completion.validation_score
+        )
+        .outerjoin(completion, completion.assignment_id == assignment.id)
+        .where(*(condition(assignment) if condition else ()))
+        for assignment, completion in SOURCES
+    ]).subquery()
+    return select(history).order_by(
+        history.c.family_id, history.c.user_id, history.c.task_id, history.c.assigned_date
+    )
+
+def _outcomes(rows, today):
+    return (
+        (row.assigned_date, _outcome(row.is_completed, row.is_cancelled, row.validation_score, row.assigned_date, today))
+        for row in rows
+    )
+
+def _find(user_id, task_id):
+    return TaskStreak.query.filter_by(user_id=user_id, task_id=task_id).with_for_update().first()
+
+def recompute_streak(user_id, task_id):
+    """Recalcula la racha de un usuario en una tarea desde sus asignaciones (no hace commit)"""
+    current, longest, last_date = _walk(_outcomes(db.session.execute(
+        _history(lambda model: (model.user_id == user_id, model.task_id == task_id))
+    ), datetime.now().date()))
+
+    streak = _find(user_id, task_id)
+    if last_date is None:
+        if streak:
+            db.session.delete(streak)
+        return None
+    if not streak:
+        streak = TaskStreak(user_id=user_id, task_id=task_id)
+        db.session.add(streak)
+    streak.current, streak.longest, streak.last_date = current, longest, last_date
+    return streak
+
+def advance_streak(assignment, completed):
+    """
+    La asignación se acaba de completar (completed=True) o cancelar. Si es
+    posterior a la última resuelta se suma o corta en O(1), empezando de 0 si
+    entre medias quedó un día pasado sin resolver; si no, recompute_streak().
+    """
+    streak = _find(assignment.user_id, assignment.task_id)
+    if not streak or streak.last_date is None or assignment.assigned_date <= streak.last_date:
+        return recompute_streak(assignment.user_id, assignment.task_id)
+
+    today = datetime.now().date()
+    missed = db.session.execute(select(TaskAssignment.id).where(
+        TaskAssignment.user_id == assignment.user_id,
+        TaskAssignment.task_id == assignment.task_id,
+        TaskAssignment.assigned_date > streak.last_date,
+        TaskAssignment.assigned_date < min(assignment.assigned_date, today),
+        *_pending()
+    ).limit(1)).first()
+    current = 0 if missed else streak.current
+    streak.current = current + 1 if completed else 0
+    streak.longest = max(streak.longest, streak.current)
+    streak.last_date = assignment.assigned_date
+    return streak
+
+def current_streaks(pairs):
+    """{(user_id, task_id): racha actual a hoy} de los pares indicados (una consulta)"""
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    rows = db.session.execute(
+        select(TaskStreak.user_id, TaskStreak.task_id, current_on(datetime.now().date())).where(
+            TaskStreak.user_id.in_({user_id for user_id, _ in pairs}),
+            TaskStreak.task_id.in_({task_id for _, task_id in pairs})
+        )
+    )
+    return {(user_id, task_id): current for user_id, task_id, current in rows if (user_id, task_id) in pairs}
+
+def rebuild(batch_size=1000):
+    """
+    Recalcula todas las rachas (de la familia del contexto o, sin familia, del
+    shard): una sola pasada, con cursor del servidor, por las asignaciones
+    vivas y archivadas ordenadas por usuario, tarea y fecha. No hace commit.
+    Retorna el número de rachas escritas.
+    """
+    db.session.execute(delete(TaskStreak).execution_options(synchronize_session=False))
+
+    result = db.session.execute(_history().execution_options(stream_results=True, yield_per=batch_size))
+    today = datetime.now().date()
+
+    # Una fila por usuario y tarea; se insertan al terminar de leer, el
+    # cursor del servidor no admite otras consultas mientras está abierto
+    streaks = []
+    for (family_id, user_id, task_id), rows in groupby(result, key=lambda row: tuple(row[:3])):
+        current, longest, last_date = _walk(_outcomes(rows, today))
+        if last_date is not None:
+            streaks.append({
+                'family_id': family_id, 'user_id': user_id, 'task_id': task_id,
+                'current': current, 'longest': longest, 'last_date': last_date
+            })
+
+    for start in range(0, len(streaks), batch_size):
+        db.session.execute(insert(TaskStreak), streaks[start:start + batch_size])
+    return len(streaks)
@@ -0,0 +1,125 @@
+"""
+Aislamiento por familia (multi-tenant) y reparto opcional en shards.
+
+- La familia actual sale del claim `family_id` del JWT (o, para tokens
+  antiguos, del usuario) y se guarda en g.family_id al empezar la petición.
+  Solo se lee el token de las cabeceras; las vistas que lo aceptan en otro
+  sitio (SSE, ?token=) llaman a `set_token_family()` tras verificarlo.
+  El worker la fija con `family_context()` para cada trabajo.
+- Todas las consultas ORM sobre modelos con TenantMixin reciben
+  `family_id = <familia actual>` mediante el evento do_orm_execute, así un
+  admin solo ve sus usuarios, tareas y premios. Sin familia (login, iconos,
+  scripts) no se filtra. Para consultar todas las familias a propósito:
+  `.execution_options(all_families=True)`.
+- FAMILY_SHARDS define bases adicionales ('nombre=url,...'); una familia con
+  `shard` asignado lee y escribe sus tablas en esa base (ver RoutingSession).
+  La tabla families vive en la base principal (y una copia de la fila en el
+  shard, por la clave foránea); cada shard tiene su propia cola de trabajos.
+"""
+from contextlib import contextmanager
+from flask import current_app, g, has_app_context, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, with_loader_criteria
+from models import db, Family, TenantMixin, User
+
+SHARD_PREFIX = 'shard:'
+
+def shard_bind_key(shard):
+    return f'{SHARD_PREFIX}{shard}' if shard else None
+
+@event.listens_for(Session, 'do_orm_execute')
+def _add_family_filter(execute_state):
+    if execute_state.is_column_load or execute_state.execution_options.get('all_families'):
+        return
+    family_id = g.get('family_id') if has_app_context() else None
+    if family_id is None:
+        return
+    execute_state.statement = execute_state.statement.options(
+        with_loader_criteria(TenantMixin, lambda cls: cls.family_id == family_id, include_aliases=True)
+    )
+
+# family_id -> bind del shard. Mover una familia de shard requiere reiniciar.
+_shard_cache = {}
+
+def shard_for(family_id):
+    """Bind donde viven los datos de la familia (None = base principal)"""
+    if family_id is None or not current_app.config.get('FAMILY_SHARDS'):
+        return None
+    if family_id not in _shard_cache:
+        shard = db.session.execute(select(Family.shard).where(Family.id == family_id)).scalar()
+        _shard_cache[family_id] = shard_bind_key(shard)
+    return _shard_cache[family_id]
+
+def set_family(family_id):
+    """Fija la familia actual y el shard donde viven sus datos"""
+    g.db_shard = shard_for(family_id)
+    g.family_id = family_id
+
+def set_shard(shard):
+    """Fija solo el shard (worker dedicado a un shard, sin familia concreta)"""
+    g.db_shard = shard_bind_key(shard)
+    g.family_id = None
+
+@contextmanager
+def family_context(family_id):
+    """Ejecuta un bloque (script, trabajo) dentro de una familia"""
+    previous = (g.get('family_id'), g.get('db_shard'))
+    set_family(family_id)
+    try:
+        yield
+    finally:
+        g.family_id, g.db_shard = previous
+
+def _family_from_claims(claims):
+    if 'family_id' in claims:
+        return claims['family_id']
+
+    # Tokens emitidos antes de existir las familias
+    return db.session.execute(
+        select(User.family_id).where(User.id == int(claims['sub'])).execution_options(all_families=True)
+    ).scalar()
+
+def _family_from_request():
+    try:
+        if verify_jwt_in_request(optional=True, locations=['headers']) is None:
+            return None
+    except (JWTExtendedException, PyJWTError):
+        # La vista con @jwt_required devolverá el error correspondiente
+        return None
+    return _family_from_claims(get_jwt())
+
+def set_token_family():
+    """Fija la familia del JWT que la vista ya verificó (token fuera de las cabeceras)"""
+    set_family(_family_from_claims(get_jwt()))
+
+def family_for_login(login_code):
+    """
+    Familia de un código de familia (None si no existe). Sin código solo se
+    admite una instalación con una única familia.
+    """
+    if login_code:
+        return Family.query.filter_by(login_code=str(login_code).strip().upper()).first()
+    families = Family.query.order_by(Family.id).limit(2).all()
+    return families[0] if len(families) == 1 else None
+
+def _set_request_family():
+    if request.method == 'OPTIONS':
+        return
+    set_family(_family_from_request())
+
+def create_shard_tables():
+    """Crea las tablas que falten en cada shard configurado (requiere app context)"""
+    for bind_key, engine in db.engines.items():
+        if bind_key and bind_key.startswith(SHARD_PREFIX):
+            db.metadata.create_all(engine)
+
+def access_token_claims(user):
+    """Claims adicionales del JWT para un usuario"""
+    return {'family_id': user.family_id}
+
+def init_app(app):
+    """Registra el hook que fija la familia de cada petición"""
+    app.before_request(_set_request_family)
@@ -0,0 +1,75 @@
+"""
+Fixtures de los tests: la app con bases SQLite temporales.
+Ejecutar desde backend/: python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from app import create_app
+from config import Config, config
+from models import db, Family, Task, TaskFrequency, TaskType, User
+from tenancy import access_token_claims, family_context
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Crea la app con la base principal en tmp_path y los ajustes indicados"""
+    def factory(**settings):
+        class TestConfig(Config):
+            TESTING = True
+            JWT_SECRET_KEY = 'test-jwt-secret-key-long-enough-for-hs256'
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "primary.db"}'
+            SQLALCHEMY_BINDS = {}
+            FAMILY_SHARDS = {}
+            METRICS_ENABLED = False
+            EVENTS_BACKEND = 'memory'
+            EXPORT_DIR = str(tmp_path / 'exports')
+            PROFILING_DIR = str(tmp_path / 'profiles')
+        for name, value in settings.items():
+            setattr(TestConfig, name, value)
+        config['test'] = TestConfig
+        return create_app('test')
+    return factory
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+def auth_headers(user):
+    token = create_access_token(identity=str(user.id), additional_claims=access_token_claims(user))
+    return {'Authorization': f'Bearer {token}'}
+
+def create_family(app, name, admin_code, kid_code):
+    """
+    Crea una familia con un admin, un hijo y una tarea. Retorna un dict con
+    los ids y las cabeceras de autenticación del admin y del hijo.
+    """
+    with app.app_context():
+        family = Family(name=name)
+        db.session.add(family)
+        db.session.commit()
+        with family_context(family.id):
+            admin = User(nick=f'{name}-admin', figure='star', role='admin', score=0)
+            admin.set_access_code(admin_code)
+            kid = User(nick=f'{name}-kid', figure='moon', role='user', score=100)
+            kid.set_access_code(kid_code)
+            db.session.add_all([admin, kid])
+            db.session.commit()
+            task = Task(
+                title=f'{name} task', task_type=TaskType.OBLIGATORY, frequency=TaskFrequency.DAILY,
+                base_value=10, created_by_id=admin.id
+            )
+            db.session.add(task)
+            db.session.commit()
+            return {
+                'family_id': family.id,
+                'admin_id': admin.id,
+                'kid_id': kid.id,
+                'task_id': task.id,
+                'admin_headers': auth_headers(admin),
+                'kid_headers': auth_headers(kid),
+            }
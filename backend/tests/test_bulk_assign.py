@@ -0,0 +1,33 @@
+"""Asignación masiva: skip_existing y conflictos con asignaciones existentes"""
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import create_family
+
+@pytest.fixture
+def family(app):
+    return create_family(app, 'bulk', [1, 2, 3, 4], [5, 6, 7, 8])
+
+def bulk_assign(client, family, **fields):
+    today = date.today()
+    return client.post('/api/tasks/assign/bulk', headers=family['admin_headers'], json={
+        'task_id': family['task_id'], 'user_ids': [family['kid_id']], 'frequency': 'daily',
+        'start_date': today.isoformat(), 'end_date': (today + timedelta(days=3)).isoformat(), **fields
+    })
+
+@pytest.mark.parametrize('skip_existing, created, skipped', [(True, 2, 2), (False, 4, 0)])
+def test_skip_existing_counts(app, family, skip_existing, created, skipped):
+    client = app.test_client()
+    first = bulk_assign(client, family, end_date=(date.today() + timedelta(days=1)).isoformat())
+    assert first.get_json()['counts']['created'] == 2
+
+    response = bulk_assign(client, family, skip_existing=skip_existing)
+    assert response.status_code == 201
+    assert response.get_json()['counts'] == {'requested': 4, 'created': created, 'conflicts': 2, 'skipped': skipped}
+
+@pytest.mark.parametrize('skip_existing', ['false', 0, 1, None, []])
+def test_skip_existing_must_be_boolean(app, family, skip_existing):
+    response = bulk_assign(app.test_client(), family, skip_existing=skip_existing)
+    assert response.status_code == 400
+    assert bulk_assign(app.test_client(), family, dry_run=True).get_json()['counts']['conflicts'] == 0
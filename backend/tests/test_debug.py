@@ -0,0 +1,31 @@
+"""/api/debug: lo que afecta a todo el proceso es solo para el operador"""
+import pytest
+
+from conftest import create_family
+
+PROCESS_WIDE = [
+    ('get', '/api/debug/queries'),
+    ('delete', '/api/debug/queries'),
+    ('get', '/api/debug/profiling'),
+    ('put', '/api/debug/profiling'),
+    ('get', '/api/debug/profiles'),
+    ('get', '/api/debug/profiles/missing.txt'),
+]
+
+@pytest.mark.parametrize('method, path', PROCESS_WIDE)
+def test_family_admin_cannot_use_process_wide_endpoints(make_app, method, path):
+    for app in (make_app(), make_app(DEBUG_TOKEN='operator-secret')):
+        family = create_family(app, 'debug', [1, 2, 3, 4], [5, 6, 7, 8])
+        response = getattr(app.test_client(), method)(path, headers=family['admin_headers'], json={})
+        assert response.status_code in (401, 403)
+
+@pytest.mark.parametrize('method, path', PROCESS_WIDE)
+def test_operator_token_opens_process_wide_endpoints(make_app, method, path):
+    app = make_app(DEBUG_TOKEN='operator-secret')
+    response = getattr(app.test_client(), method)(path, headers={'Authorization': 'Bearer operator-secret'}, json={})
+    assert response.status_code == (404 if path.endswith('missing.txt') else 200)
+
+def test_family_admin_keeps_reservation_checks(app):
+    family = create_family(app, 'debug', [1, 2, 3, 4], [5, 6, 7, 8])
+    response = app.test_client().get('/api/debug/reservations', headers=family['admin_headers'])
+    assert response.status_code == 200
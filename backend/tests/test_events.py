@@ -0,0 +1,60 @@
+"""Backend de eventos 'database': lotes por commit, margen y posición al suscribirse"""
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, insert
+
+from events import admin_channel, broker, emit
+from models import db, EventMessage
+
+@pytest.fixture
+def app(make_app):
+    return make_app(EVENTS_BACKEND='database', EVENTS_POLL_SECONDS=0.05, EVENTS_SETTLE_SECONDS=0.3)
+
+def receive(subscription, count, timeout=3):
+    messages = []
+    deadline = time.monotonic() + timeout
+    while len(messages) < count and time.monotonic() < deadline:
+        message = subscription.get(timeout=0.05)
+        if message:
+            messages.append(message)
+    return messages
+
+def test_events_of_a_commit_are_inserted_together(app):
+    with app.app_context():
+        transactions = []
+
+        def count(connection):
+            transactions.append(connection)
+
+        event.listen(db.engine, 'begin', count)
+        try:
+            for number in range(5):
+                emit('test', {'number': number})
+            db.session.commit()
+        finally:
+            event.remove(db.engine, 'begin', count)
+        assert db.session.query(EventMessage).count() == 5
+        assert len(transactions) == 1  # una sola transacción para los cinco eventos
+
+def test_subscriber_gets_events_published_before_the_first_poll(app):
+    with app.app_context():
+        subscription = broker.subscribe([admin_channel(None)])
+        try:
+            broker.publish('test', {'n': 1}, family_id=None)
+            messages = receive(subscription, 1)
+        finally:
+            broker.unsubscribe(subscription)
+    assert [message['data'] for message in messages] == [{'n': 1}]
+
+def test_recent_events_wait_for_the_settle_window(app):
+    backend = broker.backend
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.execute(insert(EventMessage).values(
+                channels=admin_channel(None), message='{"type": "test"}', created_at=datetime.utcnow()
+            ))
+        assert backend._deliver(0) == 0
+        time.sleep(0.35)
+        assert backend._deliver(0) == 1
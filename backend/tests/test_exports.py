@@ -0,0 +1,24 @@
+"""Exportaciones: validación del cuerpo de POST /api/exports"""
+import pytest
+
+from conftest import create_family
+
+@pytest.mark.parametrize('body', [
+    {'tables': 'bonuses'},
+    {'tables': {'bonuses': True}},
+    {'tables': [{'name': 'bonuses'}]},
+    {'tables': [['bonuses']]},
+    {'tables': ['bonuses', 7]},
+    {'tables': ['users']},
+    {'format': 'xlsx'},
+])
+def test_invalid_export_requests(app, body):
+    family = create_family(app, 'exports', [1, 2, 3, 4], [5, 6, 7, 8])
+    response = app.test_client().post('/api/exports', headers=family['admin_headers'], json=body)
+    assert response.status_code == 400
+
+def test_export_selected_tables(app):
+    family = create_family(app, 'exports', [1, 2, 3, 4], [5, 6, 7, 8])
+    response = app.test_client().post('/api/exports', headers=family['admin_headers'], json={'tables': ['bonuses']})
+    assert response.status_code == 202
+    assert response.get_json()['job']['job_type'] == 'family_export'
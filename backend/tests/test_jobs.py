@@ -0,0 +1,51 @@
+"""Cola de trabajos: heartbeat, caducidad y resultado de un trabajo caducado"""
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from jobs import claim_next_job, enqueue, expire_stale_jobs, job_handler, run_job
+from models import db, Job
+
+@job_handler('test_sleep')
+def sleep_job(payload, job):
+    time.sleep(payload['seconds'])
+    if payload.get('expire'):
+        # Otro worker da el trabajo por muerto mientras este sigue corriendo
+        db.session.execute(update(Job).where(Job.id == job.id).values(status='failed'))
+        db.session.commit()
+    return {'slept': payload['seconds']}, 200
+
+def test_heartbeat_keeps_a_long_job_alive(app):
+    with app.app_context():
+        enqueue('test_sleep', {'seconds': 0.3})
+        job = claim_next_job()
+        claimed_at = datetime.utcnow() - timedelta(hours=2)
+        db.session.execute(update(Job).where(Job.id == job.id).values(started_at=claimed_at, heartbeat_at=claimed_at))
+        db.session.commit()
+
+        job = run_job(job, heartbeat_seconds=0.05)
+        assert job.status == 'finished'
+        assert job.heartbeat_at > datetime.utcnow() - timedelta(seconds=5)
+        assert expire_stale_jobs(60) == 0
+
+def test_stale_heartbeat_expires(app):
+    with app.app_context():
+        enqueue('test_sleep', {'seconds': 0})
+        job = claim_next_job()
+        assert expire_stale_jobs(60) == 0
+
+        db.session.execute(update(Job).where(Job.id == job.id).values(
+            heartbeat_at=datetime.utcnow() - timedelta(minutes=5)
+        ))
+        db.session.commit()
+        assert expire_stale_jobs(60) == 1
+        job = db.session.get(Job, job.id)
+        assert (job.status, job.error) == ('failed', 'Job lease expired (worker stopped)')
+
+def test_expired_job_keeps_its_failed_status(app):
+    with app.app_context():
+        enqueue('test_sleep', {'seconds': 0, 'expire': True})
+        job = run_job(claim_next_job())
+        assert job.status == 'failed'
+        assert job.result is None
@@ -0,0 +1,107 @@
+"""Clasificación en memoria: empates, top-k y actualización con el outbox"""
+import pytest
+
+import leaderboard
+from conftest import create_family
+from leaderboard import FamilyBoard, Ranking
+from models import db, User
+from tenancy import family_context
+
+@pytest.fixture
+def app(make_app):
+    leaderboard._boards.clear()
+    yield make_app(OUTBOX_SAFETY_SECONDS=0)
+    leaderboard._boards.clear()
+
+@pytest.fixture
+def family(app):
+    family = create_family(app, 'board', [1, 2, 3, 4], [5, 6, 7, 8])
+    with app.app_context(), family_context(family['family_id']):
+        kids = []
+        for n, score in enumerate((100, 80, 80)):
+            kid = User(nick=f'kid{n}', figure='sun', role='user', score=score)
+            kid.set_access_code([9, 10, 11, n + 1])
+            kids.append(kid)
+        db.session.add_all(kids)
+        db.session.commit()
+        family['kids'] = [family['kid_id']] + [kid.id for kid in kids]
+    return family
+
+def board(client, headers, **params):
+    return client.get('/api/users/leaderboard', headers=headers, query_string=params).get_json()
+
+def test_ranking_ties_share_a_position():
+    ranking = Ranking()
+    for user_id, value in ((1, 50), (2, 80), (3, 80), (4, 10)):
+        ranking.set(user_id, value)
+    assert ranking.top(3) == [(1, 2, 80), (1, 3, 80), (3, 1, 50)]
+    assert [ranking.rank(user_id) for user_id in (1, 2, 3, 4)] == [3, 1, 1, 4]
+
+    ranking.set(3, 5)
+    ranking.remove(4)
+    assert ranking.top(10) == [(1, 2, 80), (2, 1, 50), (3, 3, 5)]
+    assert ranking.rank(4) is None and len(ranking) == 3
+
+def test_top_k_and_own_position(app, family):
+    client = app.test_client()
+    body = board(client, family['kid_headers'], limit=2)
+    assert body['total'] == 4
+    assert [(leader['rank'], leader['value']) for leader in body['leaders']] == [(1, 100), (1, 100)]
+    assert body['me'] == {'user_id': family['kid_id'], 'rank': 1, 'value': 100}
+
+    body = board(client, family['admin_headers'], limit=10, user_id=family['kids'][2])
+    assert [leader['rank'] for leader in body['leaders']] == [1, 1, 3, 3]
+    assert body['me']['rank'] == 3
+
+def test_refresh_applies_new_outbox_events(app, family):
+    client = app.test_client()
+    admin = family['admin_headers']
+    board(client, admin)
+    calls = []
+    original = FamilyBoard.fetch
+
+    def fetch(self, user_ids=None):
+        calls.append(user_ids)
+        return original(self, user_ids)
+
+    FamilyBoard.fetch = fetch
+    try:
+        last = family['kids'][3]
+        client.post(f'/api/users/{last}/bonus', headers=admin, json={'credits': 50})
+        body = board(client, admin, user_id=last)
+    finally:
+        FamilyBoard.fetch = original
+    assert calls == [{last}]
+    assert body['me'] == {'user_id': last, 'rank': 1, 'value': 130}
+
+def test_stale_rows_never_replace_newer_ones(app, family):
+    client = app.test_client()
+    admin = family['admin_headers']
+    board(client, admin)
+    kid = family['kids'][2]
+    client.post(f'/api/users/{kid}/bonus', headers=admin, json={'credits': 5})
+    client.post(f'/api/users/{kid}/bonus', headers=admin, json={'credits': 1})
+
+    original_fetch, original_read = FamilyBoard.fetch, leaderboard.read_events
+
+    def fetch(self, user_ids=None):
+        rows = original_fetch(self, user_ids)
+        # Otra petición, que leyó el outbox antes (solo el primer evento),
+        # lee las filas después de un cambio más y las aplica primero
+        FamilyBoard.fetch = original_fetch
+        client.post(f'/api/users/{kid}/bonus', headers=admin, json={'credits': 10})
+        leaderboard.read_events = lambda after, limit: original_read(after, limit)[:1]
+        try:
+            leaderboard._refresh(family['family_id'])
+        finally:
+            leaderboard.read_events = original_read
+        return rows
+
+    FamilyBoard.fetch = fetch
+    try:
+        with app.test_request_context(), family_context(family['family_id']):
+            current = leaderboard._refresh(family['family_id'])
+    finally:
+        FamilyBoard.fetch = original_fetch
+    assert current.rankings['score'].value(kid) == 96
+    assert board(client, admin, user_id=kid)['me']['value'] == 96
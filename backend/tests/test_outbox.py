@@ -0,0 +1,78 @@
+"""Outbox: eventos por escritura y deltas que suman el saldo de cada usuario"""
+from datetime import date
+
+import pytest
+
+from conftest import create_family
+from models import db, OutboxEvent, User
+from tenancy import family_context
+
+@pytest.fixture
+def family(app):
+    return create_family(app, 'outbox', [1, 2, 3, 4], [5, 6, 7, 8])
+
+def assign(client, family, day=None):
+    response = client.post('/api/tasks/assign', headers=family['admin_headers'], json={
+        'task_id': family['task_id'], 'user_id': family['kid_id'],
+        'assigned_date': (day or date.today()).isoformat()
+    })
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+def events(app, family, *event_types):
+    with app.app_context(), family_context(family['family_id']):
+        query = OutboxEvent.query.order_by(OutboxEvent.id)
+        if event_types:
+            query = query.filter(OutboxEvent.event_type.in_(event_types))
+        return [(event.event_type, event.user_id, event.entity_id, event.delta) for event in query]
+
+def test_admin_cancel_charges_the_assigned_user(app, family):
+    client = app.test_client()
+    assignment_id = assign(client, family)
+    response = client.post(f'/api/tasks/assignments/{assignment_id}/cancel', headers=family['admin_headers'], json={})
+    assert response.status_code == 200
+
+    assert events(app, family, 'cancellation') == [('cancellation', family['kid_id'], assignment_id, -10)]
+    with app.app_context(), family_context(family['family_id']):
+        assert db.session.get(User, family['admin_id']).score == 0
+        assert db.session.get(User, family['kid_id']).score == 90
+
+def test_every_write_path_records_an_event(app, family):
+    client = app.test_client()
+    admin, kid = family['admin_headers'], family['kid_headers']
+    task_id = client.post('/api/tasks', headers=admin, json={
+        'title': 'new', 'task_type': 'special', 'frequency': 'daily', 'base_value': 5
+    }).get_json()['id']
+    client.put(f'/api/tasks/{task_id}', headers=admin, json={'base_value': 6})
+    client.delete(f'/api/tasks/{task_id}', headers=admin)
+
+    proposal_id = client.post('/api/tasks/proposals', headers=kid, json={
+        'title': 'idea', 'description': '...', 'frequency': 'daily', 'suggested_reward': 5
+    }).get_json()['id']
+    created_task_id = client.post(f'/api/tasks/proposals/{proposal_id}/review', headers=admin, json={
+        'status': 'approved'
+    }).get_json()['created_task_id']
+
+    reward_id = client.post('/api/rewards', headers=admin, json={'name': 'toy', 'credit_cost': 50}).get_json()['id']
+    client.put(f'/api/rewards/{reward_id}', headers=admin, json={'credit_cost': 40})
+    client.delete(f'/api/rewards/{reward_id}', headers=admin)
+
+    assignment_id = assign(client, family, date(2026, 10, 1))
+    client.put(f'/api/tasks/assignments/{assignment_id}', headers=admin, json={'assigned_date': '2026-10-02'})
+    client.delete(f'/api/tasks/assignments/{assignment_id}', headers=admin)
+
+    admin_id, kid_id = family['admin_id'], family['kid_id']
+    assert events(app, family) == [
+        ('task_created', admin_id, task_id, 0),
+        ('task_updated', admin_id, task_id, 0),
+        ('task_deleted', admin_id, task_id, 0),
+        ('proposal_created', kid_id, proposal_id, 0),
+        ('task_created', admin_id, created_task_id, 0),
+        ('proposal_reviewed', kid_id, proposal_id, 0),
+        ('reward_created', admin_id, reward_id, 0),
+        ('reward_updated', admin_id, reward_id, 0),
+        ('reward_deleted', admin_id, reward_id, 0),
+        ('assignment', kid_id, assignment_id, 0),
+        ('assignment_updated', kid_id, assignment_id, 0),
+        ('assignment_deleted', kid_id, assignment_id, 0),
+    ]
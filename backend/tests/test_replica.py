@@ -0,0 +1,79 @@
+"""Lecturas en réplica (@read_replica) con dos ficheros SQLite: primario y réplica"""
+import shutil
+from datetime import date
+
+import pytest
+
+import replica
+from conftest import create_family
+from models import db, TaskAssignment
+from tenancy import family_context
+
+ASSIGNMENTS_URL = '/api/tasks/assignments'
+
+@pytest.fixture(autouse=True)
+def fresh_health():
+    replica.health = replica.ReplicaHealth()
+    yield
+    replica.health = replica.ReplicaHealth()
+
+@pytest.fixture
+def replica_path(tmp_path):
+    return tmp_path / 'replica.db'
+
+@pytest.fixture
+def app(make_app, replica_path):
+    return make_app(SQLALCHEMY_BINDS={'replica': f'sqlite:///{replica_path}'})
+
+@pytest.fixture
+def family(app, tmp_path, replica_path):
+    """Familia con una asignación copiada a la réplica y otra solo en el primario"""
+    family = create_family(app, 'replica', [1, 2, 3, 4], [5, 6, 7, 8])
+    _assign(app, family, date(2026, 10, 1))
+    # La réplica es una copia del primario en este momento
+    shutil.copy(tmp_path / 'primary.db', replica_path)
+    _assign(app, family, date(2026, 10, 2))
+    return family
+
+def _assign(app, family, day):
+    with app.app_context(), family_context(family['family_id']):
+        db.session.add(TaskAssignment(
+            task_id=family['task_id'], user_id=family['kid_id'],
+            assigned_date=day, assigned_by_id=family['admin_id']
+        ))
+        db.session.commit()
+
+def test_read_goes_to_replica(app, family):
+    response = app.test_client().get(ASSIGNMENTS_URL, headers=family['admin_headers'])
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 1
+
+def test_falls_back_to_primary_when_replica_fails(app, family, replica_path):
+    replica_path.write_bytes(b'')  # réplica sin tablas: la consulta falla
+
+    response = app.test_client().get(ASSIGNMENTS_URL, headers=family['admin_headers'])
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 2
+    with app.app_context():
+        assert not replica.health.usable(app, db.engines['replica'])
+
+def test_falls_back_to_primary_when_replica_lags(app, family, monkeypatch):
+    monkeypatch.setattr(replica.ReplicaHealth, '_check_lag', lambda self, engine, max_lag: False)
+
+    response = app.test_client().get(ASSIGNMENTS_URL, headers=family['admin_headers'])
+
+    assert len(response.get_json()) == 2
+
+def test_client_reads_its_own_writes(app, family):
+    client = app.test_client()
+    response = client.post('/api/tasks/assign', headers=family['admin_headers'], json={
+        'task_id': family['task_id'], 'user_id': family['kid_id'], 'assigned_date': '2026-10-03'
+    })
+    assert response.status_code == 201
+    assert replica.STICKY_COOKIE in response.headers.get('Set-Cookie', '')
+
+    # Quien escribió lee del primario; otro cliente sigue leyendo de la réplica
+    assert len(client.get(ASSIGNMENTS_URL, headers=family['admin_headers']).get_json()) == 3
+    assert len(app.test_client().get(ASSIGNMENTS_URL, headers=family['admin_headers']).get_json()) == 1
@@ -0,0 +1,150 @@
+"""Canjes: reservas con UPDATE condicional, cierre, y aprobación/rechazo en bloque"""
+import pytest
+from sqlalchemy import event
+
+from conftest import create_family
+from models import db, Reward, RewardRedemption, User
+from tenancy import family_context
+
+@pytest.fixture
+def family(app):
+    return create_family(app, 'rewards', [1, 2, 3, 4], [5, 6, 7, 8])
+
+def create_reward(client, family, credit_cost=20, stock=None):
+    response = client.post('/api/rewards', headers=family['admin_headers'], json={
+        'name': 'toy', 'credit_cost': credit_cost, 'stock': stock
+    })
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+def redeem(client, family, reward_id):
+    return client.post(f'/api/rewards/{reward_id}/redeem', headers=family['kid_headers'], json={})
+
+def state(app, family, reward_id):
+    """(stock, reservado) del premio y (score, reservados) del hijo"""
+    with app.app_context(), family_context(family['family_id']):
+        reward = db.session.get(Reward, reward_id)
+        kid = db.session.get(User, family['kid_id'])
+        return (reward.stock, reward.reserved), (kid.score, kid.reserved_credits)
+
+def test_reserve_then_approve_or_reject(app, family):
+    client = app.test_client()
+    admin = family['admin_headers']
+    reward_id = create_reward(client, family, stock=3)
+
+    first = redeem(client, family, reward_id).get_json()['redemption']['id']
+    second = redeem(client, family, reward_id).get_json()['redemption']['id']
+    assert state(app, family, reward_id) == ((3, 2), (100, 40))
+
+    response = client.post(f'/api/rewards/redemptions/{first}/approve', headers=admin, json={})
+    assert response.status_code == 200
+    assert response.get_json()['user_score'] == 80
+    assert state(app, family, reward_id) == ((2, 1), (80, 20))
+
+    response = client.post(f'/api/rewards/redemptions/{second}/reject', headers=admin, json={'reason': 'no'})
+    assert response.status_code == 200
+    assert response.get_json()['redemption']['status'] == 'rejected'
+    assert state(app, family, reward_id) == ((2, 0), (80, 0))
+
+    # Un canje cerrado no se vuelve a cerrar ni mueve créditos
+    for redemption_id in (first, second):
+        for action in ('approve', 'reject'):
+            response = client.post(f'/api/rewards/redemptions/{redemption_id}/{action}', headers=admin, json={})
+            assert response.status_code == 400
+    assert state(app, family, reward_id) == ((2, 0), (80, 0))
+
+def test_out_of_stock_and_insufficient_credits(app, family):
+    client = app.test_client()
+    reward_id = create_reward(client, family, credit_cost=10, stock=1)
+    assert redeem(client, family, reward_id).status_code == 201
+
+    # La única unidad ya está reservada por el canje pendiente
+    response = redeem(client, family, reward_id)
+    assert (response.status_code, response.get_json()['error']) == (400, 'Reward out of stock')
+    assert state(app, family, reward_id) == ((1, 1), (100, 10))
+
+    expensive_id = create_reward(client, family, credit_cost=95)
+    response = redeem(client, family, expensive_id)
+    assert response.status_code == 400
+    assert response.get_json()['available_credits'] == 90
+    assert state(app, family, expensive_id) == ((None, 0), (100, 10))
+
+def test_other_family_ids_are_not_found(app, family):
+    client = app.test_client()
+    other = create_family(app, 'others', [2, 3, 4, 5], [6, 7, 8, 9])
+    reward_id = create_reward(client, family)
+    redemption_id = redeem(client, family, reward_id).get_json()['redemption']['id']
+
+    assert client.post(f'/api/rewards/{reward_id}/redeem', headers=other['kid_headers'], json={}).status_code == 404
+    for action in ('approve', 'reject'):
+        response = client.post(f'/api/rewards/redemptions/{redemption_id}/{action}', headers=other['admin_headers'], json={})
+        assert response.status_code == 404
+    response = client.post('/api/rewards/redemptions/bulk', headers=other['admin_headers'], json={
+        'decisions': [{'id': redemption_id, 'action': 'approve'}]
+    })
+    assert response.get_json()['results'][0]['result'] == 'not_found'
+    assert state(app, family, reward_id) == ((None, 1), (100, 20))
+
+def test_bulk_results_and_accounting(app, family):
+    client = app.test_client()
+    admin = family['admin_headers']
+    reward_id = create_reward(client, family, credit_cost=30, stock=5)
+    ids = [redeem(client, family, reward_id).get_json()['redemption']['id'] for _ in range(3)]
+    client.post(f'/api/rewards/redemptions/{ids[0]}/reject', headers=admin, json={})
+
+    # El hijo pierde créditos: solo alcanza para uno de los dos que se aprueban
+    with app.app_context(), family_context(family['family_id']):
+        db.session.get(User, family['kid_id']).score = 50
+        db.session.commit()
+
+    later = redeem(client, family, reward_id)
+    assert later.status_code == 400
+    response = client.post('/api/rewards/redemptions/bulk', headers=admin, json={'decisions': [
+        {'id': ids[0], 'action': 'approve'},
+        {'id': ids[1], 'action': 'approve'},
+        {'id': ids[2], 'action': 'approve'},
+        {'id': 999, 'action': 'reject'},
+    ]})
+    assert response.status_code == 200
+    assert [row['result'] for row in response.get_json()['results']] == [
+        'already_processed', 'approved', 'insufficient_credits', 'not_found'
+    ]
+    assert state(app, family, reward_id) == ((4, 1), (20, 30))
+
+    response = client.post('/api/rewards/redemptions/bulk', headers=admin, json={'decisions': [
+        {'id': ids[2], 'action': 'reject', 'reason': 'sin créditos'}
+    ]})
+    assert response.get_json()['counts'] == {'rejected': 1}
+    assert state(app, family, reward_id) == ((4, 0), (20, 0))
+
+    for decisions in ([], [{'id': ids[1]}], [{'id': ids[1], 'action': 'approve'}] * 2):
+        response = client.post('/api/rewards/redemptions/bulk', headers=admin, json={'decisions': decisions})
+        assert response.status_code == 400
+
+def test_bulk_conflicts_with_a_concurrent_close(app, family):
+    client = app.test_client()
+    admin = family['admin_headers']
+    reward_id = create_reward(client, family, stock=5)
+    ids = [redeem(client, family, reward_id).get_json()['redemption']['id'] for _ in range(2)]
+
+    # Otro admin aprueba ids[1] justo después de que el bloque leyó los estados
+    def close_first(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('UPDATE reward_redemptions') and not closed:
+            closed.append(True)
+            cursor.execute("UPDATE reward_redemptions SET status = 'approved' WHERE id = ?", (ids[1],))
+
+    closed = []
+    with app.app_context():
+        engine = db.engines[None]
+    event.listen(engine, 'before_cursor_execute', close_first)
+    try:
+        response = client.post('/api/rewards/redemptions/bulk', headers=admin, json={'decisions': [
+            {'id': ids[0], 'action': 'approve'}, {'id': ids[1], 'action': 'approve'}
+        ]})
+    finally:
+        event.remove(engine, 'before_cursor_execute', close_first)
+
+    assert response.status_code == 409
+    assert state(app, family, reward_id) == ((5, 2), (100, 40))
+    with app.app_context(), family_context(family['family_id']):
+        assert db.session.get(RewardRedemption, ids[0]).status == 'pending'
@@ -0,0 +1,123 @@
+"""Reglas de puntuación: tablas compiladas, PUT /api/scoring y validación masiva"""
+from datetime import date
+
+import pytest
+
+from conftest import create_family
+from models import db, TaskType, User
+from scoring import compile_rules
+from tenancy import family_context
+
+@pytest.fixture
+def family(app):
+    return create_family(app, 'scoring', [1, 2, 3, 4], [5, 6, 7, 8])
+
+def assign(client, family, day):
+    response = client.post('/api/tasks/assign', headers=family['admin_headers'], json={
+        'task_id': family['task_id'], 'user_id': family['kid_id'], 'assigned_date': day.isoformat()
+    })
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+def complete(client, family, assignment_id):
+    response = client.post(f'/api/tasks/assignments/{assignment_id}/complete', headers=family['kid_headers'], json={})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+def scores(app, family):
+    with app.app_context(), family_context(family['family_id']):
+        return db.session.get(User, family['admin_id']).score, db.session.get(User, family['kid_id']).score
+
+def test_default_rules_match_the_old_tiers():
+    rules = compile_rules(None)
+    for base_value in range(0, 5001):
+        assert rules.credits(base_value, 1) == int(base_value * 0.10)
+        assert rules.credits(base_value, 2) == int(base_value * 0.60)
+        assert rules.credits(base_value, 3) == base_value
+    assert rules.penalty(TaskType.OBLIGATORY, 75) == 75
+    assert rules.penalty(TaskType.SPECIAL, 75) == 0
+    assert not rules.uses_streak
+
+def test_streak_and_weekend_tables():
+    rules = compile_rules({
+        'streak_bonus': [{'min_streak': 7, 'percent': 150}, {'min_streak': 3, 'percent': 120}],
+        'weekend_percent': 200,
+    })
+    monday, saturday = date(2026, 10, 19), date(2026, 10, 24)
+    assert rules.uses_streak
+    assert [rules.credits(100, 3, streak, monday) for streak in (0, 2, 3, 6, 7, 400)] == [100, 100, 120, 120, 150, 150]
+    assert rules.credits(100, 3, 0, saturday) == 200
+    assert rules.credits(100, 2, 7, saturday) == 180
+
+@pytest.mark.parametrize('rules', [
+    'strict',
+    {'bonus': 1},
+    {'tiers': {'1': 10, '2': 60}},
+    {'tiers': {'1': 10, '2': 60, '3': 1001}},
+    {'tiers': {'1': True, '2': 60, '3': 100}},
+    {'penalties': {'chores': 50}},
+    {'streak_bonus': [{'min_streak': 0, 'percent': 150}]},
+    {'streak_bonus': {'min_streak': 3, 'percent': 150}},
+    {'weekend_percent': -1},
+])
+def test_put_scoring_rejects_invalid_rules(app, family, rules):
+    client = app.test_client()
+    response = client.put('/api/scoring', headers=family['admin_headers'], json={'rules': rules})
+    assert response.status_code == 400
+    assert client.get('/api/scoring', headers=family['kid_headers']).get_json()['version'] == 0
+
+def test_put_scoring_changes_later_validations(app, family):
+    client = app.test_client()
+    admin = family['admin_headers']
+    assert client.put('/api/scoring', headers=family['kid_headers'], json={'rules': None}).status_code == 403
+    assert client.put('/api/scoring', headers=admin, json={}).status_code == 400
+
+    response = client.put('/api/scoring', headers=admin, json={'rules': {'tiers': {'1': 0, '2': 50, '3': 200}}})
+    assert response.status_code == 200
+    assert response.get_json()['version'] == 1
+    assert response.get_json()['rules']['weekend_percent'] == 100
+
+    completion_id = complete(client, family, assign(client, family, date(2026, 10, 19)))
+    client.post(f'/api/tasks/completions/{completion_id}/validate', headers=admin, json={'validation_score': 3})
+    assert scores(app, family) == (0, 120)
+
+    response = client.put('/api/scoring', headers=admin, json={'rules': None})
+    assert (response.get_json()['custom'], response.get_json()['version']) == (False, 2)
+    completion_id = complete(client, family, assign(client, family, date(2026, 10, 20)))
+    client.post(f'/api/tasks/completions/{completion_id}/validate', headers=admin, json={'validation_score': 3})
+    assert scores(app, family) == (0, 130)
+
+def test_bulk_validate_reports_each_completion(app, family):
+    client = app.test_client()
+    admin = family['admin_headers']
+    first = complete(client, family, assign(client, family, date(2026, 10, 19)))
+    second = complete(client, family, assign(client, family, date(2026, 10, 20)))
+    client.post(f'/api/tasks/completions/{first}/validate', headers=admin, json={'validation_score': 3})
+
+    response = client.post('/api/tasks/completions/validate/bulk', headers=admin, json={'validations': [
+        {'id': first, 'validation_score': 1},
+        {'id': second, 'validation_score': 2},
+        {'id': 999, 'validation_score': 3},
+    ]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['results'] == [
+        {'id': first, 'result': 'already_validated'},
+        {'id': second, 'result': 'validated'},
+        {'id': 999, 'result': 'not_found'},
+    ]
+    assert body['validated'] == 1
+    assert body['user_scores'] == {str(family['kid_id']): 116}
+
+    for validations in ([], [{'id': second}], [{'id': second, 'validation_score': 2}] * 2):
+        response = client.post('/api/tasks/completions/validate/bulk', headers=admin, json={'validations': validations})
+        assert response.status_code == 400
+
+def test_admin_cancel_then_reset_moves_no_credits(app, family):
+    client = app.test_client()
+    assignment_id = assign(client, family, date(2026, 10, 19))
+    client.post(f'/api/tasks/assignments/{assignment_id}/cancel', headers=family['admin_headers'], json={})
+    assert scores(app, family) == (0, 90)
+
+    client.post(f'/api/tasks/assignments/{assignment_id}/reset', headers=family['admin_headers'])
+    assert scores(app, family) == (0, 100)
@@ -0,0 +1,91 @@
+"""Resúmenes de estadísticas: lo que se mantiene en cada escritura == rebuild()"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import routes.tasks
+import stats
+from conftest import create_family
+from models import db, StatsTaskWeekly, StatsUserDaily
+from stats import rebuild
+from tenancy import family_context
+
+class TwoDaysAgo(datetime):
+    @classmethod
+    def utcnow(cls):
+        return datetime.utcnow() - timedelta(days=2)
+
+@pytest.fixture
+def family(app):
+    return create_family(app, 'stats', [1, 2, 3, 4], [5, 6, 7, 8])
+
+def snapshot(app, family):
+    """Filas de resumen no vacías de la familia"""
+    with app.app_context(), family_context(family['family_id']):
+        user_days = {
+            (row.user_id, row.day): {name: getattr(row, name) for name in row.COLUMNS}
+            for row in StatsUserDaily.query
+        }
+        task_weeks = {
+            (row.task_id, row.week): {name: getattr(row, name) for name in row.COLUMNS}
+            for row in StatsTaskWeekly.query
+        }
+    return (
+        {key: values for key, values in user_days.items() if any(values.values())},
+        {key: values for key, values in task_weeks.items() if any(values.values())},
+    )
+
+def test_incremental_rollups_match_rebuild(app, family, monkeypatch):
+    client = app.test_client()
+    admin, kid = family['admin_headers'], family['kid_headers']
+    today = date.today()
+
+    def assign(days_ago):
+        return client.post('/api/tasks/assign', headers=admin, json={
+            'task_id': family['task_id'], 'user_id': family['kid_id'],
+            'assigned_date': (today - timedelta(days=days_ago)).isoformat()
+        }).get_json()['id']
+
+    def complete(assignment_id):
+        return client.post(f'/api/tasks/assignments/{assignment_id}/complete', headers=kid, json={}).get_json()['id']
+
+    ids = [assign(days_ago) for days_ago in range(8)]
+
+    # Validadas (una sola y en bloque)
+    first = complete(ids[0])
+    client.post(f'/api/tasks/completions/{first}/validate', headers=admin, json={'validation_score': 3})
+    bulk = [complete(ids[1]), complete(ids[2])]
+    client.post('/api/tasks/completions/validate/bulk', headers=admin, json={
+        'validations': [{'id': bulk[0], 'validation_score': 2}, {'id': bulk[1], 'validation_score': 1}]
+    })
+
+    # Canceladas por el admin y por el hijo
+    client.post(f'/api/tasks/assignments/{ids[3]}/cancel', headers=admin, json={})
+    client.post(f'/api/tasks/assignments/{ids[4]}/cancel', headers=kid, json={})
+
+    # Una validación de hace dos días que se resetea hoy
+    late = complete(ids[5])
+    with monkeypatch.context() as patch:
+        for module in (routes.tasks, stats):
+            patch.setattr(module, 'datetime', TwoDaysAgo)
+        client.post(f'/api/tasks/completions/{late}/validate', headers=admin, json={'validation_score': 3})
+    client.post(f'/api/tasks/assignments/{ids[5]}/reset', headers=admin)
+    client.post(f'/api/tasks/assignments/{ids[3]}/reset', headers=admin)
+
+    # Cambio de fecha, borrado, bonus y canje
+    client.put(f'/api/tasks/assignments/{ids[6]}', headers=admin, json={'assigned_date': (today - timedelta(days=20)).isoformat()})
+    client.delete(f'/api/tasks/assignments/{ids[7]}', headers=admin)
+    client.post(f"/api/users/{family['kid_id']}/bonus", headers=admin, json={'credits': 15})
+    reward_id = client.post('/api/rewards', headers=admin, json={'name': 'toy', 'credit_cost': 20}).get_json()['id']
+    redemption_id = client.post(f'/api/rewards/{reward_id}/redeem', headers=kid, json={}).get_json()['redemption']['id']
+    client.post(f'/api/rewards/redemptions/{redemption_id}/approve', headers=admin, json={})
+
+    incremental = snapshot(app, family)
+    penalties = {key: values['credits_penalty'] for key, values in incremental[0].items() if values['credits_penalty']}
+    assert penalties == {(family['kid_id'], today): 10}
+    assert all(values['credits_earned'] >= 0 for values in incremental[0].values())
+
+    with app.app_context(), family_context(family['family_id']):
+        rebuild(today - timedelta(days=30), today)
+        db.session.commit()
+    assert snapshot(app, family) == incremental
@@ -0,0 +1,71 @@
+"""Rachas: un día pasado sin resolver corta la racha"""
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import create_family
+from models import db, TaskStreak
+from streaks import rebuild
+from tenancy import family_context
+
+@pytest.fixture
+def family(app):
+    return create_family(app, 'streaks', [1, 2, 3, 4], [5, 6, 7, 8])
+
+def assign(client, family, days_ago):
+    response = client.post('/api/tasks/assign', headers=family['admin_headers'], json={
+        'task_id': family['task_id'], 'user_id': family['kid_id'],
+        'assigned_date': (date.today() - timedelta(days=days_ago)).isoformat()
+    })
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+def complete(client, family, assignment_id):
+    response = client.post(f'/api/tasks/assignments/{assignment_id}/complete', headers=family['kid_headers'], json={})
+    assert response.status_code == 201
+
+def stored(app, family):
+    with app.app_context(), family_context(family['family_id']):
+        streak = TaskStreak.query.filter_by(user_id=family['kid_id']).one()
+        return streak.current, streak.longest, streak.last_date
+
+def rebuilt(app, family):
+    with app.app_context(), family_context(family['family_id']):
+        rebuild()
+        db.session.commit()
+    return stored(app, family)
+
+def test_skipped_day_breaks_when_the_next_day_is_completed(app, family):
+    client = app.test_client()
+    ids = [assign(client, family, days_ago) for days_ago in (3, 2, 1, 0)]
+    for assignment_id in (ids[0], ids[1], ids[3]):
+        complete(client, family, assignment_id)
+
+    assert stored(app, family) == (1, 2, date.today())
+    assert rebuilt(app, family) == (1, 2, date.today())
+
+def test_skipped_day_breaks_the_current_streak_when_read(app, family):
+    client = app.test_client()
+    ids = [assign(client, family, days_ago) for days_ago in (3, 2, 1)]
+    complete(client, family, ids[0])
+    complete(client, family, ids[1])
+
+    calendar = client.get(f"/api/calendar/user/{family['kid_id']}", headers=family['kid_headers']).get_json()
+    assert calendar['streaks'][str(family['task_id'])]['current'] == 0
+    dashboard = client.get('/api/dashboard?sections=streaks', headers=family['kid_headers']).get_json()
+    assert [streak['current'] for streak in dashboard['streaks']] == [0]
+    admin = client.get('/api/dashboard?sections=streaks', headers=family['admin_headers']).get_json()
+    assert admin['streaks'] == []
+
+    assert rebuilt(app, family) == (0, 2, date.today() - timedelta(days=1))
+
+def test_deleting_a_skipped_day_restores_the_streak(app, family):
+    client = app.test_client()
+    ids = [assign(client, family, days_ago) for days_ago in (3, 2, 1, 0)]
+    for assignment_id in (ids[0], ids[1], ids[3]):
+        complete(client, family, assignment_id)
+    assert stored(app, family)[0] == 1
+
+    response = client.delete(f'/api/tasks/assignments/{ids[2]}', headers=family['admin_headers'])
+    assert response.status_code == 200
+    assert stored(app, family) == (3, 3, date.today())
@@ -0,0 +1,76 @@
+"""Sincronización por diferencias: token, retroceso de seguridad y lápidas"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from conftest import create_family
+from routes.sync import TOMBSTONES, _decode_token, _encode_token
+
+@pytest.fixture
+def family(app):
+    return create_family(app, 'sync', [1, 2, 3, 4], [5, 6, 7, 8])
+
+def assign(client, family, days_ago):
+    response = client.post('/api/tasks/assign', headers=family['admin_headers'], json={
+        'task_id': family['task_id'], 'user_id': family['kid_id'],
+        'assigned_date': (date.today() - timedelta(days=days_ago)).isoformat()
+    })
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+def sync(client, headers, since=None):
+    response = client.get('/api/sync', headers=headers, query_string={'since': since} if since else {})
+    assert response.status_code == 200
+    return response.get_json()
+
+def test_token_round_trip():
+    issued_at = datetime(2026, 10, 19, 12, 30, 0, 123456)
+    positions = {'task_assignments': (datetime(2026, 10, 19, 12, 0, 0, 1), 7), TOMBSTONES: (datetime(1970, 1, 1), 0)}
+    assert _decode_token(_encode_token(issued_at, positions)) == (issued_at, positions)
+    for token in ('not-a-token', _encode_token(issued_at, positions)[:-4]):
+        with pytest.raises(ValueError):
+            _decode_token(token)
+
+def test_bad_and_expired_tokens(app, family):
+    client = app.test_client()
+    response = client.get('/api/sync?since=garbage', headers=family['kid_headers'])
+    assert response.status_code == 400
+
+    old = _encode_token(datetime.utcnow() - timedelta(days=31), {})
+    response = client.get('/api/sync', headers=family['kid_headers'], query_string={'since': old})
+    assert response.status_code == 410
+
+def test_delete_between_syncs_sends_a_tombstone(make_app):
+    app = make_app(SYNC_SAFETY_SECONDS=0)
+    family = create_family(app, 'sync', [1, 2, 3, 4], [5, 6, 7, 8])
+    client = app.test_client()
+    kept, deleted = assign(client, family, 1), assign(client, family, 0)
+
+    first = sync(client, family['kid_headers'])
+    assert {row['id'] for row in first['changes']['task_assignments']} == {kept, deleted}
+    assert first['deleted'] == []
+
+    assert client.delete(f'/api/tasks/assignments/{deleted}', headers=family['admin_headers']).status_code == 200
+
+    second = sync(client, family['kid_headers'], first['next'])
+    assert second['changes']['task_assignments'] == []
+    assert [(row['table'], row['id']) for row in second['deleted']] == [('task_assignments', deleted)]
+    first_at, first_positions = _decode_token(first['next'])
+    second_at, second_positions = _decode_token(second['next'])
+    assert second_at > first_at
+    assert second_positions[TOMBSTONES] > first_positions[TOMBSTONES]
+
+    # Ya entregada, la lápida no se repite
+    assert sync(client, family['kid_headers'], second['next'])['deleted'] == []
+
+def test_safety_window_repeats_recent_changes(app, family):
+    client = app.test_client()
+    assignment_id = assign(client, family, 0)
+
+    first = sync(client, family['kid_headers'])
+    _, positions = _decode_token(first['next'])
+    assert positions['task_assignments'][0] < datetime.utcnow() - timedelta(seconds=4)
+
+    # Dentro de SYNC_SAFETY_SECONDS la fila vuelve a enviarse: el cliente aplica por id
+    second = sync(client, family['kid_headers'], first['next'])
+    assert [row['id'] for row in second['changes']['task_assignments']] == [assignment_id]
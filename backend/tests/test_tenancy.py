@@ -0,0 +1,85 @@
+"""Aislamiento entre familias: login, lecturas y exportaciones"""
+import csv
+import gzip
+import io
+from datetime import date
+
+import pytest
+
+from conftest import create_family
+from jobs import run_worker
+from models import db, Family, TaskAssignment
+from tenancy import _family_from_request, family_context
+
+SHARED_KID_CODE = [5, 6, 7, 8]
+
+@pytest.fixture
+def families(app):
+    """Dos familias cuyos hijos usan el mismo código de iconos"""
+    first = create_family(app, 'first', [1, 2, 3, 4], SHARED_KID_CODE)
+    second = create_family(app, 'second', [9, 10, 11, 12], SHARED_KID_CODE)
+    with app.app_context():
+        for family in (first, second):
+            family['login_code'] = db.session.get(Family, family['family_id']).login_code
+            with family_context(family['family_id']):
+                db.session.add(TaskAssignment(
+                    task_id=family['task_id'], user_id=family['kid_id'],
+                    assigned_date=date(2026, 10, 1), assigned_by_id=family['admin_id']
+                ))
+                db.session.commit()
+    return first, second
+
+def test_login_uses_family_code(app, families):
+    client = app.test_client()
+    for family in families:
+        response = client.post('/api/auth/login', json={
+            'family_code': family['login_code'].lower(), 'icon_codes': SHARED_KID_CODE
+        })
+        assert response.status_code == 200
+        assert response.get_json()['user']['id'] == family['kid_id']
+
+def test_login_without_family_code_needs_single_family(app, families):
+    client = app.test_client()
+
+    response = client.post('/api/auth/login', json={'icon_codes': SHARED_KID_CODE})
+    assert response.status_code == 400
+
+    response = client.post('/api/auth/login', json={'family_code': 'NOPE2345', 'icon_codes': SHARED_KID_CODE})
+    assert response.status_code == 401
+
+def test_admin_cannot_read_other_family(app, families):
+    first, second = families
+    client = app.test_client()
+    headers = first['admin_headers']
+
+    users = client.get('/api/users', headers=headers).get_json()
+    assert {user['id'] for user in users} == {first['admin_id'], first['kid_id']}
+
+    assert client.get(f"/api/users/{second['kid_id']}", headers=headers).status_code == 404
+    assert client.get(f"/api/users/{second['kid_id']}/history", headers=headers).status_code == 404
+
+    assignments = client.get('/api/tasks/assignments', headers=headers).get_json()
+    assert {a['user_id'] for a in assignments} == {first['kid_id']}
+
+def test_query_string_token_does_not_set_family(app, families):
+    first, _ = families
+    token = first['admin_headers']['Authorization'].split()[1]
+
+    # Solo la vista SSE acepta ?token= (y fija la familia ella misma)
+    with app.test_request_context(f'/api/users?token={token}'):
+        assert _family_from_request() is None
+    with app.test_request_context('/api/users', headers=first['admin_headers']):
+        assert _family_from_request() == first['family_id']
+
+def test_export_only_contains_own_family(app, families):
+    first, _ = families
+    client = app.test_client()
+
+    job = client.post('/api/exports', headers=first['admin_headers'], json={}).get_json()['job']
+    run_worker(app, once=True)
+
+    response = client.get(f"/api/exports/{job['id']}/task_assignments.csv.gz", headers=first['admin_headers'])
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.data).decode())))
+    assert len(rows) == 1
+    assert {int(row['family_id']) for row in rows} == {first['family_id']}
@@ -0,0 +1,16 @@
+"""
+Worker de trabajos en segundo plano
+Ejecutar con: python worker.py [--once] [--shard <nombre>]
+
+Usa la misma factory que la API (app:create_app) para compartir
+configuración, modelos y handlers registrados por los blueprints.
+"""
+import os
+import sys
+from app import create_app
+from jobs import run_worker
+
+if __name__ == '__main__':
+    app = create_app(os.getenv('FLASK_CONFIG', 'production'))
+    shard = sys.argv[sys.argv.index('--shard') + 1] if '--shard' in sys.argv else None
+    run_worker(app, once='--once' in sys.argv, shard=shard)
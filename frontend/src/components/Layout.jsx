@@ -1,8 +1,26 @@
+import { useEffect } from 'react'
 import { Outlet } from 'react-router-dom'
 import Navbar from './Navbar'
 import Sidebar from './Sidebar'
+import { useAuthStore } from '../store/authStore'
+import { eventsService } from '../services'
 
 export default function Layout() {
+  const { user, updateUser } = useAuthStore()
+  
+  // Actualizar créditos en vivo en lugar de volver a pedir el usuario
+  useEffect(() => {
+    if (!user?.id) return
+    return eventsService.subscribe((type, message) => {
+      const score = message.data?.user_score
+      if (message.user_id === user.id && score !== undefined && score !== null) {
+        const current = useAuthStore.getState().user
+        const reserved_credits = message.data.user_reserved_credits ?? current.reserved_credits ?? 0
+        updateUser({ ...current, score, reserved_credits, available_credits: score - reserved_credits })
+      }
+    })
+  }, [user?.id])
+  
   return (
     <div className="min-h-screen bg-gray-50">
       <Navbar />
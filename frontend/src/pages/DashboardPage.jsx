@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react'
 import { useAuthStore } from '../store/authStore'
-import { calendarService, usersService, tasksService, authService } from '../services'
+import { calendarService, usersService, tasksService, dashboardService } from '../services'
 import { CheckCircle, Clock, TrendingUp, XCircle, X, MessageSquare } from 'lucide-react'
 
 export default function DashboardPage() {
@@ -25,35 +25,36 @@ export default function DashboardPage() {
   const [cancellationReason, setCancellationReason] = useState('')
   const [error, setError] = useState('')
   const [success, setSuccess] = useState('')
+  const [pendingTasks, setPendingTasks] = useState(null)
   
   useEffect(() => {
     loadStats()
-  }, [user])
+  }, [user?.id])
   
   const loadStats = async () => {
     try {
+      // Una sola petición: usuario actualizado, estadísticas y (usuario) sus pendientes
+      const data = await dashboardService.getDashboard(
+        isAdmin ? ['user', 'stats'] : ['user', 'stats', 'pending_tasks']
+      )
+      updateUser(data.user)
+      
       if (isAdmin) {
         // Admin: Estadísticas del día de hoy de todos los usuarios
-        const todayStats = await calendarService.getTodayStats()
         setStats({
-          credits: todayStats.total_credits || 0,
-          pending: todayStats.pending_tasks || 0,
-          completed: todayStats.completed_tasks || 0,
-          cancelled: todayStats.cancelled_tasks || 0
+          credits: data.stats.total_credits || 0,
+          pending: data.stats.pending_tasks || 0,
+          completed: data.stats.completed_tasks || 0,
+          cancelled: data.stats.cancelled_tasks || 0
         })
       } else {
-        // Usuario: Estadísticas personales (todas las pendientes, últimas 30 completadas/canceladas)
-        const [pendingData, completedData, cancelledData] = await Promise.all([
-          calendarService.getUserPendingTasks(user.id),
-          calendarService.getUserCompletedTasks(user.id, 30),
-          calendarService.getUserCancelledTasks(user.id, 30)
-        ])
-        
+        // Usuario: Estadísticas personales
+        setPendingTasks(data.pending_tasks)
         setStats({
-          credits: user.score || 0,
-          pending: pendingData.pending_count,
-          completed: completedData.completed_count,
-          cancelled: cancelledData.cancelled_count
+          credits: data.stats.credits || 0,
+          pending: data.stats.pending_tasks,
+          completed: data.stats.completed_tasks,
+          cancelled: data.stats.cancelled_tasks
         })
       }
     } catch (error) {
@@ -139,6 +140,9 @@ export default function DashboardPage() {
           // Admin: Tareas pendientes de hoy de todos los usuarios
           const data = await calendarService.getTodayTasks('pending')
           setModalData(data.tasks || [])
+        } else if (pendingTasks) {
+          // Ya vienen con el dashboard
+          setModalData(pendingTasks)
         } else {
           const data = await calendarService.getUserPendingTasks(user.id)
           setModalData(data.tasks || [])
@@ -225,9 +229,6 @@ export default function DashboardPage() {
     try {
       const response = await tasksService.cancelTask(selectedTask.id, cancellationReason)
       
-      const updatedUser = await authService.getCurrentUser()
-      updateUser(updatedUser)
-      
       if (response.penalty_applied > 0) {
         setSuccess(`Tarea cancelada. Penalización: -${response.penalty_applied} créditos`)
       } else {
@@ -260,7 +261,7 @@ export default function DashboardPage() {
   const statCards = [
     {
       title: isAdmin ? 'Créditos Gestionados Hoy' : 'Créditos Totales',
-      value: stats.credits,
+      value: isAdmin ? stats.credits : (user?.score ?? stats.credits),
       icon: TrendingUp,
       color: 'bg-green-500',
       textColor: 'text-green-700',
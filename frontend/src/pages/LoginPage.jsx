@@ -5,6 +5,8 @@ import { authService, iconsService } from '../services'
 
 export default function LoginPage() {
   const [selectedIcons, setSelectedIcons] = useState([])
+  // El dispositivo recuerda la familia del último login
+  const [familyCode, setFamilyCode] = useState(localStorage.getItem('family_code') || '')
   const [icons, setIcons] = useState([])
   const [error, setError] = useState('')
   const [loading, setLoading] = useState(false)
@@ -52,7 +54,8 @@ export default function LoginPage() {
     setLoading(true)
     
     try {
-      const data = await authService.login(selectedIcons)
+      const data = await authService.login(selectedIcons, familyCode.trim().toUpperCase())
+      localStorage.setItem('family_code', data.family.login_code)
       setAuth(data.user, data.access_token)
       navigate('/dashboard')
     } catch (err) {
@@ -71,6 +74,21 @@ export default function LoginPage() {
         </div>
         
         <form onSubmit={handleLogin} className="space-y-6">
+          {/* Código de familia */}
+          <div>
+            <label className="block text-sm font-medium text-gray-700 mb-2">
+              Código de Familia
+            </label>
+            <input
+              type="text"
+              value={familyCode}
+              onChange={(e) => setFamilyCode(e.target.value)}
+              placeholder="Ej. K7P2QX9M"
+              autoCapitalize="characters"
+              className="input w-full uppercase tracking-widest"
+            />
+          </div>
+          
           {/* Código de iconos */}
           <div>
             <label className="block text-sm font-medium text-gray-700 mb-2">
@@ -5,7 +5,9 @@ import { Gift, Plus, Edit2, Trash2, Check, X, AlertCircle, Package, History, Fil
 export default function RewardsManagementPage() {
   const [rewards, setRewards] = useState([])
   const [pendingRedemptions, setPendingRedemptions] = useState([])
-  const [historyData, setHistoryData] = useState({ redemptions: [], users: [], filters: {} })
+  const [historyData, setHistoryData] = useState({ redemptions: [], next_cursor: null, totals: null, filters: {} })
+  const [historyUsers, setHistoryUsers] = useState([])
+  const [loadingMore, setLoadingMore] = useState(false)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState('')
   const [success, setSuccess] = useState('')
@@ -41,13 +43,12 @@ export default function RewardsManagementPage() {
         const data = await rewardsService.getPendingRedemptions()
         setPendingRedemptions(data)
       } else if (activeTab === 'history') {
-        const filters = {}
-        if (filterUserId) filters.user_id = filterUserId
-        if (filterStartDate) filters.start_date = filterStartDate
-        if (filterEndDate) filters.end_date = filterEndDate
-        
-        const data = await rewardsService.getRedemptionsHistory(filters)
+        const [data, users] = await Promise.all([
+          rewardsService.getRedemptionsHistory(getHistoryFilters()),
+          historyUsers.length ? historyUsers : usersService.getUserOptions()
+        ])
         setHistoryData(data)
+        setHistoryUsers(users)
       }
     } catch (error) {
       setError(error.response?.data?.error || 'Error al cargar datos')
@@ -56,6 +57,34 @@ export default function RewardsManagementPage() {
     }
   }
   
+  const getHistoryFilters = () => {
+    const filters = {}
+    if (filterUserId) filters.user_id = filterUserId
+    if (filterStartDate) filters.start_date = filterStartDate
+    if (filterEndDate) filters.end_date = filterEndDate
+    return filters
+  }
+  
+  // Página siguiente del historial (los totales ya vienen con la primera)
+  const handleLoadMore = async () => {
+    setLoadingMore(true)
+    try {
+      const data = await rewardsService.getRedemptionsHistory({
+        ...getHistoryFilters(),
+        cursor: historyData.next_cursor
+      })
+      setHistoryData({
+        ...historyData,
+        redemptions: [...historyData.redemptions, ...data.redemptions],
+        next_cursor: data.next_cursor
+      })
+    } catch (error) {
+      setError(error.response?.data?.error || 'Error al cargar datos')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+  
   const handleFilterChange = () => {
     if (activeTab === 'history') {
       loadData()
@@ -145,6 +174,27 @@ export default function RewardsManagementPage() {
     }
   }
 
+  const handleApproveAll = async () => {
+    if (!confirm(`¿Aprobar las ${pendingRedemptions.length} solicitudes pendientes?`)) return
+    
+    setError('')
+    setSuccess('')
+    try {
+      const result = await rewardsService.bulkProcessRedemptions(
+        pendingRedemptions.map(r => ({ id: r.id, action: 'approve' }))
+      )
+      const approved = result.counts.approved || 0
+      const insufficient = result.counts.insufficient_credits || 0
+      setSuccess(`${approved} solicitudes aprobadas`)
+      if (insufficient > 0) {
+        setError(`${insufficient} solicitudes siguen pendientes: el usuario ya no tiene créditos suficientes`)
+      }
+      loadData()
+    } catch (error) {
+      setError(error.response?.data?.error || 'Error al aprobar')
+    }
+  }
+
   const iconOptions = ['🎁', '🎮', '🍕', '🍿', '🎬', '📚', '🎨', '⚽', '🎵', '🍦', '🎂', '🧸', '🎪', '🎯', '🏆', '🪀', '🦕', '📱', '💰', '🛝']
 
   return (
@@ -280,7 +330,17 @@ export default function RewardsManagementPage() {
                   No hay solicitudes pendientes
                 </div>
               ) : (
-                pendingRedemptions.map(redemption => (
+                <>
+                <div className="flex justify-end">
+                  <button
+                    onClick={handleApproveAll}
+                    className="btn-primary flex items-center gap-2"
+                  >
+                    <Check size={18} />
+                    Aprobar todas
+                  </button>
+                </div>
+                {pendingRedemptions.map(redemption => (
                   <div key={redemption.id} className="card">
                     <div className="flex items-start justify-between">
                       <div className="flex items-start gap-4 flex-1">
@@ -322,7 +382,8 @@ export default function RewardsManagementPage() {
                       </div>
                     </div>
                   </div>
-                ))
+                ))}
+                </>
               )}
             </div>
           )}
@@ -346,7 +407,7 @@ export default function RewardsManagementPage() {
                       className="input w-full"
                     >
                       <option value="">Todos los usuarios</option>
-                      {historyData.users.map(user => (
+                      {historyUsers.map(user => (
                         <option key={user.id} value={user.id}>
                           {user.figure} {user.nick}
                         </option>
@@ -384,6 +445,50 @@ export default function RewardsManagementPage() {
                 </button>
               </div>
 
+              {/* Resumen del rango (calculado en el servidor) */}
+              {historyData.totals && historyData.totals.count > 0 && (
+                <div className="card">
+                  <h3 className="font-bold text-lg mb-3">Resumen</h3>
+                  <div className="grid grid-cols-1 md:grid-cols-4 gap-4 mb-4">
+                    <div>
+                      <p className="text-sm text-gray-600">Solicitudes</p>
+                      <p className="text-2xl font-bold">{historyData.totals.count}</p>
+                    </div>
+                    {[['approved', 'Aprobados', 'text-green-600'], ['pending', 'Pendientes', 'text-yellow-600'], ['rejected', 'Rechazados', 'text-red-600']].map(([status, label, color]) => (
+                      <div key={status}>
+                        <p className="text-sm text-gray-600">{label}</p>
+                        <p className={`text-2xl font-bold ${color}`}>
+                          {historyData.totals.by_status[status]?.credits || 0} créditos
+                        </p>
+                        <p className="text-xs text-gray-500">
+                          {historyData.totals.by_status[status]?.count || 0} solicitudes
+                        </p>
+                      </div>
+                    ))}
+                  </div>
+                  <div className="grid grid-cols-1 md:grid-cols-2 gap-4 text-sm">
+                    <div>
+                      <p className="font-medium text-gray-700 mb-1">Por usuario</p>
+                      {historyData.totals.by_user.map(item => (
+                        <div key={item.user_id} className="flex justify-between py-1 border-b">
+                          <span>{item.figure} {item.nick}</span>
+                          <span className="font-bold text-blue-600">{item.by_status.approved?.credits || 0} créditos</span>
+                        </div>
+                      ))}
+                    </div>
+                    <div>
+                      <p className="font-medium text-gray-700 mb-1">Por premio</p>
+                      {historyData.totals.by_reward.map(item => (
+                        <div key={item.reward_id} className="flex justify-between py-1 border-b">
+                          <span>{item.icon} {item.name}</span>
+                          <span className="text-gray-600">{item.by_status.approved?.count || 0} aprobados / {item.count}</span>
+                        </div>
+                      ))}
+                    </div>
+                  </div>
+                </div>
+              )}
+
               {/* Tabla de historial */}
               {historyData.redemptions.length === 0 ? (
                 <div className="card text-center py-8 text-gray-500">
@@ -455,6 +560,17 @@ export default function RewardsManagementPage() {
                       })}
                     </tbody>
                   </table>
+                  {historyData.next_cursor && (
+                    <div className="text-center mt-4">
+                      <button
+                        onClick={handleLoadMore}
+                        disabled={loadingMore}
+                        className="btn-secondary"
+                      >
+                        {loadingMore ? 'Cargando...' : 'Cargar más'}
+                      </button>
+                    </div>
+                  )}
                 </div>
               )}
             </div>
@@ -11,8 +11,6 @@ export default function RewardsPage() {
   const [error, setError] = useState('')
   const [success, setSuccess] = useState('')
   const [activeTab, setActiveTab] = useState('catalog') // catalog, my-requests
-  const [availableCredits, setAvailableCredits] = useState(0)
-  const [pendingCredits, setPendingCredits] = useState(0)
   
   const [showRedeemModal, setShowRedeemModal] = useState(false)
   const [selectedReward, setSelectedReward] = useState(null)
@@ -22,34 +20,27 @@ export default function RewardsPage() {
     loadData()
   }, [activeTab])
   
-  useEffect(() => {
-    calculateAvailableCredits()
-  }, [user, myRedemptions])
-  
-  const calculateAvailableCredits = () => {
-    if (!user) return
-    
-    // Calcular créditos en solicitudes pendientes
-    const pending = myRedemptions
-      .filter(r => r.status === 'pending')
-      .reduce((sum, r) => sum + r.credits_spent, 0)
-    
-    setPendingCredits(pending)
-    setAvailableCredits(user.score - pending)
-  }
+  // El backend mantiene los créditos reservados por solicitudes pendientes
+  const pendingCredits = user?.reserved_credits || 0
+  const availableCredits = user?.available_credits ?? (user?.score || 0) - pendingCredits
 
   const loadData = async () => {
     setLoading(true)
     setError('')
     try {
       if (activeTab === 'catalog') {
-        const data = await rewardsService.getRewards()
+        const [data, userData] = await Promise.all([
+          rewardsService.getRewards(),
+          authService.getCurrentUser()
+        ])
         setRewards(data.filter(r => r.is_active))
+        updateUser(userData)
       }
       
-      // Siempre cargar redemptions para calcular créditos disponibles
-      const redemptionsData = await rewardsService.getRedemptions()
-      setMyRedemptions(redemptionsData)
+      if (activeTab === 'my-requests') {
+        const redemptionsData = await rewardsService.getRedemptions()
+        setMyRedemptions(redemptionsData)
+      }
     } catch (error) {
       setError(error.response?.data?.error || 'Error al cargar datos')
     } finally {
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react'
-import { tasksService, usersService } from '../services'
+import { tasksService, batchService } from '../services'
 import { useAuthStore } from '../store/authStore'
 
 export default function TaskAssignmentPage() {
@@ -33,9 +33,9 @@ export default function TaskAssignmentPage() {
 
   const fetchData = async () => {
     try {
-      const [tasksData, usersData] = await Promise.all([
-        tasksService.getTasks(),
-        usersService.getUsers()
+      const [tasksData, usersData] = await batchService.run([
+        { path: '/tasks' },
+        { path: '/users' }
       ])
       setTasks(tasksData.filter(t => t.status === 'active'))
       setUsers(usersData.filter(u => u.is_active && u.role !== 'admin'))
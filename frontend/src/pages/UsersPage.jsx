@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react'
 import { Users as UsersIcon, UserPlus, Edit2, Power, Save, X, History } from 'lucide-react'
-import { usersService, iconsService } from '../services'
+import { authService, usersService, iconsService } from '../services'
 
 export default function UsersPage() {
   const [users, setUsers] = useState([])
@@ -13,6 +13,7 @@ export default function UsersPage() {
   const [showHistoryModal, setShowHistoryModal] = useState(false)
   const [selectedUserHistory, setSelectedUserHistory] = useState(null)
   const [historyData, setHistoryData] = useState(null)
+  const [family, setFamily] = useState(null)
   
   // Form state
   const [formData, setFormData] = useState({
@@ -25,6 +26,7 @@ export default function UsersPage() {
   useEffect(() => {
     loadUsers()
     loadIcons()
+    authService.getFamily().then(setFamily).catch(console.error)
   }, [])
 
   const loadUsers = async () => {
@@ -171,7 +173,14 @@ export default function UsersPage() {
   return (
     <div className="space-y-6">
       <div className="flex justify-between items-center">
-        <h1 className="text-3xl font-bold text-gray-900">Gestión de Usuarios</h1>
+        <div>
+          <h1 className="text-3xl font-bold text-gray-900">Gestión de Usuarios</h1>
+          {family && (
+            <p className="text-sm text-gray-600">
+              Código de familia para el login: <span className="font-mono font-semibold">{family.login_code}</span>
+            </p>
+          )}
+        </div>
         <button
           onClick={() => setShowCreateModal(true)}
           className="btn-primary flex items-center gap-2"
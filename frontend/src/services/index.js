@@ -1,13 +1,20 @@
 import apiClient from './api'
 
 export const authService = {
-  login: async (iconCodes) => {
+  // familyCode: código de la familia (opcional si la instalación tiene una sola)
+  login: async (iconCodes, familyCode) => {
     const response = await apiClient.post('/auth/login', {
-      icon_codes: iconCodes
+      icon_codes: iconCodes,
+      ...(familyCode ? { family_code: familyCode } : {})
     })
     return response.data
   },
   
+  getFamily: async () => {
+    const response = await apiClient.get('/auth/family')
+    return response.data
+  },
+  
   getCurrentUser: async () => {
     const response = await apiClient.get('/auth/me')
     return response.data
@@ -33,6 +40,18 @@ export const usersService = {
     return response.data
   },
   
+  // Lista ligera (id, nick, figure) para filtros; cacheable con ETag
+  getUserOptions: async (role = 'user') => {
+    const response = await apiClient.get('/users/options', { params: { role } })
+    return response.data
+  },
+  
+  // Clasificación de la familia: by = 'score' | 'weekly'
+  getLeaderboard: async (by = 'score', limit = 10) => {
+    const response = await apiClient.get('/users/leaderboard', { params: { by, limit } })
+    return response.data
+  },
+  
   getUser: async (userId) => {
     const response = await apiClient.get(`/users/${userId}`)
     return response.data
@@ -117,6 +136,11 @@ export const tasksService = {
     return response.data
   },
   
+  previewBulkAssignTask: async (bulkAssignmentData) => {
+    const response = await apiClient.post('/tasks/assign/bulk', { ...bulkAssignmentData, dry_run: true })
+    return response.data
+  },
+  
   completeTask: async (assignmentId, completionNotes = '') => {
     const response = await apiClient.post(`/tasks/assignments/${assignmentId}/complete`, {
       completion_notes: completionNotes
@@ -136,6 +160,12 @@ export const tasksService = {
     return response.data
   },
   
+  // validations: [{ id, validation_score, validation_notes }]
+  validateTasksBulk: async (validations) => {
+    const response = await apiClient.post('/tasks/completions/validate/bulk', { validations })
+    return response.data
+  },
+  
   resetTaskAssignment: async (assignmentId) => {
     const response = await apiClient.post(`/tasks/assignments/${assignmentId}/reset`)
     return response.data
@@ -257,6 +287,8 @@ export const rewardsService = {
     if (filters.user_id) params.append('user_id', filters.user_id)
     if (filters.start_date) params.append('start_date', filters.start_date)
     if (filters.end_date) params.append('end_date', filters.end_date)
+    if (filters.limit) params.append('limit', filters.limit)
+    if (filters.cursor) params.append('cursor', filters.cursor)
     
     const response = await apiClient.get(`/rewards/redemptions/history?${params.toString()}`)
     return response.data
@@ -270,6 +302,89 @@ export const rewardsService = {
   rejectRedemption: async (redemptionId, reason) => {
     const response = await apiClient.post(`/rewards/redemptions/${redemptionId}/reject`, { reason })
     return response.data
+  },
+  
+  // decisions: [{ id, action: 'approve'|'reject', reason }]
+  bulkProcessRedemptions: async (decisions) => {
+    const response = await apiClient.post('/rewards/redemptions/bulk', { decisions })
+    return response.data
+  }
+}
+
+export const batchService = {
+  // Varias peticiones en un solo viaje: [{ path: '/tasks' }, { method: 'POST', path: '...', body }]
+  // Devuelve los cuerpos en el mismo orden; si alguna falla lanza un error
+  // con la misma forma que los de axios (error.response.data.error)
+  run: async (requests) => {
+    const response = await apiClient.post('/batch', requests.map(r => ({ ...r, path: `/api${r.path}` })))
+    const failed = response.data.find(r => r.status >= 400)
+    if (failed) {
+      const error = new Error(`Batch request ${failed.id} failed with status ${failed.status}`)
+      error.response = { status: failed.status, data: failed.body }
+      throw error
+    }
+    return response.data.map(r => r.body)
+  }
+}
+
+export const syncService = {
+  // Cambios desde `since` (token de la llamada anterior; null = todo).
+  // Sigue pidiendo páginas mientras haya más y devuelve todo junto:
+  // { changes: { tabla: [filas] }, deleted: [{ table, id }], next }
+  // Un 410 significa que el token caducó: volver a llamar con since = null.
+  pull: async (since = null) => {
+    const changes = {}
+    const deleted = []
+    let token = since
+    while (true) {
+      const response = await apiClient.get('/sync', { params: token ? { since: token } : {} })
+      for (const [table, rows] of Object.entries(response.data.changes)) {
+        changes[table] = [...(changes[table] || []), ...rows]
+      }
+      deleted.push(...response.data.deleted)
+      token = response.data.next
+      if (!response.data.has_more) {
+        return { changes, deleted, next: token }
+      }
+    }
+  }
+}
+
+export const dashboardService = {
+  // Datos iniciales del dashboard en una sola petición (secciones según el rol)
+  getDashboard: async (sections) => {
+    const response = await apiClient.get('/dashboard', {
+      params: sections ? { sections: sections.join(',') } : {}
+    })
+    return response.data
+  }
+}
+
+export const scoringService = {
+  getRules: async () => {
+    const response = await apiClient.get('/scoring')
+    return response.data
+  },
+  
+  // rules: { tiers, penalties, streak_bonus, weekend_percent } o null (por defecto)
+  updateRules: async (rules) => {
+    const response = await apiClient.put('/scoring', { rules })
+    return response.data
+  }
+}
+
+export const statsService = {
+  // Tasa de completado, puntuaciones y créditos ganados/gastados por usuario
+  // params: { start_date, end_date, user_id, group: 'week' | 'day' }
+  getUserStats: async (params = {}) => {
+    const response = await apiClient.get('/stats/users', { params })
+    return response.data
+  },
+
+  // Resumen semanal por tarea (admin). params: { start_date, end_date }
+  getTaskStats: async (params = {}) => {
+    const response = await apiClient.get('/stats/tasks', { params })
+    return response.data
   }
 }
 
@@ -322,6 +437,60 @@ export const calendarService = {
   }
 }
 
+export const jobsService = {
+  getJobs: async (status = null) => {
+    const params = status ? { status } : {}
+    const response = await apiClient.get('/jobs', { params })
+    return response.data
+  },
+  
+  getJob: async (jobId) => {
+    const response = await apiClient.get(`/jobs/${jobId}`)
+    return response.data
+  },
+  
+  getJobResult: async (jobId) => {
+    const response = await apiClient.get(`/jobs/${jobId}/result`)
+    return response.data
+  }
+}
+
+export const exportsService = {
+  // Encola la exportación completa de la familia (admin). Devuelve el trabajo;
+  // su resultado (jobsService.getJobResult) lista los ficheros con su url
+  createExport: async (format = 'csv', tables = null) => {
+    const response = await apiClient.post('/exports', tables ? { format, tables } : { format })
+    return response.data.job
+  },
+
+  // Descarga un fichero de la exportación (url del resultado del trabajo)
+  download: async (url, filename) => {
+    const response = await apiClient.get(url.replace(/^\/api/, ''), { responseType: 'blob' })
+    const link = document.createElement('a')
+    link.href = URL.createObjectURL(response.data)
+    link.download = filename
+    link.click()
+    URL.revokeObjectURL(link.href)
+  }
+}
+
+export const eventsService = {
+  // Abre el canal SSE; onEvent(type, message) recibe cada delta.
+  // Retorna una función para cerrar la conexión.
+  subscribe: (onEvent) => {
+    const token = localStorage.getItem('access_token')
+    const source = new EventSource(`${apiClient.defaults.baseURL}/events/stream?token=${token}`)
+    const types = [
+      'assignment', 'completion', 'validation', 'cancellation', 'reset',
+      'bonus', 'redemption', 'redemption_approved', 'redemption_rejected'
+    ]
+    types.forEach(type => {
+      source.addEventListener(type, (event) => onEvent(type, JSON.parse(event.data)))
+    })
+    return () => source.close()
+  }
+}
+
 export const iconsService = {
   getIcons: async () => {
     const response = await apiClient.get('/icons')
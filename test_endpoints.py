@@ -10,7 +10,6 @@ BASE_URL = 'http://localhost:5001/api'
 def test_login():
     """Login como admin para obtener token"""
     response = requests.post(f'{BASE_URL}/auth/login', json={
-        'nick': 'admin',
         'icon_codes': [1, 2, 3, 4]
     })
     if response.status_code == 200: